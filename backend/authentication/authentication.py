@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    """
+    Drop a cached user now and again once the transaction commits.
+
+    Saving or deleting a user calls this; QuerySet.update() sends no signal,
+    so call it for each user a bulk update deactivates.
+    """
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that checks the token's user against the shared cache.
+
+    Only what authentication needs is cached, for AUTH_USER_CACHE_TIMEOUT
+    seconds: the user's id, is_active and the password hash digest the
+    revoke check compares. Entries are dropped whenever the user is saved or
+    deleted, so authenticated requests skip the users table. The active and
+    revoked-token checks still run on every request. request.user then has
+    every other field deferred, loaded from the database on first access.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+        key = user_cache_key(user_id)
+        cached = cache.get(key)
+        if cached is None:
+            # Loads and checks the user; inactive or unknown users raise and are not cached
+            user = super().get_user(validated_token)
+            cache.set(key, (
+                getattr(user, api_settings.USER_ID_FIELD),
+                user.is_active,
+                get_md5_hash_password(user.password),
+            ), settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        pk, is_active, password_hash = cached
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code='password_changed')
+        return self.cached_user(pk, is_active)
+
+    def cached_user(self, pk, is_active):
+        """The user as loaded from the database, with only these fields fetched"""
+        values = {api_settings.USER_ID_FIELD: pk, 'is_active': is_active}
+        names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in values
+        ]
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model), names, [values[name] for name in names])
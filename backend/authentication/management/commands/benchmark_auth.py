@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.authentication import CachedJWTAuthentication, user_cache_key
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare authenticate() time and queries per request between '
+        'simplejwt\'s JWTAuthentication and CachedJWTAuthentication, using the '
+        'configured cache. The benchmark user is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000, help='Requests per backend')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user('benchmark_auth_user')
+            token = str(RefreshToken.for_user(user).access_token)
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+            self.stdout.write(f"{'backend':<28}{'median us':>12}{'queries':>10}")
+            for backend in (JWTAuthentication(), CachedJWTAuthentication()):
+                cache.delete(user_cache_key(user.pk))
+                # The first call fills the cache for the cached backend
+                backend.authenticate(Request(request))
+                median, queries = self._time(backend, request, options['repeat'])
+                self.stdout.write(f'{type(backend).__name__:<28}{median:>12.1f}{queries:>10.2f}')
+
+            cache.delete(user_cache_key(user.pk))
+            transaction.set_rollback(True)
+
+    def _time(self, backend, request, repeat):
+        samples, queries = [], 0
+
+        def count(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        with connection.execute_wrapper(count):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                backend.authenticate(Request(request))
+                samples.append((time.perf_counter() - start) * 1e6)
+        return statistics.median(samples), queries / repeat
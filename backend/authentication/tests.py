@@ -1,3 +1,100 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .authentication import CachedJWTAuthentication, invalidate_user, user_cache_key
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+})
+class CachedJWTAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('taker', password='pass12345')
+        self.token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.url = reverse('user-profile')
+
+    def authenticate(self):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return CachedJWTAuthentication().authenticate(Request(request))
+
+    def test_cached_user_skips_users_table(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_authenticated)
+        self.assertEqual(user.get_deferred_fields(), {
+            field.attname for field in User._meta.concrete_fields
+        } - {'id', 'is_active'})
+
+    def test_only_authentication_fields_are_cached(self):
+        self.authenticate()
+
+        self.assertEqual(cache.get(user_cache_key(self.user.pk)), (
+            self.user.pk, True, get_md5_hash_password(self.user.password)))
+
+    def test_profile_reads_the_whole_user(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['username'], 'taker')
+
+    def test_invalidate_user_after_bulk_deactivation(self):
+        self.client.get(self.url)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        invalidate_user(self.user.pk)
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivation_drops_cached_user(self):
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+        # Rejected users are not cached
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(self.url)
+
+        self.user.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_changes_are_seen(self):
+        self.client.get(self.url)
+
+        self.user.email = 'taker@example.com'
+        self.user.save(update_fields=['email'])
+
+        self.assertEqual(self.client.get(self.url).data['email'], 'taker@example.com')
+
+    def test_benchmark_auth(self):
+        out = StringIO()
+        call_command('benchmark_auth', repeat=3, stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith('JWTAuthentication'))
+        self.assertTrue(lines[2].startswith('CachedJWTAuthentication'))
+        self.assertEqual(lines[2].split()[-1], '0.00')
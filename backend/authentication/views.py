@@ -37,5 +37,6 @@ class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        # request.user holds only the fields authentication needs
+        serializer = UserSerializer(User.objects.get(pk=request.user.pk))
         return Response(serializer.data)
@@ -55,6 +55,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'quizzes.middleware.RequestMetricsMiddleware',  # First, to time the whole stack
+    'quizzes.middleware.QueryBudgetMiddleware',
+    'quizzes.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Serve static files in production
     'corsheaders.middleware.CorsMiddleware',
@@ -110,6 +113,24 @@ else:
         }
     }
 
+# Optional read replica for views marked use_replica (see quizzes/routers.py).
+# Tests read it as a mirror of the test database.
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=600,
+        conn_health_checks=True,
+        ssl_require=not DEBUG,
+        test_options={'MIRROR': 'default'},
+    )
+
+QUIZ_REPLICA_DATABASE = 'replica' if DATABASE_REPLICA_URL else None
+# Seconds a client's reads stay on the primary after it writes
+QUIZ_REPLICA_PIN_SECONDS = int(os.getenv('QUIZ_REPLICA_PIN_SECONDS', '5'))
+DATABASE_ROUTERS = ['quizzes.routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -157,15 +178,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework configuration
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'quizzes.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'quizzes.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'quizzes.throttling.AnonRateThrottle',
+        'quizzes.throttling.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -175,6 +205,61 @@ REST_FRAMEWORK = {
     },
 }
 
+# QUIZ_THROTTLING=False lifts every rate limit, e.g. for benchmark_api --server
+if os.getenv('QUIZ_THROTTLING', 'True').lower() != 'true':
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] = dict.fromkeys(REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
+
+
+# Cache
+# Throttle counters and quiz cache versions must be shared by every worker,
+# so production needs REDIS_URL. Without it each process keeps its own
+# in-memory cache, and rate limits apply per process.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'quiz-cache',
+            # Room for throttle counters and quiz entries past Django's 300
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+
+# Quiz caching
+# Answer keys and public payloads are cached per quiz version; the local
+# tier is an in-process LRU in front of Django's cache framework.
+QUIZ_CACHE_TIMEOUT = int(os.getenv('QUIZ_CACHE_TIMEOUT', '3600'))
+QUIZ_LOCAL_CACHE_SIZE = int(os.getenv('QUIZ_LOCAL_CACHE_SIZE', '256'))
+# Browser/CDN max-age for public quiz payloads
+QUIZ_PUBLIC_MAX_AGE = int(os.getenv('QUIZ_PUBLIC_MAX_AGE', '60'))
+# Route the public quiz endpoints to their async views (for ASGI deployments)
+QUIZ_ASYNC_PUBLIC_VIEWS = os.getenv('QUIZ_ASYNC_PUBLIC_VIEWS', 'False').lower() == 'true'
+# Queue graded submissions for `manage.py drain_submissions` instead of
+# writing them inline
+QUIZ_QUEUE_SUBMISSIONS = os.getenv('QUIZ_QUEUE_SUBMISSIONS', 'False').lower() == 'true'
+# How long results stay cached for replays of the same submission_token
+QUIZ_RESULT_CACHE_TIMEOUT = int(os.getenv('QUIZ_RESULT_CACHE_TIMEOUT', '86400'))
+
+
+# Metrics
+# Add Server-Timing headers with SQL, render and total time to every response
+# (on by default only under DEBUG, since any client can read them)
+QUIZ_SERVER_TIMING = os.getenv('QUIZ_SERVER_TIMING', str(DEBUG)).lower() == 'true'
+# /metrics requires "Authorization: Bearer <token>"; without a token it is
+# only served under DEBUG
+QUIZ_METRICS_TOKEN = os.getenv('QUIZ_METRICS_TOKEN', '')
+# Per-view query budgets: 'off', 'log' or 'raise' (default: 'log' when DEBUG)
+QUIZ_QUERY_BUDGETS = os.getenv('QUIZ_QUERY_BUDGETS', '')
+
 
 # JWT Settings
 SIMPLE_JWT = {
@@ -183,6 +268,8 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': False,
 }
+# Seconds an authenticated user stays cached; saving the user drops it sooner
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '60'))
 
 
 # CORS Settings
@@ -17,8 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from quizzes.views import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('authentication.urls')),
     path('api/quizzes/', include('quizzes.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
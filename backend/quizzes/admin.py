@@ -16,14 +16,27 @@ class QuestionInline(admin.TabularInline):
 
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
-    list_display = ['title', 'created_by', 'created_at', 'question_count']
+    list_display = ['title', 'created_by', 'created_at', 'question_count',
+                    'submission_count', 'last_submission_at']
     list_filter = ['created_at', 'created_by']
+    list_select_related = ['created_by']
     search_fields = ['title', 'description']
     inlines = [QuestionInline]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_stats()
+
+    @admin.display(description='Questions', ordering='question_count')
     def question_count(self, obj):
-        return obj.questions.count()
-    question_count.short_description = 'Questions'
+        return obj.question_count
+
+    @admin.display(description='Submissions', ordering='submission_count')
+    def submission_count(self, obj):
+        return obj.submission_count
+
+    @admin.display(description='Last submission', ordering='last_submission_at')
+    def last_submission_at(self, obj):
+        return obj.last_submission_at
 
 
 @admin.register(Question)
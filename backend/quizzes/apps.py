@@ -3,3 +3,13 @@ from django.apps import AppConfig
 
 class QuizzesConfig(AppConfig):
     name = 'quizzes'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .budgets import install_query_log
+        from .metrics import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(install_query_log)
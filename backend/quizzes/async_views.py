@@ -0,0 +1,141 @@
+"""Async versions of PublicQuizView and QuizSubmitView for ASGI (QUIZ_ASYNC_PUBLIC_VIEWS)"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, Throttled
+from rest_framework.request import Request
+
+from .budgets import query_budget
+from .cache import aget_answer_key, aget_public_snapshot
+from .idempotency import aget_replay
+from .parsers import loads
+from .renderers import JSONRenderer
+from .routers import use_replica
+from .serializers import QuizSubmitSerializer
+from .utils import sanitize_input
+from .views import PublicQuizView, QuizSubmitView, record_submission
+
+QUIZ_NOT_FOUND = 'No Quiz matches the given query.'
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    """Render data exactly as DRF's JSONRenderer would"""
+    return HttpResponse(
+        JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+@sync_to_async
+def check_throttles(request, view_class, view_kwargs):
+    """
+    Authenticate the caller and run the DRF view's throttles, as the view would.
+
+    Authenticated callers get the user throttle scopes, like the sync view.
+    Returns a 401/403 or 429 response, or None.
+    """
+    view = view_class(kwargs=view_kwargs)
+    request = Request(request, authenticators=view.get_authenticators())
+    try:
+        # Resolved now, in this thread, rather than lazily by a throttle
+        request.user
+    except AuthenticationFailed as exc:
+        response = json_response({'detail': exc.detail}, status=exc.status_code)
+        auth_header = view.get_authenticate_header(request)
+        if auth_header:
+            response['WWW-Authenticate'] = auth_header
+        else:
+            response.status_code = status.HTTP_403_FORBIDDEN
+        return response
+
+    waits = []
+    for throttle in view.get_throttles():
+        if not throttle.allow_request(request, view):
+            waits.append(throttle.wait())
+    if not waits:
+        return None
+
+    waits = [wait for wait in waits if wait is not None]
+    exc = Throttled(max(waits, default=None))
+    response = json_response({'detail': exc.detail}, status=exc.status_code)
+    if exc.wait is not None:
+        response['Retry-After'] = str(exc.wait)
+    return response
+
+
+@query_budget(PublicQuizView.query_budget)
+@use_replica
+@require_safe
+async def public_quiz(request, pk):
+    """Get a quiz for public taking (no correct answers shown)"""
+    throttled = await check_throttles(request, PublicQuizView, {'pk': pk})
+    if throttled:
+        return throttled
+
+    snapshot = await aget_public_snapshot(pk)
+    if snapshot is None:
+        return json_response({'detail': QUIZ_NOT_FOUND}, status=status.HTTP_404_NOT_FOUND)
+
+    response = HttpResponse(snapshot.body, content_type='application/json')
+    response['ETag'] = snapshot.etag
+    response['Last-Modified'] = http_date(snapshot.last_modified)
+    patch_cache_control(
+        response, public=True, max_age=settings.QUIZ_PUBLIC_MAX_AGE)
+    return get_conditional_response(
+        request,
+        etag=snapshot.etag,
+        last_modified=snapshot.last_modified,
+        response=response
+    )
+
+
+@query_budget(QuizSubmitView.query_budget)
+@csrf_exempt
+@require_POST
+async def submit_quiz(request, pk):
+    """Submit answers and get scored results"""
+    throttled = await check_throttles(request, QuizSubmitView, {'pk': pk})
+    if throttled:
+        return throttled
+
+    answer_key = await aget_answer_key(pk)
+    if answer_key is None:
+        return json_response({'detail': QUIZ_NOT_FOUND}, status=status.HTTP_404_NOT_FOUND)
+
+    try:
+        payload = loads(request.body)
+    except ValueError as exc:
+        return json_response(
+            {'detail': f'JSON parse error - {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = QuizSubmitSerializer(data=payload)
+    if not serializer.is_valid():
+        return json_response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    token = data.get('submission_token')
+
+    # A retried submission gets its original result back, without regrading
+    if token:
+        replay = await aget_replay(answer_key, token)
+        if replay is not None:
+            return json_response(replay)
+
+    taker_name = sanitize_input(data.get('taker_name', ''))[:100]
+
+    # Validate answer count matches question count (guard rail)
+    if len(data['answers']) > answer_key.question_count:
+        return json_response(
+            {'error': 'Too many answers submitted'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # The write is one transaction, which the async ORM cannot span, so it
+    # runs in a worker thread
+    try:
+        result, result_status = await sync_to_async(record_submission)(
+            answer_key, taker_name, data['answers'], token)
+    except Http404 as exc:
+        return json_response({'detail': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+    return json_response(result, status=result_status)
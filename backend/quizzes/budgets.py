@@ -0,0 +1,101 @@
+"""
+Per-view SQL query budgets, checked by middleware.QueryBudgetMiddleware.
+
+A view declares the most queries one request may run, as a query_budget
+class attribute or with the @query_budget(n) decorator. With
+QUIZ_QUERY_BUDGETS set to 'log' or 'raise' (the default is 'log' under
+DEBUG and 'off' otherwise), every query a request runs is recorded with its
+stack, and a request over its view's budget is logged or raises
+QueryBudgetExceeded listing them. SAVEPOINT statements are not counted:
+atomic() issues them only when nested, as inside a TestCase, so a view has
+the same count under tests and runserver.
+"""
+import logging
+import os
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames from these directories are left out of reported stacks...
+_LIBRARY_MARKERS = ('site-packages', 'dist-packages', str(Path(traceback.__file__).parent))
+# ...and these, shared by every query, are trimmed off the innermost end
+_ORM_MARKER = os.path.join('django', 'db', '')
+# Issued by nested atomic() blocks, not by the view's own work
+_SAVEPOINT_PREFIXES = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more queries than its view's budget"""
+
+
+def query_budget(limit):
+    """Declare the most queries one request to the decorated view may run"""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def get_query_budget(view_func):
+    """The budget of a view function or as_view() callable, or None if it has none"""
+    view_class = getattr(view_func, 'view_class', None)
+    return getattr(view_class or view_func, 'query_budget', None)
+
+
+current_log = ContextVar('quiz_query_log', default=None)
+
+
+def _query_stack():
+    """Where a query came from: the app's frames, then the innermost caller of the ORM"""
+    frames = traceback.extract_stack()[:-2]
+    while frames and _ORM_MARKER in frames[-1].filename:
+        frames.pop()
+    app_frames = [
+        frame for frame in frames[:-2]
+        if not any(marker in frame.filename for marker in _LIBRARY_MARKERS)
+    ]
+    return traceback.format_list(app_frames + frames[-2:])
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper logging each query and its stack for the current request"""
+    log = current_log.get()
+    if log is not None and not sql.startswith(_SAVEPOINT_PREFIXES):
+        log.append((sql, _query_stack()))
+    return execute(sql, params, many, context)
+
+
+def install_query_log(sender, connection, **kwargs):
+    """connection_created receiver putting record_query on every new connection"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def budget_report(request, budget, log):
+    lines = [
+        f'{request.method} {request.path} ran {len(log)} queries, over its budget of {budget}:'
+    ]
+    for number, (sql, stack) in enumerate(log, start=1):
+        lines.append(f'{number}. {sql}')
+        lines.extend('    ' + line.rstrip().replace('\n', '\n    ') for line in stack)
+    return '\n'.join(lines)
+
+
+def budget_mode():
+    """QUIZ_QUERY_BUDGETS, defaulting to 'log' under DEBUG and 'off' otherwise"""
+    return getattr(settings, 'QUIZ_QUERY_BUDGETS', None) or ('log' if settings.DEBUG else 'off')
+
+
+def check_budget(request, log, mode):
+    """Log or raise if the request ran more queries than its view's budget"""
+    budget = getattr(request, 'query_budget', None)
+    if budget is None or len(log) <= budget:
+        return
+    report = budget_report(request, budget, log)
+    if mode == 'raise':
+        raise QueryBudgetExceeded(report)
+    logger.warning(report)
@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .grading import AnswerKey
+from .metrics import record_cache_lookup
+from .rollups import build_quiz_analytics
+from .routers import primary_reads
+from .snapshots import PublicSnapshot
+
+
+class LRUCache:
+    """Small thread-safe in-process cache that evicts the least recently used entry"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Bump the suffix whenever AnswerKey gains fields, so stale pickles are ignored
+ANSWER_KEY_ENTRY = 'answer_key:2'
+
+# Process-local tier in front of Django's cache framework
+local_cache = LRUCache(getattr(settings, 'QUIZ_LOCAL_CACHE_SIZE', 256))
+
+
+def _new_version():
+    # Versions are timestamps, so a version lost to eviction is never reissued
+    return time.time_ns() // 1000
+
+
+def quiz_tag(quiz_id):
+    """Tag for entries derived from a quiz's content: title, questions, choices"""
+    return f'quiz:{quiz_id}'
+
+
+def submissions_tag(quiz_id):
+    """Tag for entries derived from a quiz's submissions"""
+    return f'quiz:{quiz_id}:submissions'
+
+
+def _version_key(tag):
+    return f'{tag}:version'
+
+
+def _entry_key(tags, versions, name):
+    stamps = ':'.join(f'{tag}@v{version}' for tag, version in zip(tags, versions))
+    return f'{stamps}:{name}'
+
+
+def get_tag_versions(tags):
+    """Return the current cache version of each tag, with one get_many"""
+    keys = [_version_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _new_version()
+            # Another process may have stored a version first; keep theirs
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        versions.append(version)
+    return versions
+
+
+async def aget_tag_versions(tags):
+    """Async version of get_tag_versions"""
+    keys = [_version_key(tag) for tag in tags]
+    found = await cache.aget_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = _new_version()
+            if not await cache.aadd(key, version, None):
+                version = await cache.aget(key, version)
+        versions.append(version)
+    return versions
+
+
+def get_quiz_version(quiz_id):
+    """Return the current cache version for a quiz's content"""
+    return get_tag_versions([quiz_tag(quiz_id)])[0]
+
+
+async def aget_quiz_version(quiz_id):
+    """Async version of get_quiz_version"""
+    return (await aget_tag_versions([quiz_tag(quiz_id)]))[0]
+
+
+def bump_tags(*tags):
+    """Invalidate every cached entry carrying any of the tags"""
+    version = _new_version()
+    cache.set_many({_version_key(tag): version for tag in tags}, None)
+
+
+def invalidate_tags(*tags):
+    """
+    Bump the tags now and again once the transaction commits.
+
+    The second bump stops a concurrent reader from caching pre-commit data
+    under the version set by the first one.
+    """
+    bump_tags(*tags)
+    transaction.on_commit(lambda: bump_tags(*tags))
+
+
+def invalidate_quiz(quiz_id):
+    """Invalidate every cached entry derived from a quiz's content"""
+    invalidate_tags(quiz_tag(quiz_id))
+
+
+def invalidate_quiz_submissions(quiz_id):
+    """Invalidate every cached entry derived from a quiz's submissions"""
+    invalidate_tags(submissions_tag(quiz_id))
+
+
+def get_or_build(tags, name, build):
+    """
+    Return a cached entry tagged with tags, building it on a miss.
+
+    The entry is stored under the current version of each tag, so bumping
+    any of them makes it unreachable. Looks in the local LRU tier, then the
+    shared cache, and only calls build() when both miss. A build() result of
+    None is not cached.
+    """
+    key = _entry_key(tags, get_tag_versions(tags), name)
+    value = local_cache.get(key)
+    if value is not None:
+        record_cache_lookup(name, 'local')
+        return value
+
+    value = cache.get(key)
+    if value is None:
+        record_cache_lookup(name, 'miss')
+        # Built from a lagging replica, it would be cached under the new version
+        with primary_reads():
+            value = build()
+        if value is None:
+            return None
+        cache.set(key, value, getattr(settings, 'QUIZ_CACHE_TIMEOUT', 3600))
+    else:
+        record_cache_lookup(name, 'shared')
+    local_cache.set(key, value)
+    return value
+
+
+async def aget_or_build(tags, name, build):
+    """Async version of get_or_build; build is a coroutine function"""
+    key = _entry_key(tags, await aget_tag_versions(tags), name)
+    value = local_cache.get(key)
+    if value is not None:
+        record_cache_lookup(name, 'local')
+        return value
+
+    value = await cache.aget(key)
+    if value is None:
+        record_cache_lookup(name, 'miss')
+        with primary_reads():
+            value = await build()
+        if value is None:
+            return None
+        await cache.aset(key, value, getattr(settings, 'QUIZ_CACHE_TIMEOUT', 3600))
+    else:
+        record_cache_lookup(name, 'shared')
+    local_cache.set(key, value)
+    return value
+
+
+def get_answer_key(quiz_id):
+    """Return the compiled answer key for a quiz, or None if the quiz does not exist"""
+    return get_or_build([quiz_tag(quiz_id)], ANSWER_KEY_ENTRY, lambda: AnswerKey.for_quiz(quiz_id))
+
+
+async def aget_answer_key(quiz_id):
+    """Async version of get_answer_key"""
+    return await aget_or_build([quiz_tag(quiz_id)], ANSWER_KEY_ENTRY, lambda: AnswerKey.afor_quiz(quiz_id))
+
+
+def get_public_snapshot(quiz_id):
+    """Return the pre-rendered public payload for a quiz, or None if it does not exist"""
+    def build():
+        changed_at = get_quiz_version(quiz_id) / 1_000_000
+        return PublicSnapshot.for_quiz(quiz_id, changed_at)
+    return get_or_build([quiz_tag(quiz_id)], 'public_snapshot', build)
+
+
+async def aget_public_snapshot(quiz_id):
+    """Async version of get_public_snapshot; the rare rebuild runs in a worker thread"""
+    async def build():
+        changed_at = await aget_quiz_version(quiz_id) / 1_000_000
+        return await sync_to_async(PublicSnapshot.for_quiz)(quiz_id, changed_at)
+    return await aget_or_build([quiz_tag(quiz_id)], 'public_snapshot', build)
+
+
+def get_quiz_analytics(quiz):
+    """Return the analytics payload for a quiz, rebuilt after content changes or new submissions"""
+    return get_or_build(
+        [quiz_tag(quiz.pk), submissions_tag(quiz.pk)], 'analytics',
+        lambda: build_quiz_analytics(quiz))
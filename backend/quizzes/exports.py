@@ -0,0 +1,76 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import QuizSubmission
+
+# (column, lookup) pairs; one row per answer, or one row with empty answer
+# columns for a submission that has no answers
+EXPORT_COLUMNS = [
+    ('submission_id', 'id'),
+    ('taker_name', 'taker_name'),
+    ('score', 'score'),
+    ('total_questions', 'total_questions'),
+    ('submitted_at', 'submitted_at'),
+    ('question_id', 'answers__question_id'),
+    ('question_order', 'answers__question__order'),
+    ('question_text', 'answers__question__question_text'),
+    ('question_type', 'answers__question__question_type'),
+    ('selected_choice_id', 'answers__selected_choice_id'),
+    ('selected_choice_text', 'answers__selected_choice__choice_text'),
+    ('text_answer', 'answers__text_answer'),
+    ('is_correct', 'answers__is_correct'),
+]
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def export_rows(quiz_id, chunk_size=2000):
+    """Yield one tuple per answer, read from the database in chunks"""
+    return QuizSubmission.objects.filter(quiz_id=quiz_id).order_by(
+        'id', 'answers__question__order', 'answers__id').values_list(
+            *(lookup for _, lookup in EXPORT_COLUMNS)).iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back"""
+
+    def write(self, value):
+        return value
+
+
+# Spreadsheets run a cell starting with one of these as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_cell(value):
+    """A CSV cell for value, with user text kept from being read as a formula"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(csv_cell(value) for value in row)
+
+
+def stream_ndjson(rows):
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def stream_export(quiz_id, export_format, chunk_size=2000):
+    """Yield the encoded export for a quiz in the given format"""
+    rows = export_rows(quiz_id, chunk_size=chunk_size)
+    if export_format == 'ndjson':
+        return stream_ndjson(rows)
+    return stream_csv(rows)
@@ -0,0 +1,182 @@
+from django.db import transaction
+from django.http import Http404
+
+from .models import Answer, Choice, Question, Quiz, QuizSubmission
+from .rollups import record_submissions
+from .utils import sanitize_input
+
+CHOICE_QUESTION_TYPES = ('mcq', 'true_false')
+
+
+def normalize_text_answer(text):
+    """Normalize a text answer for case-insensitive comparison"""
+    return text.strip().lower()
+
+
+class QuestionKey:
+    """Grading and result data for a single question"""
+
+    def __init__(self, question_id, question_type, correct_text_answer, question_text=''):
+        self.id = question_id
+        self.question_type = question_type
+        self.question_text = question_text
+        self.correct_text_answer = correct_text_answer
+        self.correct_text = (
+            normalize_text_answer(correct_text_answer)
+            if correct_text_answer else None)
+        # choice id -> is_correct
+        self.choices = {}
+        # choice id -> choice text
+        self.choice_texts = {}
+
+    @property
+    def correct_choice_text(self):
+        """Text of the first correct choice, or None for text questions"""
+        if self.question_type not in CHOICE_QUESTION_TYPES:
+            return None
+        for choice_id in sorted(self.choices):
+            if self.choices[choice_id]:
+                return self.choice_texts[choice_id]
+        return None
+
+
+class AnswerKey:
+    """In-memory answer key for a quiz, used to grade whole submissions"""
+
+    def __init__(self, quiz_id, quiz_title, questions):
+        self.quiz_id = quiz_id
+        self.quiz_title = quiz_title
+        self.questions = questions
+
+    @classmethod
+    def for_quiz(cls, quiz_id):
+        """
+        Build the answer key for a quiz, or return None if it does not exist.
+
+        Costs one query for the quiz, one for its questions and one for
+        their choices. Besides grading, the key carries the question and
+        choice texts needed to render results.
+        """
+        quiz_title = Quiz.objects.filter(pk=quiz_id).values_list(
+            'title', flat=True).first()
+        if quiz_title is None:
+            return None
+        questions, choices = cls._querysets(quiz_id)
+        return cls._from_rows(quiz_id, quiz_title, questions, choices)
+
+    @classmethod
+    async def afor_quiz(cls, quiz_id):
+        """Async version of for_quiz, using the async ORM"""
+        quiz_title = await Quiz.objects.filter(pk=quiz_id).values_list(
+            'title', flat=True).afirst()
+        if quiz_title is None:
+            return None
+        questions, choices = cls._querysets(quiz_id)
+        return cls._from_rows(
+            quiz_id, quiz_title,
+            [row async for row in questions],
+            [row async for row in choices])
+
+    @staticmethod
+    def _querysets(quiz_id):
+        questions = Question.objects.filter(quiz_id=quiz_id).values(
+            'id', 'question_type', 'correct_text_answer', 'question_text')
+        choices = Choice.objects.filter(question__quiz_id=quiz_id).values_list(
+            'id', 'question_id', 'is_correct', 'choice_text')
+        return questions, choices
+
+    @classmethod
+    def _from_rows(cls, quiz_id, quiz_title, question_rows, choice_rows):
+        questions = {
+            row['id']: QuestionKey(
+                row['id'], row['question_type'], row['correct_text_answer'],
+                row['question_text'])
+            for row in question_rows
+        }
+        for choice_id, question_id, is_correct, choice_text in choice_rows:
+            questions[question_id].choices[choice_id] = is_correct
+            questions[question_id].choice_texts[choice_id] = choice_text
+        return cls(quiz_id, quiz_title, questions)
+
+    @property
+    def question_count(self):
+        return len(self.questions)
+
+    def grade(self, answers):
+        """
+        Grade a validated answer payload against the key.
+
+        Returns the score and a list of unsaved Answer instances. Raises
+        Http404 if an answer references a question outside this quiz, before
+        anything has been written.
+        """
+        score = 0
+        graded = []
+        answered_questions = set()
+
+        for answer_data in answers:
+            question_id = answer_data['question_id']
+
+            # Prevent duplicate answers (guard rail)
+            if question_id in answered_questions:
+                continue
+            answered_questions.add(question_id)
+
+            question = self.questions.get(question_id)
+            if question is None:
+                raise Http404('No Question matches the given query.')
+
+            is_correct = False
+            selected_choice_id = None
+            text_answer = sanitize_input(answer_data.get('text_answer', ''))
+
+            if question.question_type in CHOICE_QUESTION_TYPES:
+                choice_id = answer_data.get('selected_choice_id')
+                # Verify choice belongs to the question (guard rail)
+                if choice_id and choice_id in question.choices:
+                    selected_choice_id = choice_id
+                    is_correct = question.choices[choice_id]
+            elif question.correct_text is not None:
+                # Simple case-insensitive comparison for text answers
+                is_correct = normalize_text_answer(text_answer) == question.correct_text
+
+            if is_correct:
+                score += 1
+
+            graded.append(Answer(
+                question_id=question_id,
+                selected_choice_id=selected_choice_id,
+                text_answer=text_answer,
+                is_correct=is_correct
+            ))
+
+        return score, graded
+
+
+def grade_submission(answer_key, taker_name, answers, token=None):
+    """
+    Grade a submission and store it with all of its answers.
+
+    Writes the QuizSubmission, a single bulk_create of Answer rows and the
+    analytics rollup increments inside one transaction, so the cost does not
+    grow with the number of questions. Returns the submission and its stored
+    answers, for rendering the result without reading them back, like
+    enqueue_submission. Raises IntegrityError if token was already stored
+    for this quiz.
+    """
+    score, graded = answer_key.grade(answers)
+
+    with transaction.atomic():
+        submission = QuizSubmission.objects.create(
+            quiz_id=answer_key.quiz_id,
+            taker_name=taker_name,
+            score=score,
+            total_questions=answer_key.question_count,
+            submission_token=token
+        )
+        for answer in graded:
+            answer.submission = submission
+        Answer.objects.bulk_create(graded)
+        record_submissions(answer_key.quiz_id, [(submission, graded)])
+
+    return submission, graded
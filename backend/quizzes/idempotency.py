@@ -0,0 +1,57 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .models import Answer, PendingSubmission, QuizSubmission
+from .serializers import QuizSubmissionResultSerializer
+from .submission_queue import unpack_pending
+
+
+def _result_key(quiz_id, token):
+    # Not versioned: a stored result does not change when the quiz does
+    return f'quiz:{quiz_id}:result:{token}'
+
+
+def remember_result(quiz_id, token, data):
+    """Cache the rendered result of a submission so replays of its token skip the database"""
+    cache.set(_result_key(quiz_id, token), dict(data), settings.QUIZ_RESULT_CACHE_TIMEOUT)
+
+
+def stored_result(answer_key, token):
+    """
+    Render the result already recorded under token, or return None.
+
+    Looks for a stored submission first and then for one still queued, and
+    caches what it finds.
+    """
+    submission = QuizSubmission.objects.filter(
+        quiz_id=answer_key.quiz_id, submission_token=token).prefetch_related(
+            Prefetch('answers', queryset=Answer.objects.order_by('id'))).first()
+    context = {'answer_key': answer_key}
+    if submission is None:
+        pending = PendingSubmission.objects.filter(
+            quiz_id=answer_key.quiz_id, token=token).first()
+        if pending is None:
+            return None
+        submission, context['answers'] = unpack_pending(pending)
+
+    data = QuizSubmissionResultSerializer(submission, context=context).data
+    remember_result(answer_key.quiz_id, token, data)
+    return data
+
+
+def get_replay(answer_key, token):
+    """Result previously recorded under token, from the cache when possible, or None"""
+    data = cache.get(_result_key(answer_key.quiz_id, token))
+    if data is None:
+        data = stored_result(answer_key, token)
+    return data
+
+
+async def aget_replay(answer_key, token):
+    """Async version of get_replay"""
+    data = await cache.aget(_result_key(answer_key.quiz_id, token))
+    if data is None:
+        data = await sync_to_async(stored_result)(answer_key, token)
+    return data
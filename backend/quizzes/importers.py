@@ -0,0 +1,360 @@
+import csv
+import json
+import re
+from collections import namedtuple
+from pathlib import PurePath
+
+from .serializers import QuizWithQuestionsCreateSerializer
+from .services import MAX_QUESTIONS_PER_QUIZ, create_quizzes
+
+# number is the record's position in the file: the item index for JSON
+# arrays, the line it starts on otherwise. A record has data or an error.
+Record = namedtuple('Record', ['number', 'data', 'error'])
+
+IMPORT_FORMATS = ('json', 'ndjson', 'csv', 'gift')
+
+FORMAT_EXTENSIONS = {
+    '.json': 'json',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.csv': 'csv',
+    '.gift': 'gift',
+    '.txt': 'gift',
+}
+
+CSV_COLUMNS = ('quiz_title', 'quiz_description', 'question_text', 'question_type',
+               'order', 'correct_text_answer', 'choices')
+
+READ_SIZE = 64 * 1024
+# Longest single quiz a JSON array may hold
+MAX_JSON_ITEM_SIZE = 4 * 1024 * 1024
+
+
+def guess_format(filename):
+    """Import format implied by a file name, or None"""
+    return FORMAT_EXTENSIONS.get(PurePath(filename).suffix.lower())
+
+
+def _truncated(error, buffer):
+    """True if a decode error may only mean the item continues past the buffer"""
+    # A cut-off item fails at most 6 characters (a partial \uXXXX escape) from
+    # the end, except for an open string, which is reported at its opening quote
+    return error.pos >= len(buffer) - 6 or error.msg.startswith('Unterminated string')
+
+
+def parse_json(stream):
+    """
+    Yield quizzes from a JSON array, decoding one item at a time.
+
+    The file is read in fixed-size chunks and only the undecoded tail is kept
+    in memory, up to MAX_JSON_ITEM_SIZE characters per item. A syntax error
+    cannot be recovered from, so it ends the import as soon as it is read.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    # After an item, a ',' or ']' must come next
+    separated = True
+    number = 0
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started and buffer:
+            if buffer[0] != '[':
+                yield Record(1, None, 'Expected a JSON array of quizzes')
+                return
+            started = True
+            buffer = buffer[1:].lstrip()
+        if started and buffer[:1] == ']' and (not separated or not number):
+            return
+        if started and buffer and not separated:
+            if buffer[0] != ',':
+                yield Record(
+                    number + 1, None, f"Invalid JSON: Expecting ',' or ']' after quiz {number}")
+                return
+            separated = True
+            buffer = buffer[1:].lstrip()
+
+        if started and buffer and separated:
+            try:
+                data, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as exc:
+                if eof or not _truncated(exc, buffer):
+                    yield Record(number + 1, None, f'Invalid JSON: {exc.msg}')
+                    return
+            else:
+                # A value ending with the buffer, like a number, may continue
+                if end < len(buffer) or eof:
+                    number += 1
+                    separated = False
+                    buffer = buffer[end:]
+                    yield Record(number, data, None)
+                    continue
+
+        if eof:
+            yield Record(number + 1, None, 'Unexpected end of file')
+            return
+        if len(buffer) > MAX_JSON_ITEM_SIZE:
+            yield Record(
+                number + 1, None, f'Quiz is longer than {MAX_JSON_ITEM_SIZE} characters')
+            return
+        chunk = stream.read(READ_SIZE)
+        eof = not chunk
+        buffer += chunk
+
+
+def parse_ndjson(stream):
+    """Yield one quiz per non-blank line of newline-delimited JSON"""
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield Record(number, json.loads(line), None)
+        except json.JSONDecodeError as exc:
+            yield Record(number, None, f'Invalid JSON: {exc.msg}')
+
+
+def _csv_question(row):
+    """Question payload for a CSV row; choices are '|'-separated, '*' marks a correct one"""
+    question = {
+        'question_text': row['question_text'],
+        'question_type': row['question_type'],
+    }
+    if row.get('order'):
+        question['order'] = row['order']
+    if row.get('correct_text_answer'):
+        question['correct_text_answer'] = row['correct_text_answer']
+    if row.get('choices'):
+        question['choices'] = [
+            {'choice_text': text[1:], 'is_correct': True} if text.startswith('*')
+            else {'choice_text': text, 'is_correct': False}
+            for text in (part.strip() for part in row['choices'].split('|'))
+            if text
+        ]
+    return question
+
+
+def parse_csv(stream):
+    """
+    Yield quizzes from a CSV file with one question per row.
+
+    Consecutive rows with the same quiz_title make up one quiz, so only the
+    quiz being read is held in memory.
+    """
+    reader = csv.DictReader(stream)
+    missing = {'quiz_title', 'question_text', 'question_type'} - set(reader.fieldnames or ())
+    if missing:
+        yield Record(1, None, f"Missing CSV columns: {', '.join(sorted(missing))}")
+        return
+
+    current = None
+    number = None
+    for row in reader:
+        if current is None or row['quiz_title'] != current['title']:
+            if current is not None:
+                yield Record(number, current, None)
+            number = reader.line_num
+            current = {
+                'title': row['quiz_title'],
+                'description': row.get('quiz_description') or '',
+                'questions': [],
+            }
+        current['questions'].append(_csv_question(row))
+    if current is not None:
+        yield Record(number, current, None)
+
+
+GIFT_ESCAPES = re.compile(r'\\([~=#{}:])')
+GIFT_ANSWER_SPLIT = re.compile(r'(?<!\\)([=~])')
+
+
+def _gift_text(text):
+    return GIFT_ESCAPES.sub(r'\1', text).strip()
+
+
+def _gift_question(text):
+    """Question payload for one GIFT question; raises ValueError if unsupported"""
+    # Optional ::name:: prefix
+    text = re.sub(r'^::.*?::', '', text.strip(), flags=re.DOTALL)
+    match = re.match(r'^(.*?)(?<!\\)\{(.*)(?<!\\)\}\s*$', text, flags=re.DOTALL)
+    if not match:
+        raise ValueError('Question has no answer block')
+    question_text = _gift_text(match.group(1))
+    # Drop per-answer feedback
+    block = re.split(r'(?<!\\)#', match.group(2))[0].strip()
+
+    if block.upper() in ('T', 'TRUE', 'F', 'FALSE'):
+        is_true = block.upper().startswith('T')
+        return {
+            'question_text': question_text,
+            'question_type': 'true_false',
+            'choices': [
+                {'choice_text': 'True', 'is_correct': is_true},
+                {'choice_text': 'False', 'is_correct': not is_true},
+            ],
+        }
+
+    parts = GIFT_ANSWER_SPLIT.split(match.group(2))
+    answers = []
+    for marker, answer in zip(parts[1::2], parts[2::2]):
+        answer = re.split(r'(?<!\\)#', answer)[0]
+        # Ignore partial-credit weights like ~%50%
+        answer = re.sub(r'^%-?\d+(\.\d+)?%', '', answer.strip())
+        answers.append((marker == '=', _gift_text(answer)))
+    if not answers:
+        raise ValueError('Answer block is empty')
+
+    if all(is_correct for is_correct, _ in answers):
+        return {
+            'question_text': question_text,
+            'question_type': 'text',
+            'correct_text_answer': answers[0][1],
+        }
+    return {
+        'question_text': question_text,
+        'question_type': 'mcq',
+        'choices': [
+            {'choice_text': answer, 'is_correct': is_correct}
+            for is_correct, answer in answers
+        ],
+    }
+
+
+def parse_gift(stream, default_title='Imported quiz'):
+    """
+    Yield quizzes from a subset of Moodle's GIFT format.
+
+    Questions are separated by blank lines and '//' starts a comment line.
+    '$CATEGORY: a/b' starts a new quiz titled 'b'; questions before any
+    category go into a quiz named default_title. Supported answer blocks are
+    {T}/{F}, multiple choice with =right ~wrong, and short answers with only
+    =answers, which become text questions.
+    """
+    quiz = None
+    quiz_number = None
+    error = None
+    lines = []
+    question_start = None
+
+    def flush_question():
+        nonlocal error
+        if lines and error is None:
+            try:
+                quiz['questions'].append(_gift_question('\n'.join(lines)))
+            except ValueError as exc:
+                error = f'Line {question_start}: {exc}'
+        lines.clear()
+
+    def finish_quiz():
+        flush_question()
+        if quiz is not None and (quiz['questions'] or error):
+            return Record(quiz_number, None if error else quiz, error)
+        return None
+
+    for number, line in enumerate(stream, start=1):
+        stripped = line.strip()
+        if stripped.startswith('//'):
+            continue
+        if stripped.startswith('$CATEGORY:'):
+            record = finish_quiz()
+            if record:
+                yield record
+            title = stripped[len('$CATEGORY:'):].strip().rstrip('/').split('/')[-1]
+            quiz = {'title': title, 'questions': []}
+            quiz_number = number
+            error = None
+            continue
+        if not stripped:
+            flush_question()
+            continue
+        if quiz is None:
+            quiz = {'title': default_title, 'questions': []}
+            quiz_number = number
+        if not lines:
+            question_start = number
+        lines.append(stripped)
+
+    record = finish_quiz()
+    if record:
+        yield record
+
+
+def parse_file(stream, file_format, name=None):
+    """Yield quiz records from a text stream in one of IMPORT_FORMATS"""
+    if file_format == 'json':
+        return parse_json(stream)
+    if file_format == 'ndjson':
+        return parse_ndjson(stream)
+    if file_format == 'csv':
+        return parse_csv(stream)
+    if file_format == 'gift':
+        title = PurePath(name).stem if name else 'Imported quiz'
+        return parse_gift(stream, default_title=title)
+    raise ValueError(f'Unknown import format: {file_format}')
+
+
+class ImportReport:
+    """Outcome of an import: created quiz ids and per-record errors"""
+
+    def __init__(self):
+        self.quiz_ids = []
+        self.errors = []
+
+    def add_error(self, number, errors):
+        self.errors.append({'record': number, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': len(self.quiz_ids),
+            'quiz_ids': self.quiz_ids,
+            'errors': self.errors,
+        }
+
+
+def import_quizzes(owner, records, batch_size=100):
+    """
+    Validate parsed records and create valid quizzes for owner in batches.
+
+    Each record goes through QuizWithQuestionsCreateSerializer and the
+    per-quiz question limit. Valid quizzes are created batch_size at a time,
+    each batch in its own transaction. Invalid records are reported and
+    skipped. Text that is not UTF-8 ends the import like a syntax error:
+    it is reported, and the quizzes read before it are still created.
+    """
+    report = ImportReport()
+    batch = []
+    number = 0
+
+    def flush():
+        if batch:
+            report.quiz_ids.extend(quiz.id for quiz in create_quizzes(owner, batch))
+            batch.clear()
+
+    records = iter(records)
+    while True:
+        try:
+            record = next(records, None)
+        except UnicodeDecodeError:
+            report.add_error(number + 1, {'non_field_errors': ['File must be UTF-8 encoded']})
+            break
+        if record is None:
+            break
+        number = record.number
+        if record.error:
+            report.add_error(record.number, {'non_field_errors': [record.error]})
+            continue
+        serializer = QuizWithQuestionsCreateSerializer(data=record.data)
+        if not serializer.is_valid():
+            report.add_error(record.number, serializer.errors)
+            continue
+        if len(serializer.validated_data['questions']) > MAX_QUESTIONS_PER_QUIZ:
+            report.add_error(record.number, {'questions': [
+                f'Maximum {MAX_QUESTIONS_PER_QUIZ} questions allowed per quiz']})
+            continue
+        batch.append(serializer.validated_data)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    return report
@@ -0,0 +1,319 @@
+import http.client
+import json
+import platform
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from quizzes.cache import local_cache
+from quizzes.grading import AnswerKey
+from quizzes.models import Quiz, QuizSubmission
+
+SCENARIOS = ('public_quiz', 'submit', 'analytics', 'quiz_list', 'create_quiz')
+
+
+class Scenario:
+    """One endpoint to drive: a request, and whether it needs the owner's token"""
+
+    def __init__(self, name, method, path, body=None, authenticated=False):
+        self.name = name
+        self.method = method
+        self.path = path
+        # Called per request, so bodies can carry fresh submission tokens
+        self.body = body or (lambda: None)
+        self.authenticated = authenticated
+
+
+def submit_body(answer_key):
+    """A submission answering every question, with a fresh token each call"""
+    answers = []
+    for question in answer_key.questions.values():
+        choice_ids = sorted(question.choices)
+        answers.append({
+            'question_id': question.id,
+            'selected_choice_id': choice_ids[0] if choice_ids else None,
+            'text_answer': '' if choice_ids else 'answer',
+        })
+    return lambda: json.dumps({
+        'taker_name': 'Benchmark',
+        'submission_token': str(uuid.uuid4()),
+        'answers': answers,
+    }).encode()
+
+
+def create_body(num_questions):
+    """A create-with-questions payload cycling through the question types"""
+    questions = []
+    for order in range(num_questions):
+        question_type = ('mcq', 'true_false', 'text')[order % 3]
+        question = {
+            'question_text': f'Benchmark question {order + 1}',
+            'question_type': question_type,
+            'order': order,
+        }
+        if question_type == 'mcq':
+            question['choices'] = [
+                {'choice_text': f'Option {index + 1}', 'is_correct': index == 0}
+                for index in range(4)
+            ]
+        elif question_type == 'true_false':
+            question['choices'] = [
+                {'choice_text': 'True', 'is_correct': True},
+                {'choice_text': 'False', 'is_correct': False},
+            ]
+        else:
+            question['correct_text_answer'] = 'answer'
+        questions.append(question)
+    body = json.dumps({'title': 'Benchmark quiz', 'questions': questions}).encode()
+    return lambda: body
+
+
+def build_scenarios(quiz, num_questions):
+    return {
+        'public_quiz': Scenario(
+            'public_quiz', 'GET', reverse('quiz-public', args=[quiz.pk])),
+        'submit': Scenario(
+            'submit', 'POST', reverse('quiz-submit', args=[quiz.pk]),
+            body=submit_body(AnswerKey.for_quiz(quiz.pk))),
+        'analytics': Scenario(
+            'analytics', 'GET', reverse('quiz-analytics', args=[quiz.pk]), authenticated=True),
+        'quiz_list': Scenario(
+            'quiz_list', 'GET', reverse('quiz-list-create'), authenticated=True),
+        'create_quiz': Scenario(
+            'create_quiz', 'POST', reverse('quiz-create-full'),
+            body=create_body(num_questions), authenticated=True),
+    }
+
+
+def summarize(latencies, statuses, query_counts, duration):
+    """Latency percentiles in ms, throughput and query counts for one scenario"""
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items()
+                      if not (isinstance(status, int) and status < 400)),
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        'throughput_rps': round(len(latencies) / duration, 1) if duration else None,
+        'latency_ms': {
+            'p50': round(cuts[49] * 1000, 3),
+            'p95': round(cuts[94] * 1000, 3),
+            'p99': round(cuts[98] * 1000, 3),
+            'mean': round(statistics.fmean(latencies) * 1000, 3),
+            'max': round(max(latencies) * 1000, 3),
+        },
+        'queries': {
+            'mean': round(statistics.fmean(query_counts), 2),
+            'max': max(query_counts),
+        } if query_counts else None,
+    }
+
+
+@contextmanager
+def throttles_disabled():
+    """Give every throttle scope no rate, so DRF throttles allow everything"""
+    rates = SimpleRateThrottle.THROTTLE_RATES
+    SimpleRateThrottle.THROTTLE_RATES = dict.fromkeys(rates)
+    try:
+        yield
+    finally:
+        SimpleRateThrottle.THROTTLE_RATES = rates
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the public quiz, submit, analytics, quiz list and quiz create '
+        'endpoints against seeded data (see seed_benchmark_data) and print '
+        'p50/p95/p99 latency, throughput and query counts as JSON. By default '
+        'requests go through the Django test client in this process, with '
+        'throttles off, a private cache and writes rolled back: every scenario '
+        'runs in one transaction, so write latencies leave out the commit. '
+        'With --commit each request commits on its own. With --server they go '
+        'to a running server over HTTP; start it with QUIZ_THROTTLING=False.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, help='Quiz to use (default: most submitted)')
+        parser.add_argument(
+            '--scenario', action='append', choices=SCENARIOS,
+            help='Scenario to run; repeat for several (default: all)')
+        parser.add_argument('-n', '--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per scenario')
+        parser.add_argument(
+            '--create-questions', type=int, default=10,
+            help='Questions per quiz in the create_quiz scenario')
+        parser.add_argument('--server', help='Base URL of a running server, e.g. http://127.0.0.1:8000')
+        parser.add_argument(
+            '-c', '--concurrency', type=int, default=1,
+            help='Concurrent keep-alive clients (--server only)')
+        parser.add_argument(
+            '--commit', action='store_true',
+            help='Commit each in-process request instead of rolling every write back')
+        parser.add_argument('--output', help='Write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be at least 1')
+        quiz = self._quiz(options['quiz'])
+        scenarios = build_scenarios(quiz, options['create_questions'])
+        names = options['scenario'] or SCENARIOS
+        token = str(RefreshToken.for_user(quiz.created_by).access_token)
+
+        if options['server']:
+            results = self._run_server(scenarios, names, token, options)
+        else:
+            results = self._run_client(scenarios, names, token, options)
+
+        report = {
+            'mode': 'server' if options['server'] else 'client',
+            'target': options['server'],
+            'quiz_id': quiz.pk,
+            'questions': quiz.questions.count(),
+            'submissions': quiz.submissions.count(),
+            'requests_per_scenario': options['requests'],
+            'concurrency': options['concurrency'] if options['server'] else 1,
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'scenarios': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as stream:
+                stream.write(output + '\n')
+        self.stdout.write(output)
+
+    def _quiz(self, quiz_id):
+        if quiz_id is None:
+            quiz_id = QuizSubmission.objects.values('quiz').annotate(
+                count=Count('id')).order_by('-count').values_list('quiz', flat=True).first()
+        quiz = Quiz.objects.select_related('created_by').filter(pk=quiz_id).first()
+        if quiz is None:
+            raise CommandError('No quiz to benchmark; run seed_benchmark_data or pass --quiz')
+        return quiz
+
+    def _run_client(self, scenarios, names, token, options):
+        if options['commit']:
+            # Requests commit as they would on a server
+            cache_settings = rollback = nullcontext()
+        else:
+            # Cache entries built from rows that get rolled back would outlive
+            # them in the cache a server shares, so this run gets its own cache
+            cache_settings = override_settings(CACHES={
+                'default': {
+                    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                    'LOCATION': 'benchmark-api',
+                },
+            })
+            rollback = transaction.atomic()
+        try:
+            with cache_settings, throttles_disabled(), rollback:
+                results = {}
+                for name in names:
+                    results[name] = self._drive_client(scenarios[name], token, options)
+                if not options['commit']:
+                    transaction.set_rollback(True)
+        finally:
+            local_cache.clear()
+        return results
+
+    def _drive_client(self, scenario, token, options):
+        # A host ALLOWED_HOSTS accepts, rather than the test client's 'testserver'
+        host = next(
+            (host.lstrip('.') for host in settings.ALLOWED_HOSTS if host and '*' not in host),
+            'localhost')
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if scenario.authenticated else {}
+        client = Client(SERVER_NAME=host, **headers)
+
+        def send():
+            return client.generic(
+                scenario.method, scenario.path, scenario.body() or b'',
+                content_type='application/json')
+
+        for _ in range(options['warmup']):
+            send()
+        latencies, query_counts, statuses = [], [], Counter()
+        started = time.perf_counter()
+        for _ in range(options['requests']):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = send()
+                latencies.append(time.perf_counter() - start)
+            query_counts.append(len(queries))
+            statuses[response.status_code] += 1
+        return summarize(latencies, statuses, query_counts, time.perf_counter() - started)
+
+    def _run_server(self, scenarios, names, token, options):
+        url = urlsplit(options['server'])
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise CommandError(f"Not an http(s) URL: {options['server']}")
+        connection_class = (
+            http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection)
+        prefix = url.path.rstrip('/')
+        return {
+            name: self._drive_server(
+                scenarios[name], lambda: connection_class(url.hostname, url.port, timeout=30),
+                prefix, token, options)
+            for name in names
+        }
+
+    def _drive_server(self, scenario, connect, prefix, token, options):
+        headers = {'Content-Type': 'application/json'}
+        if scenario.authenticated:
+            headers['Authorization'] = f'Bearer {token}'
+        path = prefix + scenario.path
+        remaining = iter(range(options['warmup'] + options['requests']))
+        lock = threading.Lock()
+        latencies, statuses = [], Counter()
+        started = None
+
+        def worker():
+            nonlocal started
+            client = connect()
+            while True:
+                with lock:
+                    index = next(remaining, None)
+                    if index is None:
+                        break
+                    if index == options['warmup']:
+                        started = time.perf_counter()
+                start = time.perf_counter()
+                try:
+                    client.request(scenario.method, path, body=scenario.body(), headers=headers)
+                    response = client.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException) as exc:
+                    status = type(exc).__name__
+                    client.close()
+                    client = connect()
+                elapsed = time.perf_counter() - start
+                if index >= options['warmup']:
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses[status] += 1
+            client.close()
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            workers = [pool.submit(worker) for _ in range(options['concurrency'])]
+        for future in workers:
+            # Re-raise what a worker did not expect, rather than report fewer requests
+            future.result()
+        duration = time.perf_counter() - started if started else 0
+        # Query counts are not visible from outside the server process
+        return summarize(latencies, statuses, None, duration)
@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from quizzes.models import Answer, Choice, Question, Quiz, QuizSubmission
+from quizzes.seeding import seed_quizzes
+
+INDEXED_MODELS = (Quiz, Question, Choice, QuizSubmission, Answer)
+
+
+def hot_queries(quiz, question):
+    """The read shapes the composite indexes are meant to serve"""
+    return [
+        ('dashboard quiz list',
+         Quiz.objects.filter(created_by_id=quiz.created_by_id).order_by('-created_at')[:20]),
+        ('questions in order',
+         Question.objects.filter(quiz=quiz).order_by('order')),
+        ('correct choice',
+         Choice.objects.filter(question=question, is_correct=True)),
+        ('submissions feed page',
+         QuizSubmission.objects.filter(quiz=quiz).order_by('-submitted_at', '-id')[:50]),
+        ('top score',
+         QuizSubmission.objects.filter(quiz=quiz).order_by('-score')[:1]),
+        ('correct answers per question',
+         Answer.objects.filter(question=question, is_correct=True)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a synthetic dataset and compare query plans and timings for the '
+        'hot query shapes with and without the composite indexes. Everything, '
+        'including the seeded rows, is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--quizzes', type=int, default=20, help='Quizzes per user')
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--submissions', type=int, default=200, help='Submissions per quiz')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--no-explain', action='store_true', help='Skip query plans')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            result = seed_quizzes(
+                users=options['users'],
+                quizzes_per_user=options['quizzes'],
+                questions_per_quiz=options['questions'],
+                submissions_per_quiz=options['submissions'],
+                seed=options['seed'],
+            )
+            self.stdout.write('Seeded ' + ', '.join(
+                f'{count} {name}' for name, count in result.as_dict().items()))
+
+            quiz = Quiz.objects.order_by('-id').first()
+            question = Question.objects.filter(quiz=quiz, question_type='mcq').first()
+            queries = hot_queries(quiz, question)
+
+            self._set_indexes(create=False)
+            self._analyze()
+            before = self._measure(queries, options, 'without')
+
+            self._set_indexes(create=True)
+            self._analyze()
+            after = self._measure(queries, options, 'with')
+
+            self.stdout.write('')
+            self.stdout.write(f"{'query':<32}{'before ms':>12}{'after ms':>12}")
+            for label, _ in queries:
+                self.stdout.write(f'{label:<32}{before[label]:>12.3f}{after[label]:>12.3f}')
+
+            transaction.set_rollback(True)
+
+    def _set_indexes(self, create):
+        # Raw DDL rather than schema_editor(), which SQLite refuses inside a transaction
+        editor = connection.schema_editor(collect_sql=True)
+        editor.deferred_sql = []
+        with connection.cursor() as cursor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    statement = (
+                        index.create_sql(model, editor) if create
+                        else index.remove_sql(model, editor))
+                    cursor.execute(str(statement))
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def _measure(self, queries, options, state):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\nPlans {state} composite indexes'))
+        timings = {}
+        for label, queryset in queries:
+            if not options['no_explain']:
+                self.stdout.write(self.style.MIGRATE_LABEL(label))
+                self.stdout.write(queryset.explain())
+            samples = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                list(queryset.all())
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[label] = statistics.median(samples)
+        return timings
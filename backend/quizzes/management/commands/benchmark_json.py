@@ -0,0 +1,114 @@
+import json
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework import renderers
+
+from quizzes import parsers
+from quizzes.grading import AnswerKey
+from quizzes.models import Answer, Quiz, QuizSubmission
+from quizzes.renderers import JSONRenderer
+from quizzes.rollups import build_quiz_analytics
+from quizzes.seeding import seed_quizzes
+from quizzes.serializers import (
+    QuizDetailSerializer,
+    QuizPublicSerializer,
+    QuizSubmissionAnalyticsSerializer,
+    QuizSubmissionResultSerializer,
+)
+
+
+def endpoint_payloads(quiz):
+    """Serialized data for the largest responses, as the views build it"""
+    quiz = Quiz.objects.select_related('created_by').with_questions().get(pk=quiz.pk)
+    submission = QuizSubmission.objects.filter(quiz=quiz).prefetch_related(
+        Prefetch('answers', queryset=Answer.objects.order_by('id'))).first()
+    submissions = QuizSubmission.objects.filter(quiz=quiz).order_by('-submitted_at', '-id')
+    return [
+        ('quiz detail', QuizDetailSerializer(quiz).data),
+        ('public quiz', QuizPublicSerializer(quiz).data),
+        ('analytics', build_quiz_analytics(quiz)),
+        ('submissions feed', QuizSubmissionAnalyticsSerializer(submissions, many=True).data),
+        ('submission result', QuizSubmissionResultSerializer(
+            submission, context={'answer_key': AnswerKey.for_quiz(quiz.pk)}).data),
+    ]
+
+
+def submit_body(quiz):
+    """A submit request answering every question of quiz"""
+    answers = []
+    for question in quiz.questions.prefetch_related('choices'):
+        choices = list(question.choices.all())
+        answers.append({
+            'question_id': question.id,
+            'selected_choice_id': choices[0].id if choices else None,
+            'text_answer': '' if choices else 'an answer',
+        })
+    return json.dumps({
+        'taker_name': 'Benchmark',
+        'submission_token': str(uuid.uuid4()),
+        'answers': answers,
+    }).encode()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare JSON rendering and parsing time and output size between the '
+        'stdlib and orjson paths for the largest quiz payloads. Seeded rows '
+        'are rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=100, help='Questions in the quiz')
+        parser.add_argument('--submissions', type=int, default=2000, help='Submissions to the quiz')
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per payload')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        if parsers.orjson is None:
+            self.stderr.write('orjson is not installed; both columns use the stdlib.')
+
+        with transaction.atomic():
+            seed_quizzes(
+                users=1, quizzes_per_user=1,
+                questions_per_quiz=options['questions'],
+                submissions_per_quiz=options['submissions'],
+                seed=options['seed'],
+            )
+            quiz = Quiz.objects.order_by('-id').first()
+            payloads = endpoint_payloads(quiz)
+            body = submit_body(quiz)
+            transaction.set_rollback(True)
+
+        stdlib, fast = renderers.JSONRenderer(), JSONRenderer()
+        self.stdout.write(
+            f"{'render':<20}{'bytes':>10}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+        for label, data in payloads:
+            rendered = fast.render(data)
+            if rendered != stdlib.render(data):
+                self.stderr.write(self.style.ERROR(f'{label}: output differs from stdlib'))
+            self._row(label, len(rendered),
+                      self._time(lambda: stdlib.render(data), options['repeat']),
+                      self._time(lambda: fast.render(data), options['repeat']))
+
+        self.stdout.write(
+            f"\n{'parse':<20}{'bytes':>10}{'stdlib ms':>12}{'fast ms':>12}{'speedup':>10}")
+        self._row('submit request', len(body),
+                  self._time(lambda: json.loads(body), options['repeat']),
+                  self._time(lambda: parsers.loads(body), options['repeat']))
+
+    def _time(self, func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+
+    def _row(self, label, size, before, after):
+        speedup = before / after if after else float('inf')
+        self.stdout.write(f'{label:<20}{size:>10}{before:>12.3f}{after:>12.3f}{speedup:>9.1f}x')
@@ -0,0 +1,101 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from quizzes.models import Quiz, QuizSubmission
+from quizzes.seeding import seed_quizzes
+from quizzes.serializers import (
+    QuizListRowSerializer,
+    QuizListSerializer,
+    QuizPublicRowSerializer,
+    QuizPublicSerializer,
+    QuizSubmissionAnalyticsSerializer,
+    QuizSubmissionRowSerializer,
+)
+
+
+def read_paths(quiz):
+    """(label, ModelSerializer read, row serializer read) for each hot endpoint"""
+    # Every read clones its queryset, so no run reuses another's result cache
+    quizzes = Quiz.objects.filter(created_by_id=quiz.created_by_id).with_stats().order_by(
+        '-created_at', '-id')
+    submissions = QuizSubmission.objects.filter(quiz=quiz).order_by('-submitted_at', '-id')
+    public = Quiz.objects.filter(pk=quiz.pk)
+    return [
+        ('quiz list',
+         lambda: QuizListSerializer(quizzes.select_related('created_by').all(), many=True).data,
+         lambda: QuizListRowSerializer(quizzes.list_rows(), many=True).data),
+        ('submissions feed',
+         lambda: QuizSubmissionAnalyticsSerializer(submissions.all(), many=True).data,
+         lambda: QuizSubmissionRowSerializer(submissions.feed_rows(), many=True).data),
+        ('public quiz',
+         lambda: QuizPublicSerializer(public.with_questions().get()).data,
+         lambda: QuizPublicRowSerializer(public.public_row()).data),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare query-plus-serialize time for the quiz list, submissions feed '
+        'and public quiz between the ModelSerializers and the values()-based '
+        'row serializers, and check that both render the same bytes. Seeded '
+        'rows are rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quizzes', type=int, default=100, help='Quizzes for the list')
+        parser.add_argument('--questions', type=int, default=50, help='Questions per quiz')
+        parser.add_argument('--submissions', type=int, default=2000,
+                            help='Submissions to the benchmarked quiz')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per read')
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_quizzes(
+                users=1, quizzes_per_user=options['quizzes'],
+                questions_per_quiz=options['questions'], submissions_per_quiz=0,
+                seed=options['seed'],
+            )
+            owner_id = Quiz.objects.order_by('-id').values_list('created_by', flat=True).first()
+            seed_quizzes(
+                users=1, quizzes_per_user=1,
+                questions_per_quiz=options['questions'],
+                submissions_per_quiz=options['submissions'],
+                seed=options['seed'],
+            )
+            quiz = Quiz.objects.order_by('-id').first()
+            # Benchmark the quiz with submissions inside the owner's full list
+            Quiz.objects.filter(pk=quiz.pk).update(created_by_id=owner_id)
+            quiz.created_by_id = owner_id
+
+            self.stdout.write(
+                f"{'read':<20}{'items':>8}{'model ms':>12}{'rows ms':>12}"
+                f"{'model/s':>12}{'rows/s':>12}")
+            renderer = JSONRenderer()
+            for label, model_read, row_read in read_paths(quiz):
+                if renderer.render(model_read()) != renderer.render(row_read()):
+                    self.stderr.write(self.style.ERROR(f'{label}: output differs'))
+                items = self._count(row_read())
+                before = self._time(model_read, options['repeat'])
+                after = self._time(row_read, options['repeat'])
+                self.stdout.write(
+                    f'{label:<20}{items:>8}{before:>12.3f}{after:>12.3f}'
+                    f'{items / before * 1000:>12.0f}{items / after * 1000:>12.0f}')
+
+            transaction.set_rollback(True)
+
+    def _count(self, data):
+        # Questions for the public quiz, rows otherwise
+        return len(data['questions']) if isinstance(data, dict) else len(data)
+
+    def _time(self, func, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from quizzes.submission_queue import drain_submissions
+
+
+class Command(BaseCommand):
+    help = 'Write queued quiz submissions to the database in bulk batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500, help='Submissions per transaction')
+        parser.add_argument(
+            '--loop', action='store_true', help='Keep polling the queue instead of exiting')
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait when the queue is empty (with --loop)')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            drained = drain_submissions(options['batch_size'])
+            total += drained
+            if drained:
+                self.stdout.write(f'Stored {drained} submissions')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'Drained {total} queued submissions'))
@@ -0,0 +1,46 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.importers import IMPORT_FORMATS, guess_format, import_quizzes, parse_file
+
+
+class Command(BaseCommand):
+    help = 'Import quizzes from a JSON, NDJSON, CSV or GIFT file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument(
+            '--owner', required=True, help='Username that will own the quizzes')
+        parser.add_argument(
+            '--format', dest='file_format', choices=IMPORT_FORMATS,
+            help='File format (default: guessed from the extension)')
+        parser.add_argument(
+            '--batch-size', type=int, default=100, help='Quizzes per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f"User not found: {options['owner']}")
+
+        path = options['path']
+        file_format = options['file_format'] or guess_format(path)
+        if file_format is None:
+            raise CommandError(
+                f"Cannot tell the format of {path}; pass --format ({', '.join(IMPORT_FORMATS)})")
+
+        try:
+            with open(path, encoding='utf-8', newline='') as stream:
+                report = import_quizzes(
+                    owner, parse_file(stream, file_format, name=path),
+                    batch_size=options['batch_size'])
+        except OSError as exc:
+            raise CommandError(f'Cannot read {path}: {exc}')
+
+        for error in report.errors:
+            self.stderr.write(f"Record {error['record']}: {json.dumps(error['errors'])}")
+        style = self.style.SUCCESS if not report.errors else self.style.WARNING
+        self.stdout.write(style(
+            f'Imported {len(report.quiz_ids)} quizzes, {len(report.errors)} records failed'))
@@ -0,0 +1,102 @@
+import http.client
+import json
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test a running server\'s public quiz endpoints with N concurrent '
+        'keep-alive clients and report throughput and latency percentiles. '
+        'Run it against a sync WSGI worker and an async ASGI worker to compare '
+        'how much concurrency each sustains. Raise the throttle rates on the '
+        'server first, or most responses will be 429s.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'url', help='Public quiz URL, e.g. http://127.0.0.1:8000/api/quizzes/public/1/')
+        parser.add_argument('-c', '--concurrency', type=int, default=32)
+        parser.add_argument('-n', '--requests', type=int, default=2000, help='Total requests')
+        parser.add_argument(
+            '--submit', action='store_true',
+            help='POST a submission to <url>submit/ instead of GETting the quiz')
+        parser.add_argument('--timeout', type=float, default=30)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme not in ('http', 'https') or not url.hostname:
+            raise CommandError(f"Not an http(s) URL: {options['url']}")
+        connection_class = (
+            http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection)
+
+        def connect():
+            return connection_class(url.hostname, url.port, timeout=options['timeout'])
+
+        method, path, body = 'GET', url.path, None
+        if options['submit']:
+            method, path = 'POST', url.path.rstrip('/') + '/submit/'
+            body = json.dumps(self._payload(connect(), url.path)).encode()
+        headers = {'Content-Type': 'application/json'} if body else {}
+
+        remaining = iter(range(options['requests']))
+        lock = threading.Lock()
+        latencies = []
+        statuses = Counter()
+
+        def worker():
+            connection = connect()
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        break
+                start = time.perf_counter()
+                try:
+                    connection.request(method, path, body=body, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    status = response.status
+                except (OSError, http.client.HTTPException) as exc:
+                    status = type(exc).__name__
+                    connection.close()
+                    connection = connect()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[status] += 1
+            connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for _ in range(options['concurrency']):
+                pool.submit(worker)
+        duration = time.perf_counter() - started
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        self.stdout.write(f'{method} {path} x{len(latencies)} at concurrency {options["concurrency"]}')
+        self.stdout.write(f'  throughput   {len(latencies) / duration:10.1f} req/s')
+        for label, index in (('p50', 49), ('p95', 94), ('p99', 98)):
+            self.stdout.write(f'  {label}          {cuts[index] * 1000:10.1f} ms')
+        self.stdout.write('  statuses     ' + ', '.join(
+            f'{status}: {count}' for status, count in sorted(statuses.items(), key=str)))
+
+    def _payload(self, connection, path):
+        """Submission answering the first choice of every question"""
+        connection.request('GET', path)
+        response = connection.getresponse()
+        if response.status != 200:
+            raise CommandError(f'GET {path} returned {response.status}')
+        quiz = json.loads(response.read())
+        connection.close()
+        return {'taker_name': 'loadtest', 'answers': [
+            {'question_id': question['id'],
+             'selected_choice_id': question['choices'][0]['id'] if question['choices'] else None,
+             'text_answer': ''}
+            for question in quiz['questions']
+        ]}
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.models import Quiz
+from quizzes.rollups import rebuild_quiz_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild quiz analytics rollups from raw submissions and answers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'quiz_ids', nargs='*', type=int,
+            help='Quizzes to rebuild (default: all quizzes)')
+
+    def handle(self, *args, **options):
+        quiz_ids = options['quiz_ids']
+        if quiz_ids:
+            missing = set(quiz_ids) - set(
+                Quiz.objects.filter(pk__in=quiz_ids).values_list('pk', flat=True))
+            if missing:
+                raise CommandError(
+                    f"Quizzes not found: {', '.join(map(str, sorted(missing)))}")
+        else:
+            quiz_ids = list(Quiz.objects.values_list('pk', flat=True))
+
+        count = 0
+        for quiz_id in quiz_ids:
+            stats = rebuild_quiz_stats(quiz_id)
+            count += 1
+            self.stdout.write(f'Quiz {quiz_id}: {stats.submission_count} submissions')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} quizzes'))
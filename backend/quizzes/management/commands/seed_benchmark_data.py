@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzes.seeding import seed_quizzes
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-insert a synthetic dataset of users, quizzes, questions, choices, '
+        'submissions and answers for benchmarking. Rows are committed; use a '
+        'throwaway database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--quizzes', type=int, default=20, help='Quizzes per user')
+        parser.add_argument('--questions', type=int, default=10, help='Questions per quiz')
+        parser.add_argument('--choices', type=int, default=4, help='Choices per MCQ question')
+        parser.add_argument('--submissions', type=int, default=200, help='Submissions per quiz')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for repeatable data')
+        parser.add_argument('--json', action='store_true', help='Print the row counts as JSON')
+
+    def handle(self, *args, **options):
+        for name in ('users', 'quizzes', 'questions', 'submissions'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} must not be negative')
+        if options['choices'] < 2 or options['batch_size'] < 1:
+            raise CommandError('--choices must be at least 2 and --batch-size at least 1')
+
+        result = seed_quizzes(
+            users=options['users'],
+            quizzes_per_user=options['quizzes'],
+            questions_per_quiz=options['questions'],
+            choices_per_question=options['choices'],
+            submissions_per_quiz=options['submissions'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(result.as_dict()))
+        else:
+            self.stdout.write(self.style.SUCCESS('Seeded ' + ', '.join(
+                f'{count} {name}' for name, count in result.as_dict().items())))
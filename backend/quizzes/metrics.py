@@ -0,0 +1,203 @@
+"""
+In-process request metrics, exposed in the Prometheus text format.
+
+RequestMetricsMiddleware opens a RequestMetrics for each request in a
+context variable. A database execute wrapper, the JSON renderer and the quiz
+cache add to it, and the middleware folds it into the histograms below once
+the response is ready. Every process keeps its own numbers.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+# Seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named family of series, one per combination of label values"""
+    kind = None
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            series = sorted(self._series.items())
+            lines += [line for values, state in series for line in self._lines(values, state)]
+        return lines
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *values, amount=1):
+        with self._lock:
+            self._series[values] = self._series.get(values, 0) + amount
+
+    def value(self, *values):
+        return self._series.get(values, 0)
+
+    def _lines(self, values, total):
+        yield f'{self.name}_total{_labels(self.labels, values)} {_number(total)}'
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, description, buckets, labels=()):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._series.get(values)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                state = self._series[values] = [[0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *values):
+        state = self._series.get(values)
+        return state[2] if state else 0
+
+    def total(self, *values):
+        state = self._series.get(values)
+        return state[1] if state else 0
+
+    def _lines(self, values, state):
+        counts, total, count = state
+        cumulative = 0
+        for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+            cumulative += bucket_count
+            le = (('le', bound if bound == '+Inf' else _number(bound)),)
+            yield f'{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}'
+        yield f'{self.name}_sum{_labels(self.labels, values)} {_number(total)}'
+        yield f'{self.name}_count{_labels(self.labels, values)} {count}'
+
+
+REQUESTS = Counter(
+    'quiz_http_requests', 'Requests by URL name, method and status code.',
+    ('url_name', 'method', 'status'))
+REQUEST_DURATION = Histogram(
+    'quiz_http_request_duration_seconds', 'Time to produce a response, by URL name.',
+    LATENCY_BUCKETS, ('url_name', 'method'))
+DB_QUERIES = Histogram(
+    'quiz_db_queries_per_request', 'SQL queries run per request, by URL name.',
+    QUERY_COUNT_BUCKETS, ('url_name', 'method'))
+DB_DURATION = Histogram(
+    'quiz_db_duration_seconds', 'Time spent in SQL per request, by URL name.',
+    LATENCY_BUCKETS, ('url_name', 'method'))
+RENDER_DURATION = Histogram(
+    'quiz_render_duration_seconds', 'Time spent rendering JSON per request, by URL name.',
+    LATENCY_BUCKETS, ('url_name', 'method'))
+CACHE_LOOKUPS = Counter(
+    'quiz_cache_lookups', 'Quiz cache lookups by entry and the tier that answered.',
+    ('entry', 'result'))
+
+METRICS = (REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, RENDER_DURATION, CACHE_LOOKUPS)
+
+
+class RequestMetrics:
+    """What one request spent, filled in while it runs"""
+
+    __slots__ = ('started', 'queries', 'query_time', 'render_time')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+
+
+current_request = ContextVar('quiz_request_metrics', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query's time to the current request"""
+    metrics = current_request.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.query_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver putting record_query on every new connection"""
+    if record_query not in connection.execute_wrappers:
+        # First, so execute_wrapper() blocks that pop the last wrapper keep working
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def record_render(elapsed):
+    metrics = current_request.get()
+    if metrics is not None:
+        metrics.render_time += elapsed
+
+
+def record_cache_lookup(entry, result):
+    """Count a quiz cache lookup answered by 'local', 'shared' or 'miss'"""
+    CACHE_LOOKUPS.inc(entry.split(':')[0], result)
+
+
+def observe_request(metrics, url_name, method, status):
+    """Fold a finished request into the histograms; returns its duration"""
+    duration = time.perf_counter() - metrics.started
+    REQUESTS.inc(url_name, method, str(status))
+    REQUEST_DURATION.observe(duration, url_name, method)
+    DB_QUERIES.observe(metrics.queries, url_name, method)
+    DB_DURATION.observe(metrics.query_time, url_name, method)
+    RENDER_DURATION.observe(metrics.render_time, url_name, method)
+    return duration
+
+
+def server_timing(metrics, duration):
+    """Server-Timing header value for a finished request"""
+    return (
+        f'db;dur={metrics.query_time * 1000:.2f};desc="{metrics.queries} queries", '
+        f'render;dur={metrics.render_time * 1000:.2f}, '
+        f'total;dur={duration * 1000:.2f}'
+    )
+
+
+def expose():
+    """All metrics in the Prometheus text exposition format"""
+    return '\n'.join(line for metric in METRICS for line in metric.expose()) + '\n'
+
+
+def reset():
+    for metric in METRICS:
+        metric.clear()
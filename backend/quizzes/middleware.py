@@ -0,0 +1,197 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import budgets, metrics, routers
+
+# Anything else is counted as OTHER, so odd methods cannot add series
+KNOWN_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'))
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, SQL and render time per URL name, and add Server-Timing.
+
+    Put it first in MIDDLEWARE so the timings cover the whole stack. Costs a
+    few clock reads and dictionary updates per request. Streamed responses
+    are recorded once their content is exhausted, so rows read while
+    streaming are counted; their Server-Timing only covers the work done
+    before the first chunk.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'QUIZ_SERVER_TIMING', settings.DEBUG)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_request.set(request_metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        return self.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current_request.set(request_metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        return self.finish(request, response, request_metrics)
+
+    def finish(self, request, response, request_metrics):
+        match = request.resolver_match
+        url_name = (match.url_name if match else None) or 'unmatched'
+        method = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        if response.streaming and not response.is_async:
+            # Streamed rows are read after __call__ returns
+            if self.server_timing:
+                response['Server-Timing'] = metrics.server_timing(
+                    request_metrics, time.perf_counter() - request_metrics.started)
+            response.streaming_content = self.stream(
+                response.streaming_content, request_metrics, url_name, method,
+                response.status_code)
+            return response
+        duration = metrics.observe_request(
+            request_metrics, url_name, method, response.status_code)
+        if self.server_timing:
+            response['Server-Timing'] = metrics.server_timing(request_metrics, duration)
+        return response
+
+    def stream(self, content, request_metrics, url_name, method, status_code):
+        chunks = iter(content)
+        try:
+            while True:
+                token = metrics.current_request.set(request_metrics)
+                try:
+                    chunk = next(chunks, None)
+                finally:
+                    metrics.current_request.reset(token)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            metrics.observe_request(request_metrics, url_name, method, status_code)
+
+
+class QueryBudgetMiddleware:
+    """
+    Hold each view to its query_budget, per QUIZ_QUERY_BUDGETS.
+
+    Off outside DEBUG unless the setting asks for it; when off it only reads
+    the setting. See quizzes.budgets.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = budgets.budget_mode()
+        if mode == 'off':
+            return self.get_response(request)
+        log = []
+        token = budgets.current_log.set(log)
+        try:
+            response = self.get_response(request)
+        finally:
+            budgets.current_log.reset(token)
+        budgets.check_budget(request, log, mode)
+        return response
+
+    async def __acall__(self, request):
+        mode = budgets.budget_mode()
+        if mode == 'off':
+            return await self.get_response(request)
+        log = []
+        token = budgets.current_log.set(log)
+        try:
+            response = await self.get_response(request)
+        finally:
+            budgets.current_log.reset(token)
+        budgets.check_budget(request, log, mode)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = budgets.get_query_budget(view_func)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route reads of use_replica views to QUIZ_REPLICA_DATABASE.
+
+    A request that writes pins its client to the primary for
+    QUIZ_REPLICA_PIN_SECONDS. Does nothing when no replica is configured.
+    See quizzes.routers.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.QUIZ_REPLICA_DATABASE:
+            return self.get_response(request)
+        routing = routers.ReplicaRouting()
+        token = routers.current_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.current_routing.reset(token)
+        return self.finish(request, response, routing)
+
+    async def __acall__(self, request):
+        if not settings.QUIZ_REPLICA_DATABASE:
+            return await self.get_response(request)
+        routing = routers.ReplicaRouting()
+        token = routers.current_routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.current_routing.reset(token)
+        return self.finish(request, response, routing)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = routers.current_routing.get()
+        if (routing is not None and request.method in routers.SAFE_METHODS
+                and routers.wants_replica(view_func) and not routers.is_pinned(request)):
+            routing.replica = True
+
+    def finish(self, request, response, routing):
+        if routing.wrote:
+            routers.pin_to_primary(request)
+        elif routing.replica and response.streaming and not response.is_async:
+            # Streamed rows are read after __call__ returns
+            response.streaming_content = self.stream(response.streaming_content, routing)
+        return response
+
+    def stream(self, content, routing):
+        chunks = iter(content)
+        while True:
+            token = routers.current_routing.set(routing)
+            try:
+                chunk = next(chunks, None)
+            finally:
+                routers.current_routing.reset(token)
+            if chunk is None:
+                return
+            yield chunk
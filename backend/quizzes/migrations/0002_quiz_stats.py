@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quizzes.quiz')),
+                ('submission_count', models.IntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('percentage_sum', models.FloatField(default=0)),
+                ('percentage_count', models.IntegerField(default=0)),
+                ('min_score', models.IntegerField(blank=True, null=True)),
+                ('max_score', models.IntegerField(blank=True, null=True)),
+                ('pass_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Quiz stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quizzes.question')),
+                ('total_answers', models.IntegerField(default=0)),
+                ('correct_answers', models.IntegerField(default=0)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_stats', to='quizzes.quiz')),
+            ],
+            options={
+                'verbose_name_plural': 'Question stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuizScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_buckets', to='quizzes.quiz')),
+            ],
+            options={
+                'ordering': ['bucket'],
+                'constraints': [models.UniqueConstraint(fields=('quiz', 'bucket'), name='unique_quiz_score_bucket')],
+            },
+        ),
+    ]
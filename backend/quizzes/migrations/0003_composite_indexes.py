@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-17 10:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0002_quiz_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'is_correct'], name='answer_question_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='choice',
+            index=models.Index(condition=models.Q(('is_correct', True)), fields=['question'], name='choice_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['quiz', 'order'], name='question_quiz_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['created_by', '-created_at'], name='quiz_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizsubmission',
+            index=models.Index(fields=['quiz', '-submitted_at', '-id'], name='submission_quiz_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizsubmission',
+            index=models.Index(fields=['quiz', 'score'], name='submission_quiz_score_idx'),
+        ),
+    ]
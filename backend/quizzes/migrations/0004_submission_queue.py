@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-17 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0003_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(unique=True)),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='quizsubmission',
+            name='submission_token',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='quizsubmission',
+            name='submitted_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='quizsubmission',
+            constraint=models.UniqueConstraint(condition=models.Q(('submission_token__isnull', False)), fields=('quiz', 'submission_token'), name='unique_quiz_submission_token'),
+        ),
+        migrations.AddField(
+            model_name='pendingsubmission',
+            name='quiz',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_submissions', to='quizzes.quiz'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-17 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0004_submission_queue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pendingsubmission',
+            name='token',
+            field=models.UUIDField(),
+        ),
+        migrations.AddConstraint(
+            model_name='pendingsubmission',
+            constraint=models.UniqueConstraint(fields=('quiz', 'token'), name='unique_pending_submission_token'),
+        ),
+    ]
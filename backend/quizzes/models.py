@@ -1,5 +1,59 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+
+class QuizQuerySet(models.QuerySet):
+    """Read plans matching the quiz serializers"""
+
+    def with_questions(self):
+        """Prefetch questions and their choices in display order"""
+        return self.prefetch_related(
+            models.Prefetch(
+                'questions', queryset=Question.objects.order_by('order', 'id')),
+            models.Prefetch(
+                'questions__choices', queryset=Choice.objects.order_by('id')),
+        )
+
+    def with_stats(self):
+        """Annotate question and submission counts and the last submission time"""
+        submissions = QuizSubmission.objects.filter(
+            quiz=models.OuterRef('pk')).order_by()
+        return self.annotate(
+            question_count=models.Count('questions'),
+            submission_count=Coalesce(models.Subquery(
+                submissions.values('quiz').annotate(
+                    count=models.Count('pk')).values('count')), 0),
+            last_submission_at=models.Subquery(
+                submissions.order_by('-submitted_at').values('submitted_at')[:1]),
+        )
+
+    def list_rows(self):
+        """Rows for QuizListRowSerializer; apply after with_stats()"""
+        return self.values(
+            'id', 'title', 'description', 'created_by__username', 'question_count',
+            'submission_count', 'last_submission_at', 'created_at')
+
+    def public_row(self):
+        """
+        The first quiz as a row for QuizPublicRowSerializer, or None.
+
+        The row carries updated_at and its questions, in display order, each
+        with its choices. Costs one query per level, like with_questions().
+        """
+        row = self.values('id', 'title', 'description', 'updated_at').first()
+        if row is None:
+            return None
+        row['questions'] = list(Question.objects.filter(quiz_id=row['id']).order_by(
+            'order', 'id').values('id', 'question_text', 'question_type', 'order'))
+        choices = {question['id']: [] for question in row['questions']}
+        for question in row['questions']:
+            question['choices'] = choices[question['id']]
+        for choice in Choice.objects.filter(question__quiz_id=row['id']).order_by('id').values(
+                'id', 'question_id', 'choice_text'):
+            choices[choice['question_id']].append(choice)
+        return row
 
 
 class Quiz(models.Model):
@@ -11,9 +65,15 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = QuizQuerySet.as_manager()
+
     class Meta:
         verbose_name_plural = 'Quizzes'
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard list: a user's quizzes, newest first
+            models.Index(fields=['created_by', '-created_at'], name='quiz_owner_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -39,6 +99,9 @@ class Question(models.Model):
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['quiz', 'order'], name='question_quiz_order_idx'),
+        ]
 
     def __str__(self):
         return f"{self.quiz.title} - Q{self.order}: {self.question_text[:50]}"
@@ -51,10 +114,28 @@ class Choice(models.Model):
     choice_text = models.CharField(max_length=200)
     is_correct = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Partial index: only the correct choice of each question
+            models.Index(
+                fields=['question'], condition=models.Q(is_correct=True),
+                name='choice_correct_idx'),
+        ]
+
     def __str__(self):
         return f"{self.choice_text} ({'Correct' if self.is_correct else 'Incorrect'})"
 
 
+class QuizSubmissionQuerySet(models.QuerySet):
+    """Read plans matching the submission serializers"""
+
+    def feed_rows(self):
+        """Rows for QuizSubmissionRowSerializer, with the unrounded percentage computed in SQL"""
+        return self.values(
+            'id', 'taker_name', 'score', 'total_questions', 'submitted_at',
+            percentage=Cast('score', models.FloatField()) / NullIf('total_questions', 0) * 100)
+
+
 class QuizSubmission(models.Model):
     """Stores a complete quiz submission with score"""
     quiz = models.ForeignKey(
@@ -62,7 +143,27 @@ class QuizSubmission(models.Model):
     taker_name = models.CharField(max_length=100, blank=True, null=True)
     score = models.IntegerField(default=0)
     total_questions = models.IntegerField(default=0)
-    submitted_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add, so queued submissions keep the
+    # time they were made
+    submitted_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Idempotency key; a token is stored at most once per quiz
+    submission_token = models.UUIDField(null=True, blank=True, editable=False)
+
+    objects = QuizSubmissionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Submissions feed: keyset on (submitted_at, id) within a quiz
+            models.Index(
+                fields=['quiz', '-submitted_at', '-id'], name='submission_quiz_recent_idx'),
+            models.Index(fields=['quiz', 'score'], name='submission_quiz_score_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['quiz', 'submission_token'],
+                condition=models.Q(submission_token__isnull=False),
+                name='unique_quiz_submission_token'),
+        ]
 
     def __str__(self):
         return f"{self.taker_name or 'Anonymous'} - {self.quiz.title}: {self.score}/{self.total_questions}"
@@ -84,5 +185,88 @@ class Answer(models.Model):
     text_answer = models.TextField(blank=True, null=True)
     is_correct = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['question', 'is_correct'], name='answer_question_correct_idx'),
+        ]
+
     def __str__(self):
         return f"Answer to {self.question.question_text[:30]}"
+
+
+class PendingSubmission(models.Model):
+    """A graded submission waiting to be written by the drain_submissions worker"""
+    quiz = models.ForeignKey(
+        Quiz, on_delete=models.CASCADE, related_name='pending_submissions')
+    token = models.UUIDField()
+    # taker_name, score, total_questions and answers as
+    # [question_id, selected_choice_id, text_answer, is_correct] rows
+    payload = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            # Scoped like QuizSubmission's, so both modes accept the same tokens
+            models.UniqueConstraint(
+                fields=['quiz', 'token'], name='unique_pending_submission_token'),
+        ]
+
+    def __str__(self):
+        return f"Pending submission {self.token} for quiz {self.quiz_id}"
+
+
+class QuizStats(models.Model):
+    """Submission rollup for a quiz, incremented at grading time"""
+    quiz = models.OneToOneField(
+        Quiz, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    submission_count = models.IntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0)
+    # Sum and count of percentages, skipping submissions to empty quizzes
+    percentage_sum = models.FloatField(default=0)
+    percentage_count = models.IntegerField(default=0)
+    min_score = models.IntegerField(null=True, blank=True)
+    max_score = models.IntegerField(null=True, blank=True)
+    pass_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'Quiz stats'
+
+    def __str__(self):
+        return f"Stats for quiz {self.quiz_id}"
+
+
+class QuizScoreBucket(models.Model):
+    """Score histogram bucket for a quiz (bucket n covers n*10% to n*10+9%, 100% in bucket 9)"""
+    BUCKET_COUNT = 10
+
+    quiz = models.ForeignKey(
+        Quiz, on_delete=models.CASCADE, related_name='score_buckets')
+    bucket = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['bucket']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['quiz', 'bucket'], name='unique_quiz_score_bucket'),
+        ]
+
+    def __str__(self):
+        return f"Quiz {self.quiz_id} bucket {self.bucket}: {self.count}"
+
+
+class QuestionStats(models.Model):
+    """Answer rollup for a question, incremented at grading time"""
+    question = models.OneToOneField(
+        Question, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    quiz = models.ForeignKey(
+        Quiz, on_delete=models.CASCADE, related_name='question_stats')
+    total_answers = models.IntegerField(default=0)
+    correct_answers = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = 'Question stats'
+
+    def __str__(self):
+        return f"Stats for question {self.question_id}"
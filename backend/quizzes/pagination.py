@@ -0,0 +1,96 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class QuizCursorPagination(CursorPagination):
+    """Cursor pagination for the quiz dashboard list, newest first"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+
+class SubmissionKeysetPagination(BasePagination):
+    """
+    Keyset pagination for quiz submissions on (submitted_at, id), newest first.
+
+    Pages a values() queryset; rows must include submitted_at and id.
+
+    The cursor encodes the last row's key, so every page is a single indexed
+    range scan no matter how deep the client pages.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by('-submitted_at', '-id')
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            submitted_at, pk = position
+            queryset = queryset.filter(
+                Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, id__lt=pk))
+
+        page = list(queryset[:self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.last_row = page[-1] if page else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            submitted_at, pk = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            submitted_at = datetime.fromisoformat(submitted_at)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return submitted_at, pk
+
+    def encode_cursor(self, row):
+        position = f"{row['submitted_at'].isoformat()}|{row['id']}"
+        encoded = urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.last_row)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,42 @@
+import json
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.json import strict_constant
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data, encoding='utf-8', strict=True):
+    """
+    Decode a JSON document from bytes, with orjson when it is installed.
+
+    Invalid documents are decoded again by the stdlib, so errors are the
+    stdlib's ValueError and message either way. orjson never accepts NaN or
+    infinity, so non-strict decoding always uses the stdlib.
+    """
+    if orjson is not None and strict and encoding.lower().replace('-', '') == 'utf8':
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, bytes):
+        data = data.decode(encoding)
+    return json.loads(data, parse_constant=strict_constant if strict else None)
+
+
+class JSONParser(parsers.JSONParser):
+    """DRF's JSONParser, decoding with orjson when it is installed"""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            return loads(stream.read(), encoding, self.strict)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
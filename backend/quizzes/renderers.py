@@ -0,0 +1,47 @@
+import time
+
+from rest_framework import renderers
+
+from .metrics import record_render
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Datetimes go through the DRF encoder, which writes UTC as 'Z' like the
+# stdlib path; orjson would write '+00:00'
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's JSONRenderer, encoding with orjson when it is installed.
+
+    Output is byte-for-byte what the stdlib path produces for compact,
+    unicode, unindented JSON (DRF's defaults). Anything else, including
+    indented output for the browsable API and values orjson cannot encode,
+    goes through the stdlib path. NaN and infinity render as null rather than
+    raising.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        start = time.perf_counter()
+        try:
+            return self._render(data, accepted_media_type, renderer_context)
+        finally:
+            record_render(time.perf_counter() - start)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if (
+            orjson is None or data is None or not self.compact or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep the output a strict javascript subset, as DRF does
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,236 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.db.models import Case, Count, F, IntegerField, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, Least, NullIf
+
+from .models import (
+    Answer,
+    Question,
+    QuestionStats,
+    Quiz,
+    QuizScoreBucket,
+    QuizStats,
+    QuizSubmission,
+)
+from .routers import primary_reads
+
+PASS_THRESHOLD = 0.7
+
+# Sent by record_submissions with quiz_id, for cache invalidation
+submissions_recorded = Signal()
+
+
+def score_bucket(score, total_questions):
+    """Histogram bucket (0-9) for a score, by whole tens of percent"""
+    if total_questions <= 0:
+        return 0
+    return min(score * 10 // total_questions, QuizScoreBucket.BUCKET_COUNT - 1)
+
+
+def _update_grouped(queryset, key_field, field, deltas):
+    """Add deltas[key] to field, with one UPDATE per distinct delta value"""
+    keys_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        keys_by_delta[delta].append(key)
+    for delta, keys in keys_by_delta.items():
+        queryset.filter(**{f'{key_field}__in': keys}).update(
+            **{field: F(field) + delta})
+
+
+def lock_quiz_rollups(quiz_id):
+    """
+    Lock the quiz row until the transaction ends.
+
+    Rebuilds and increments of a quiz's rollups both take this lock, so a
+    rebuild never misses a submission committed while it runs, and no
+    increment lands while the rollup is being replaced. It is a NO KEY
+    UPDATE lock: the KEY SHARE lock a submission INSERT takes on the quiz
+    through its foreign key does not conflict with it, so concurrent
+    submissions neither deadlock nor wait on each other's inserts.
+    """
+    Quiz.objects.select_for_update(no_key=True).filter(pk=quiz_id).values_list('pk').first()
+
+
+def record_submissions(quiz_id, submissions):
+    """
+    Fold newly graded submissions into the quiz's rollups with F() increments.
+
+    submissions is a list of (QuizSubmission, [Answer, ...]) pairs. Call this
+    inside the transaction that stores them; it holds the quiz's rollup lock
+    from here to the commit. If the quiz has no rollup yet, nothing is written
+    and the next read rebuilds it from raw data instead.
+    """
+    lock_quiz_rollups(quiz_id)
+    submissions_recorded.send(sender=QuizSubmission, quiz_id=quiz_id)
+    scores = [(submission.score, submission.total_questions) for submission, _ in submissions]
+    lowest = min(score for score, _ in scores)
+    highest = max(score for score, _ in scores)
+    scored = [(score, total) for score, total in scores if total > 0]
+
+    updated = QuizStats.objects.filter(quiz_id=quiz_id).update(
+        submission_count=F('submission_count') + len(scores),
+        score_sum=F('score_sum') + sum(score for score, _ in scores),
+        percentage_sum=F('percentage_sum') + sum(
+            score / total * 100 for score, total in scored),
+        percentage_count=F('percentage_count') + len(scored),
+        min_score=Least(Coalesce(F('min_score'), Value(lowest)), Value(lowest)),
+        max_score=Greatest(Coalesce(F('max_score'), Value(highest)), Value(highest)),
+        pass_count=F('pass_count') + sum(
+            1 for score, total in scores if score >= total * PASS_THRESHOLD),
+    )
+    if not updated:
+        return
+
+    buckets = Counter(score_bucket(score, total) for score, total in scores)
+    _update_grouped(
+        QuizScoreBucket.objects.filter(quiz_id=quiz_id), 'bucket', 'count', buckets)
+
+    answered = Counter()
+    correct = Counter()
+    for _, answers in submissions:
+        for answer in answers:
+            answered[answer.question_id] += 1
+            if answer.is_correct:
+                correct[answer.question_id] += 1
+    question_stats = QuestionStats.objects.filter(quiz_id=quiz_id)
+    _update_grouped(question_stats, 'question_id', 'total_answers', answered)
+    _update_grouped(question_stats, 'question_id', 'correct_answers', correct)
+
+
+def invalidate_quiz_stats(quiz_id):
+    """Drop a quiz's rollup so the next read rebuilds it from raw data"""
+    QuizStats.objects.filter(quiz_id=quiz_id).delete()
+
+
+@primary_reads()
+def rebuild_quiz_stats(quiz_id):
+    """Recompute every rollup for a quiz from its submissions and answers"""
+    with transaction.atomic():
+        # Counts read under the lock include every committed submission, and
+        # new ones wait to increment the rollup written here
+        lock_quiz_rollups(quiz_id)
+        submissions = QuizSubmission.objects.filter(quiz_id=quiz_id)
+        totals = submissions.aggregate(
+            submission_count=Count('id'),
+            score_sum=Coalesce(Sum('score'), 0),
+            percentage_sum=Coalesce(
+                Sum(F('score') * 100.0 / NullIf(F('total_questions'), 0)), 0.0),
+            percentage_count=Count('id', filter=Q(total_questions__gt=0)),
+            min_score=Min('score'),
+            max_score=Max('score'),
+            pass_count=Count(
+                'id', filter=Q(score__gte=F('total_questions') * PASS_THRESHOLD)),
+        )
+        buckets = dict(submissions.annotate(bucket=Case(
+            When(total_questions__lte=0, then=Value(0)),
+            default=Least(
+                F('score') * 10 / F('total_questions'),
+                Value(QuizScoreBucket.BUCKET_COUNT - 1)),
+            output_field=IntegerField(),
+        )).values('bucket').annotate(count=Count('id')).values_list(
+            'bucket', 'count').order_by())
+        answer_counts = {
+            row['question']: row
+            for row in Answer.objects.filter(submission__quiz_id=quiz_id).values(
+                'question').annotate(
+                    total=Count('id'),
+                    correct=Count('id', filter=Q(is_correct=True))).order_by()
+        }
+        question_ids = Question.objects.filter(quiz_id=quiz_id).values_list('id', flat=True)
+
+        QuizScoreBucket.objects.filter(quiz_id=quiz_id).delete()
+        QuizScoreBucket.objects.bulk_create([
+            QuizScoreBucket(quiz_id=quiz_id, bucket=bucket, count=buckets.get(bucket, 0))
+            for bucket in range(QuizScoreBucket.BUCKET_COUNT)
+        ])
+        QuestionStats.objects.filter(quiz_id=quiz_id).delete()
+        QuestionStats.objects.bulk_create([
+            QuestionStats(
+                question_id=question_id,
+                quiz_id=quiz_id,
+                total_answers=answer_counts.get(question_id, {}).get('total', 0),
+                correct_answers=answer_counts.get(question_id, {}).get('correct', 0),
+            )
+            for question_id in question_ids
+        ])
+        stats, _ = QuizStats.objects.update_or_create(quiz_id=quiz_id, defaults=totals)
+    return stats
+
+
+def get_quiz_stats(quiz_id):
+    """Return the rollup for a quiz, rebuilding it first if it is missing"""
+    stats = QuizStats.objects.filter(quiz_id=quiz_id).first()
+    if stats is None:
+        stats = rebuild_quiz_stats(quiz_id)
+    return stats
+
+
+def build_quiz_analytics(quiz):
+    """Analytics payload for a quiz, read from its rollups"""
+    stats = get_quiz_stats(quiz.pk)
+    total_submissions = stats.submission_count
+
+    if total_submissions == 0:
+        return {
+            'quiz_id': quiz.id,
+            'quiz_title': quiz.title,
+            'total_submissions': 0,
+            'average_score': 0,
+            'average_percentage': 0,
+            'highest_score': 0,
+            'lowest_score': 0,
+            'pass_rate': 0,
+            'score_distribution': [],
+            'question_analytics': [],
+        }
+
+    average_score = stats.score_sum / total_submissions
+    average_percentage = (
+        stats.percentage_sum / stats.percentage_count
+        if stats.percentage_count else 0)
+    pass_rate = (stats.pass_count / total_submissions) * 100
+
+    score_distribution = [
+        {
+            'bucket': bucket.bucket,
+            'min_percentage': bucket.bucket * 10,
+            'count': bucket.count,
+        }
+        for bucket in QuizScoreBucket.objects.filter(quiz_id=quiz.pk)
+    ]
+
+    # Question-level analytics
+    question_stats = QuestionStats.objects.filter(quiz_id=quiz.pk).order_by(
+        'question__order', 'question_id').values(
+            'question_id', 'question__question_text', 'question__question_type',
+            'total_answers', 'correct_answers')
+    question_analytics = []
+    for row in question_stats:
+        total_answers = row['total_answers']
+        correct_answers = row['correct_answers']
+
+        accuracy = (correct_answers / total_answers * 100) if total_answers > 0 else 0
+
+        question_analytics.append({
+            'question_id': row['question_id'],
+            'question_text': row['question__question_text'][:100],
+            'question_type': row['question__question_type'],
+            'total_answers': total_answers,
+            'correct_answers': correct_answers,
+            'accuracy': round(accuracy, 1)
+        })
+
+    return {
+        'quiz_id': quiz.id,
+        'quiz_title': quiz.title,
+        'total_submissions': total_submissions,
+        'average_score': round(average_score, 1),
+        'average_percentage': round(average_percentage, 1),
+        'highest_score': stats.max_score,
+        'lowest_score': stats.min_score,
+        'pass_rate': round(pass_rate, 1),
+        'score_distribution': score_distribution,
+        'question_analytics': question_analytics,
+    }
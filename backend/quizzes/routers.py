@@ -0,0 +1,95 @@
+"""
+Read-replica routing for views marked use_replica.
+
+ReplicaRoutingMiddleware opens a ReplicaRouting for each request. Safe
+requests to a use_replica view read from QUIZ_REPLICA_DATABASE unless the
+client wrote something within the last QUIZ_REPLICA_PIN_SECONDS, so nobody
+reads past their own write through replica lag. Everything else, including
+management commands and every write, uses the primary.
+"""
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.throttling import BaseThrottle
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def use_replica(view):
+    """Let safe requests to the decorated function view read from the replica"""
+    view.use_replica = True
+    return view
+
+
+def wants_replica(view_func):
+    """True for function views and as_view() callables marked use_replica"""
+    view_class = getattr(view_func, 'view_class', None)
+    return getattr(view_class or view_func, 'use_replica', False)
+
+
+class ReplicaRouting:
+    """Where one request reads from, and whether it has written"""
+
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+current_routing = ContextVar('quiz_replica_routing', default=None)
+_primary_only = ContextVar('quiz_primary_only', default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, e.g. for data that gets cached or written back"""
+    token = _primary_only.set(True)
+    try:
+        yield
+    finally:
+        _primary_only.reset(token)
+
+
+def _pin_key(request):
+    # The bearer token identifies a signed-in client across addresses
+    ident = request.headers.get('Authorization') or BaseThrottle().get_ident(request)
+    return 'db:pin:' + hashlib.sha256(ident.encode()).hexdigest()
+
+
+def is_pinned(request):
+    """True if the client wrote recently, so its reads must see the primary"""
+    return cache.get(_pin_key(request)) is not None
+
+
+def pin_to_primary(request):
+    cache.set(_pin_key(request), 1, settings.QUIZ_REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    """Send reads to the replica when the current request allows it, and all writes to the primary"""
+
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if (routing is not None and routing.replica and not routing.wrote
+                and not _primary_only.get()):
+            return settings.QUIZ_REPLICA_DATABASE
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            # Later reads in this request must see the write
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, settings.QUIZ_REPLICA_DATABASE}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
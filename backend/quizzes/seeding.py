@@ -0,0 +1,135 @@
+import random
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .grading import CHOICE_QUESTION_TYPES
+from .models import Answer, Choice, Question, Quiz, QuizSubmission
+
+QUESTION_TYPES = ('mcq', 'true_false', 'text')
+
+
+class SeedResult:
+    """Row counts written by seed_quizzes"""
+
+    def __init__(self):
+        self.users = 0
+        self.quizzes = 0
+        self.questions = 0
+        self.choices = 0
+        self.submissions = 0
+        self.answers = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _answer_for(rng, question, choices):
+    """Pick a random answer to a question, right about half the time"""
+    if question.question_type in CHOICE_QUESTION_TYPES:
+        choice = rng.choice(choices)
+        return Answer(
+            question=question, selected_choice=choice, is_correct=choice.is_correct)
+    if rng.random() < 0.5:
+        return Answer(
+            question=question, text_answer=question.correct_text_answer, is_correct=True)
+    return Answer(question=question, text_answer='wrong', is_correct=False)
+
+
+def seed_quizzes(users=1, quizzes_per_user=10, questions_per_quiz=10,
+                 choices_per_question=4, submissions_per_quiz=50,
+                 batch_size=1000, seed=None):
+    """
+    Bulk-insert a synthetic dataset of users, quizzes and submissions.
+
+    Questions cycle through every question type and each submission answers
+    every question. Rows go in with bulk_create in batches of batch_size, so
+    large datasets load in a few queries per quiz. Rollups are left alone and
+    rebuilt lazily on the next analytics read.
+    """
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    result = SeedResult()
+    password = make_password(None)
+
+    with transaction.atomic():
+        owners = User.objects.bulk_create([
+            User(username=f'seed_{run}_{index}', password=password)
+            for index in range(users)
+        ])
+        result.users = len(owners)
+
+        for owner in owners:
+            quizzes = Quiz.objects.bulk_create([
+                Quiz(title=f'Seed quiz {run} {owner.pk}-{index}', created_by=owner)
+                for index in range(quizzes_per_user)
+            ])
+            result.quizzes += len(quizzes)
+
+            for quiz in quizzes:
+                questions = Question.objects.bulk_create([
+                    Question(
+                        quiz=quiz,
+                        question_text=f'Question {order + 1}',
+                        question_type=QUESTION_TYPES[order % len(QUESTION_TYPES)],
+                        correct_text_answer=(
+                            f'answer {order + 1}'
+                            if QUESTION_TYPES[order % len(QUESTION_TYPES)] == 'text'
+                            else None),
+                        order=order,
+                    )
+                    for order in range(questions_per_quiz)
+                ], batch_size=batch_size)
+                result.questions += len(questions)
+
+                choices_by_question = {}
+                new_choices = []
+                for question in questions:
+                    if question.question_type == 'true_false':
+                        correct = rng.randrange(2)
+                        options = [
+                            Choice(question=question, choice_text=text, is_correct=index == correct)
+                            for index, text in enumerate(('True', 'False'))
+                        ]
+                    elif question.question_type == 'mcq':
+                        correct = rng.randrange(choices_per_question)
+                        options = [
+                            Choice(question=question, choice_text=f'Option {index + 1}',
+                                   is_correct=index == correct)
+                            for index in range(choices_per_question)
+                        ]
+                    else:
+                        options = []
+                    choices_by_question[question.pk] = options
+                    new_choices.extend(options)
+                Choice.objects.bulk_create(new_choices, batch_size=batch_size)
+                result.choices += len(new_choices)
+
+                for start in range(0, submissions_per_quiz, batch_size):
+                    count = min(batch_size, submissions_per_quiz - start)
+                    graded = [
+                        [_answer_for(rng, question, choices_by_question[question.pk])
+                         for question in questions]
+                        for _ in range(count)
+                    ]
+                    submissions = QuizSubmission.objects.bulk_create([
+                        QuizSubmission(
+                            quiz=quiz,
+                            taker_name=f'Taker {start + index + 1}',
+                            score=sum(answer.is_correct for answer in answers),
+                            total_questions=len(questions),
+                        )
+                        for index, answers in enumerate(graded)
+                    ])
+                    new_answers = []
+                    for submission, answers in zip(submissions, graded):
+                        for answer in answers:
+                            answer.submission = submission
+                        new_answers.extend(answers)
+                    Answer.objects.bulk_create(new_answers, batch_size=batch_size)
+                    result.submissions += len(submissions)
+                    result.answers += len(new_answers)
+
+    return result
@@ -37,18 +37,18 @@ class QuestionPublicSerializer(serializers.ModelSerializer):
 
 
 class QuizListSerializer(serializers.ModelSerializer):
-    """Serializer for quiz list view"""
-    question_count = serializers.SerializerMethodField()
+    """Serializer for quiz list view (expects Quiz.objects.with_stats())"""
+    question_count = serializers.IntegerField(read_only=True)
+    submission_count = serializers.IntegerField(read_only=True)
+    last_submission_at = serializers.DateTimeField(read_only=True)
     created_by_username = serializers.CharField(
         source='created_by.username', read_only=True)
 
     class Meta:
         model = Quiz
-        fields = ['id', 'title', 'description',
-                  'created_by_username', 'question_count', 'created_at']
-
-    def get_question_count(self, obj):
-        return obj.questions.count()
+        fields = ['id', 'title', 'description', 'created_by_username',
+                  'question_count', 'submission_count', 'last_submission_at',
+                  'created_at']
 
 
 class QuizDetailSerializer(serializers.ModelSerializer):
@@ -118,42 +118,90 @@ class QuizSubmitSerializer(serializers.Serializer):
     taker_name = serializers.CharField(
         required=False, allow_blank=True, max_length=100)
     answers = AnswerSubmitSerializer(many=True)
+    # Idempotency key chosen by the client; resubmitting it replays the result
+    submission_token = serializers.UUIDField(required=False)
 
 
 class AnswerResultSerializer(serializers.ModelSerializer):
-    """Serializer for answer results"""
-    question_text = serializers.CharField(
-        source='question.question_text', read_only=True)
-    question_type = serializers.CharField(
-        source='question.question_type', read_only=True)
-    selected_choice_text = serializers.CharField(
-        source='selected_choice.choice_text', read_only=True, allow_null=True)
+    """
+    Serializer for answer results.
+
+    With the quiz's AnswerKey in context['answer_key'], question and choice
+    texts come from the key instead of one lookup per answer.
+    """
+    question_text = serializers.SerializerMethodField()
+    question_type = serializers.SerializerMethodField()
+    selected_choice_text = serializers.SerializerMethodField()
     correct_choice = serializers.SerializerMethodField()
-    correct_text = serializers.CharField(
-        source='question.correct_text_answer', read_only=True)
+    correct_text = serializers.SerializerMethodField()
 
     class Meta:
         model = Answer
         fields = ['question_text', 'question_type', 'selected_choice_text',
                   'text_answer', 'is_correct', 'correct_choice', 'correct_text']
 
+    def _question_key(self, obj):
+        answer_key = self.context.get('answer_key')
+        if answer_key is None:
+            return None
+        return answer_key.questions.get(obj.question_id)
+
+    def get_question_text(self, obj):
+        key = self._question_key(obj)
+        return key.question_text if key else obj.question.question_text
+
+    def get_question_type(self, obj):
+        key = self._question_key(obj)
+        return key.question_type if key else obj.question.question_type
+
+    def get_selected_choice_text(self, obj):
+        if obj.selected_choice_id is None:
+            return None
+        key = self._question_key(obj)
+        if key and obj.selected_choice_id in key.choice_texts:
+            return key.choice_texts[obj.selected_choice_id]
+        return obj.selected_choice.choice_text
+
     def get_correct_choice(self, obj):
+        key = self._question_key(obj)
+        if key:
+            return key.correct_choice_text
         if obj.question.question_type in ['mcq', 'true_false']:
             correct = obj.question.choices.filter(is_correct=True).first()
             return correct.choice_text if correct else None
         return None
 
+    def get_correct_text(self, obj):
+        key = self._question_key(obj)
+        return key.correct_text_answer if key else obj.question.correct_text_answer
+
 
 class QuizSubmissionResultSerializer(serializers.ModelSerializer):
-    """Serializer for quiz submission results"""
-    answers = AnswerResultSerializer(many=True, read_only=True)
-    quiz_title = serializers.CharField(source='quiz.title', read_only=True)
+    """
+    Serializer for quiz submission results.
+
+    Pass answer_key in context to avoid per-answer queries, and answers to
+    render just-graded answers (stored or still queued) without reading them.
+    """
+    answers = serializers.SerializerMethodField()
+    quiz_title = serializers.SerializerMethodField()
     percentage = serializers.FloatField(read_only=True)
 
     class Meta:
         model = QuizSubmission
         fields = ['id', 'quiz_title', 'taker_name', 'score',
-                  'total_questions', 'percentage', 'submitted_at', 'answers']
+                  'total_questions', 'percentage', 'submitted_at',
+                  'submission_token', 'answers']
+
+    def get_answers(self, obj):
+        answers = self.context.get('answers')
+        if answers is None:
+            answers = obj.answers.all()
+        return AnswerResultSerializer(answers, many=True, context=self.context).data
+
+    def get_quiz_title(self, obj):
+        answer_key = self.context.get('answer_key')
+        return answer_key.quiz_title if answer_key else obj.quiz.title
 
 
 class QuizSubmissionAnalyticsSerializer(serializers.ModelSerializer):
@@ -164,3 +212,74 @@ class QuizSubmissionAnalyticsSerializer(serializers.ModelSerializer):
         model = QuizSubmission
         fields = ['id', 'taker_name', 'score', 'total_questions', 
                   'percentage', 'submitted_at']
+
+
+class SubmissionFilterSerializer(serializers.Serializer):
+    """Query parameters for filtering the submissions feed"""
+    min_score = serializers.IntegerField(required=False, min_value=0)
+    max_score = serializers.IntegerField(required=False, min_value=0)
+    submitted_after = serializers.DateTimeField(required=False)
+    submitted_before = serializers.DateTimeField(required=False)
+    taker_name = serializers.CharField(required=False, max_length=100)
+
+
+# Read-only serializers for the hot read paths. They take rows from
+# .values() querysets instead of model instances and skip the per-field
+# machinery, but must render exactly what the ModelSerializers above do.
+_datetime_field = serializers.DateTimeField(read_only=True)
+
+
+class QuizListRowSerializer(serializers.BaseSerializer):
+    """QuizListSerializer over Quiz.objects.with_stats().list_rows()"""
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'created_by_username': row['created_by__username'],
+            'question_count': row['question_count'],
+            'submission_count': row['submission_count'],
+            'last_submission_at': _datetime_field.to_representation(row['last_submission_at']),
+            'created_at': _datetime_field.to_representation(row['created_at']),
+        }
+
+
+class QuizSubmissionRowSerializer(serializers.BaseSerializer):
+    """QuizSubmissionAnalyticsSerializer over QuizSubmission.objects.feed_rows()"""
+
+    def to_representation(self, row):
+        percentage = row['percentage']
+        return {
+            'id': row['id'],
+            'taker_name': row['taker_name'],
+            'score': row['score'],
+            'total_questions': row['total_questions'],
+            # Rounded like QuizSubmission.percentage, which SQL ROUND() is not
+            'percentage': round(percentage, 1) if percentage is not None else 0.0,
+            'submitted_at': _datetime_field.to_representation(row['submitted_at']),
+        }
+
+
+class QuizPublicRowSerializer(serializers.BaseSerializer):
+    """QuizPublicSerializer over a row from Quiz.objects.public_row()"""
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'description': row['description'],
+            'questions': [
+                {
+                    'id': question['id'],
+                    'question_text': question['question_text'],
+                    'question_type': question['question_type'],
+                    'order': question['order'],
+                    'choices': [
+                        {'id': choice['id'], 'choice_text': choice['choice_text']}
+                        for choice in question['choices']
+                    ],
+                }
+                for question in row['questions']
+            ],
+        }
@@ -0,0 +1,85 @@
+from django.db import transaction
+
+from .models import Choice, Question, Quiz
+from .utils import sanitize_input
+
+MAX_QUESTIONS_PER_QUIZ = 100
+MAX_CHOICES_PER_QUESTION = 10
+
+
+def _build_choices(question_data):
+    """Unsaved choices for a validated question payload"""
+    choices = question_data.get('choices', [])
+
+    # Validate choices count (guard rail)
+    choices = choices[:MAX_CHOICES_PER_QUESTION]
+
+    # For true/false, auto-generate choices if not provided
+    if question_data['question_type'] == 'true_false' and not choices:
+        return [
+            Choice(choice_text='True', is_correct=True),
+            Choice(choice_text='False', is_correct=False),
+        ]
+    return [
+        Choice(
+            choice_text=sanitize_input(choice_data['choice_text']),
+            is_correct=choice_data.get('is_correct', False)
+        )
+        for choice_data in choices
+    ]
+
+
+def _build_quiz(owner, data):
+    """Unsaved quiz, questions and choices for a validated quiz payload"""
+    quiz = Quiz(
+        title=sanitize_input(data['title']),
+        description=sanitize_input(data.get('description', '')),
+        created_by=owner
+    )
+    questions = []
+    for idx, q_data in enumerate(data['questions']):
+        question = Question(
+            question_text=sanitize_input(q_data['question_text']),
+            question_type=q_data['question_type'],
+            order=q_data.get('order', idx),
+            correct_text_answer=sanitize_input(q_data.get('correct_text_answer', ''))
+        )
+        questions.append((question, _build_choices(q_data)))
+    return quiz, questions
+
+
+def create_quizzes(owner, quizzes_data):
+    """
+    Create several quizzes with their questions and choices.
+
+    Every payload must already be validated by QuizWithQuestionsCreateSerializer.
+    All rows are built in memory first and then written with one bulk_create
+    per table inside a single transaction, so either every quiz is created or
+    none is, and the cost does not grow with the number of questions.
+    """
+    planned = [_build_quiz(owner, data) for data in quizzes_data]
+
+    with transaction.atomic():
+        quizzes = Quiz.objects.bulk_create([quiz for quiz, _ in planned])
+
+        questions = []
+        for quiz, quiz_questions in planned:
+            for question, _ in quiz_questions:
+                question.quiz = quiz
+                questions.append(question)
+        Question.objects.bulk_create(questions)
+
+        choices = []
+        for _, quiz_questions in planned:
+            for question, question_choices in quiz_questions:
+                for choice in question_choices:
+                    choice.question = question
+                    choices.append(choice)
+        Choice.objects.bulk_create(choices)
+
+    return quizzes
+
+
+def create_quiz_with_questions(owner, data):
+    """Create a single quiz from a validated QuizWithQuestionsCreateSerializer payload"""
+    return create_quizzes(owner, [data])[0]
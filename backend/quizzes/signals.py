@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_quiz, invalidate_quiz_submissions
+from .models import Choice, Question, Quiz, QuizSubmission
+from .rollups import invalidate_quiz_stats, submissions_recorded
+
+
+def _deleted_with_parent(origin, parents=(Quiz, Question)):
+    """True when a deletion cascades from a parent model, which invalidates on its own"""
+    return getattr(origin, 'model', type(origin)) in parents
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def quiz_changed(sender, instance, **kwargs):
+    invalidate_quiz(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, **kwargs):
+    invalidate_quiz(instance.quiz_id)
+    # Rollups only track questions that existed when they were built
+    if kwargs.get('created'):
+        invalidate_quiz_stats(instance.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=Choice)
+def choice_changed(sender, instance, **kwargs):
+    if 'origin' in kwargs and _deleted_with_parent(kwargs['origin']):
+        return
+    if Choice.question.is_cached(instance):
+        quiz_id = instance.question.quiz_id
+    else:
+        quiz_id = Question.objects.filter(pk=instance.question_id).values_list(
+            'quiz_id', flat=True).first()
+    if quiz_id is not None:
+        invalidate_quiz(quiz_id)
+
+
+@receiver(post_delete, sender=QuizSubmission)
+def submission_deleted(sender, instance, origin=None, **kwargs):
+    if not _deleted_with_parent(origin, (Quiz,)):
+        invalidate_quiz_stats(instance.quiz_id)
+        invalidate_quiz_submissions(instance.quiz_id)
+
+
+@receiver(submissions_recorded)
+def submissions_recorded_for_quiz(sender, quiz_id, **kwargs):
+    invalidate_quiz_submissions(quiz_id)
@@ -0,0 +1,35 @@
+import hashlib
+
+
+from .models import Quiz
+from .renderers import JSONRenderer
+from .serializers import QuizPublicRowSerializer
+
+
+class PublicSnapshot:
+    """Public quiz payload rendered once to JSON bytes, with its cache validators"""
+
+    def __init__(self, body, last_modified):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        # Unix timestamp, whole seconds as used by HTTP dates
+        self.last_modified = last_modified
+
+    @classmethod
+    def for_quiz(cls, quiz_id, changed_at=None):
+        """
+        Render the public payload for a quiz, or return None if it does not exist.
+
+        Last-Modified is Quiz.updated_at, moved forward to changed_at (the
+        quiz's last cache invalidation) since question and choice edits do
+        not touch the quiz row.
+        """
+        row = Quiz.objects.filter(pk=quiz_id).public_row()
+        if row is None:
+            return None
+
+        body = JSONRenderer().render(QuizPublicRowSerializer(row).data)
+        last_modified = row['updated_at'].timestamp()
+        if changed_at is not None:
+            last_modified = max(last_modified, changed_at)
+        return cls(body, int(last_modified))
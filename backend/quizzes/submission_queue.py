@@ -0,0 +1,123 @@
+import uuid
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Answer, Choice, PendingSubmission, Question, QuizSubmission
+from .rollups import record_submissions
+
+
+def enqueue_submission(answer_key, taker_name, answers, token=None):
+    """
+    Grade a submission and queue it for drain_submissions instead of storing it.
+
+    Costs a single INSERT. Returns the unsaved QuizSubmission and its graded
+    answers, for rendering the result straight away. Raises Http404 like
+    AnswerKey.grade, before anything is queued.
+    """
+    score, graded = answer_key.grade(answers)
+    submission = QuizSubmission(
+        quiz_id=answer_key.quiz_id,
+        taker_name=taker_name,
+        score=score,
+        total_questions=answer_key.question_count,
+        submitted_at=timezone.now(),
+        submission_token=token or uuid.uuid4(),
+    )
+    PendingSubmission.objects.create(
+        quiz_id=submission.quiz_id,
+        token=submission.submission_token,
+        created_at=submission.submitted_at,
+        payload={
+            'taker_name': taker_name,
+            'score': score,
+            'total_questions': submission.total_questions,
+            'answers': [
+                [answer.question_id, answer.selected_choice_id,
+                 answer.text_answer, answer.is_correct]
+                for answer in graded
+            ],
+        },
+    )
+    return submission, graded
+
+
+def unpack_pending(item):
+    """The unsaved QuizSubmission and Answers a queued submission stands for"""
+    submission = QuizSubmission(
+        quiz_id=item.quiz_id,
+        taker_name=item.payload['taker_name'],
+        score=item.payload['score'],
+        total_questions=item.payload['total_questions'],
+        submitted_at=item.created_at,
+        submission_token=item.token,
+    )
+    answers = [
+        Answer(
+            question_id=question_id,
+            selected_choice_id=choice_id,
+            text_answer=text_answer,
+            is_correct=is_correct,
+        )
+        for question_id, choice_id, text_answer, is_correct in item.payload['answers']
+    ]
+    return submission, answers
+
+
+def drain_submissions(batch_size=500):
+    """
+    Write up to batch_size queued submissions and remove them from the queue.
+
+    Runs in one transaction: the queued rows are locked with SKIP LOCKED so
+    concurrent workers take different batches, submissions and answers go in
+    with one bulk_create each, and the rollups are incremented per quiz.
+    Tokens already stored are skipped, so a batch is never written twice.
+    Answers to questions deleted since grading are dropped, like the cascade
+    would have done. Returns the number of queue rows consumed.
+    """
+    with transaction.atomic():
+        pending = list(
+            PendingSubmission.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size])
+        if not pending:
+            return 0
+
+        stored = set(QuizSubmission.objects.filter(
+            submission_token__in=[item.token for item in pending]).values_list(
+                'quiz_id', 'submission_token'))
+        rows = [
+            row for item in pending for row in item.payload['answers']
+        ]
+        question_ids = set(Question.objects.filter(
+            id__in={row[0] for row in rows}).values_list('id', flat=True))
+        choice_ids = set(Choice.objects.filter(
+            id__in={row[1] for row in rows if row[1]}).values_list('id', flat=True))
+
+        batch = []
+        for item in pending:
+            if (item.quiz_id, item.token) in stored:
+                continue
+            stored.add((item.quiz_id, item.token))
+            submission, answers = unpack_pending(item)
+            for answer in answers:
+                if answer.selected_choice_id not in choice_ids:
+                    answer.selected_choice_id = None
+            batch.append((submission, [
+                answer for answer in answers if answer.question_id in question_ids]))
+
+        QuizSubmission.objects.bulk_create([submission for submission, _ in batch])
+        for submission, answers in batch:
+            for answer in answers:
+                answer.submission = submission
+        Answer.objects.bulk_create(
+            [answer for _, answers in batch for answer in answers], batch_size=1000)
+
+        by_quiz = defaultdict(list)
+        for submission, answers in batch:
+            by_quiz[submission.quiz_id].append((submission, answers))
+        # In quiz order, so concurrent drains take the rollup locks alike
+        for quiz_id, submissions in sorted(by_quiz.items()):
+            record_submissions(quiz_id, submissions)
+
+        PendingSubmission.objects.filter(id__in=[item.id for item in pending]).delete()
+    return len(pending)
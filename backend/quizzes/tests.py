@@ -1,3 +1,1785 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+from types import SimpleNamespace
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    AsyncRequestFactory,
+    RequestFactory,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import async_views, budgets, metrics, rollups
+from . import urls as quiz_urls
+from .cache import (
+    LRUCache,
+    get_answer_key,
+    get_or_build,
+    get_quiz_analytics,
+    invalidate_quiz_submissions,
+    local_cache,
+    quiz_tag,
+    submissions_tag,
+)
+from .budgets import QueryBudgetExceeded, get_query_budget
+from .grading import AnswerKey, grade_submission
+from .importers import import_quizzes, parse_csv, parse_gift, parse_json, parse_ndjson
+from .management.commands import benchmark_api
+from .rollups import get_quiz_stats, rebuild_quiz_stats
+from .middleware import ReplicaRoutingMiddleware
+from .models import (
+    Answer,
+    Choice,
+    PendingSubmission,
+    Question,
+    QuestionStats,
+    Quiz,
+    QuizStats,
+    QuizSubmission,
+)
+from .parsers import loads
+from .renderers import JSONRenderer as FastJSONRenderer
+from .routers import wants_replica
+from .seeding import seed_quizzes
+from .serializers import (
+    QuizListRowSerializer,
+    QuizListSerializer,
+    QuizPublicRowSerializer,
+    QuizPublicSerializer,
+    QuizSubmissionAnalyticsSerializer,
+    QuizSubmissionResultSerializer,
+    QuizSubmissionRowSerializer,
+)
+from .submission_queue import drain_submissions, enqueue_submission
+from .throttling import AnonRateThrottle, QuizSubmitThrottle
+from .views import (
+    PublicQuizView,
+    QuizAnalyticsView,
+    QuizDetailView,
+    QuizExportView,
+    QuizSubmitView,
+    record_submission,
+)
+
+
+def create_quiz(owner, num_questions=3, title='Sample Quiz'):
+    """Create a quiz cycling through MCQ, True/False and text questions"""
+    quiz = Quiz.objects.create(title=title, created_by=owner)
+    for idx in range(num_questions):
+        question_type = ('mcq', 'true_false', 'text')[idx % 3]
+        question = Question.objects.create(
+            quiz=quiz,
+            question_text=f'Question {idx}',
+            question_type=question_type,
+            order=idx,
+            correct_text_answer='Paris' if question_type == 'text' else None
+        )
+        if question_type == 'mcq':
+            for choice_idx in range(4):
+                Choice.objects.create(
+                    question=question, choice_text=f'Option {choice_idx}',
+                    is_correct=choice_idx == 0)
+        elif question_type == 'true_false':
+            Choice.objects.create(question=question, choice_text='True', is_correct=True)
+            Choice.objects.create(question=question, choice_text='False', is_correct=False)
+    return quiz
+
+
+def correct_answers(quiz):
+    """Build a submission payload answering every question correctly"""
+    answers = []
+    for question in quiz.questions.prefetch_related('choices'):
+        if question.question_type == 'text':
+            answers.append({'question_id': question.id, 'text_answer': ' paris '})
+        else:
+            correct = next(c for c in question.choices.all() if c.is_correct)
+            answers.append({'question_id': question.id, 'selected_choice_id': correct.id})
+    return answers
+
+
+# Keep test entries in a cache of their own, and hold every
+# request to its view's query budget. A replica mirror cannot see data inside
+# a TestCase transaction, so reads stay on the primary here.
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}, QUIZ_QUERY_BUDGETS='raise', QUIZ_REPLICA_DATABASE=None)
+class QuizTestCase(APITestCase):
+    """Base test case with an owner account and a clean cache"""
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.owner = User.objects.create_user('owner', password='pass12345')
+
+    def assertQueriesFlat(self, request, grow):
+        """
+        Fail if the number of queries made by request() changes after grow()
+        adds more data, listing the SQL of both runs.
+        """
+        with CaptureQueriesContext(connection) as before:
+            request()
+        grow()
+        with CaptureQueriesContext(connection) as after:
+            request()
+        if len(before) != len(after):
+            self.fail('Query count grew from %d to %d:\n%s' % (
+                len(before), len(after),
+                '\n'.join(query['sql'] for query in after.captured_queries)))
+
+
+class GradingEngineTests(QuizTestCase):
+
+    def test_grades_all_question_types(self):
+        quiz = create_quiz(self.owner, num_questions=6)
+        answers = correct_answers(quiz)
+        # Answer the first MCQ incorrectly
+        mcq = quiz.questions.get(order=0)
+        answers[0]['selected_choice_id'] = mcq.choices.get(is_correct=False, choice_text='Option 1').id
+
+        submission, graded = grade_submission(AnswerKey.for_quiz(quiz.id), 'Alice', answers)
+
+        self.assertEqual(submission.score, 5)
+        self.assertEqual(submission.total_questions, 6)
+        self.assertEqual([answer.submission_id for answer in graded], [submission.id] * 6)
+        self.assertEqual(submission.answers.count(), 6)
+        self.assertEqual(submission.answers.filter(is_correct=True).count(), 5)
+
+    def test_choice_from_another_question_is_incorrect(self):
+        quiz = create_quiz(self.owner, num_questions=2)
+        mcq, true_false = quiz.questions.all()
+        foreign_choice = true_false.choices.get(is_correct=True)
+
+        submission, _ = grade_submission(AnswerKey.for_quiz(quiz.id), '', [
+            {'question_id': mcq.id, 'selected_choice_id': foreign_choice.id},
+        ])
+
+        answer = submission.answers.get()
+        self.assertFalse(answer.is_correct)
+        self.assertIsNone(answer.selected_choice_id)
+
+    def test_duplicate_answers_are_ignored(self):
+        quiz = create_quiz(self.owner, num_questions=3)
+        answers = correct_answers(quiz)
+
+        submission, _ = grade_submission(AnswerKey.for_quiz(quiz.id), '', answers + answers)
+
+        self.assertEqual(submission.score, 3)
+        self.assertEqual(submission.answers.count(), 3)
+
+    def test_query_count_is_constant(self):
+        # quiz, questions, choices, then savepoint, submission, answers, rollup
+        # lock, quiz rollup, score bucket, question totals, question corrects, release
+        for num_questions in (5, 100):
+            quiz = create_quiz(self.owner, num_questions=num_questions)
+            rebuild_quiz_stats(quiz.id)
+            answers = correct_answers(quiz)
+            with self.assertNumQueries(12):
+                grade_submission(AnswerKey.for_quiz(quiz.id), '', answers)
+
+
+class QuizSubmitViewTests(QuizTestCase):
+
+    def test_submit_scores_and_stores_answers(self):
+        quiz = create_quiz(self.owner, num_questions=3)
+        url = reverse('quiz-submit', args=[quiz.id])
+
+        response = self.client.post(
+            url, {'taker_name': 'Bob', 'answers': correct_answers(quiz)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['score'], 3)
+        self.assertEqual(response.data['percentage'], 100.0)
+        self.assertEqual(len(response.data['answers']), 3)
+
+    def test_result_matches_database_rendering(self):
+        quiz = create_quiz(self.owner, num_questions=3)
+        answers = correct_answers(quiz)
+        answers[2]['text_answer'] = 'Lyon'
+
+        response = self.client.post(
+            reverse('quiz-submit', args=[quiz.id]),
+            {'taker_name': 'Bob', 'answers': answers}, format='json')
+
+        submission = QuizSubmission.objects.get()
+        self.assertEqual(response.data, QuizSubmissionResultSerializer(submission).data)
+        mcq, true_false, text = response.data['answers']
+        self.assertEqual(mcq['selected_choice_text'], 'Option 0')
+        self.assertEqual(mcq['correct_choice'], 'Option 0')
+        self.assertEqual(true_false['correct_choice'], 'True')
+        self.assertEqual(text['correct_choice'], None)
+        self.assertEqual(text['correct_text'], 'Paris')
+        self.assertFalse(text['is_correct'])
+
+    def test_unknown_question_writes_nothing(self):
+        quiz = create_quiz(self.owner, num_questions=2)
+        other_quiz = create_quiz(self.owner, num_questions=1)
+        answers = correct_answers(quiz)
+        answers[1]['question_id'] = other_quiz.questions.get().id
+
+        response = self.client.post(
+            reverse('quiz-submit', args=[quiz.id]), {'answers': answers}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(QuizSubmission.objects.exists())
+        self.assertFalse(Answer.objects.exists())
+
+    def test_too_many_answers_rejected(self):
+        quiz = create_quiz(self.owner, num_questions=1)
+        answers = correct_answers(quiz) * 2
+
+        response = self.client.post(
+            reverse('quiz-submit', args=[quiz.id]), {'answers': answers}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AnswerKeyCacheTests(QuizTestCase):
+
+    def test_hot_quiz_grading_skips_database_reads(self):
+        quiz = create_quiz(self.owner, num_questions=10)
+        url = reverse('quiz-submit', args=[quiz.id])
+        payload = {'answers': correct_answers(quiz)}
+        self.client.post(url, payload, format='json')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['answers']), 10)
+        # The only read is the quiz row locked for the rollup increments
+        reads = [query['sql'] for query in queries if query['sql'].upper().startswith('SELECT')]
+        self.assertEqual(len(reads), 1, reads)
+        self.assertIn('FROM "quizzes_quiz"', reads[0])
+
+    def test_missing_quiz_is_not_found(self):
+        self.assertIsNone(get_answer_key(999))
+        response = self.client.post(
+            reverse('quiz-submit', args=[999]), {'answers': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_editing_questions_invalidates_key(self):
+        quiz = create_quiz(self.owner, num_questions=3)
+        text_question = quiz.questions.get(question_type='text')
+        self.assertEqual(get_answer_key(quiz.id).questions[text_question.id].correct_text, 'paris')
+
+        text_question.correct_text_answer = 'Lyon'
+        text_question.save()
+        self.assertEqual(get_answer_key(quiz.id).questions[text_question.id].correct_text, 'lyon')
+
+        mcq = quiz.questions.get(question_type='mcq')
+        mcq.choices.filter(is_correct=True).get().delete()
+        self.assertEqual(len(get_answer_key(quiz.id).questions[mcq.id].choices), 3)
+
+    def test_entries_follow_their_tags(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return len(builds)
+
+        tags = [quiz_tag(1), submissions_tag(1)]
+        self.assertEqual(get_or_build(tags, 'entry', build), 1)
+        self.assertEqual(get_or_build(tags, 'entry', build), 1)
+        self.assertEqual(get_or_build([quiz_tag(1)], 'other', build), 2)
+
+        invalidate_quiz_submissions(1)
+
+        self.assertEqual(get_or_build(tags, 'entry', build), 3)
+        self.assertEqual(get_or_build([quiz_tag(1)], 'other', build), 2)
+
+    def test_lru_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+
+        self.assertIn('a', lru)
+        self.assertNotIn('b', lru)
+        self.assertEqual(len(lru), 2)
+
+
+class AsyncPublicViewTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.factory = AsyncRequestFactory()
+
+    async def test_public_quiz_matches_sync_view(self):
+        expected = await sync_to_async(self.client.get)(
+            reverse('quiz-public', args=[self.quiz.id]))
+
+        response = await async_views.public_quiz(
+            self.factory.get('/'), pk=self.quiz.id)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response['ETag'], expected['ETag'])
+        not_modified = await async_views.public_quiz(
+            self.factory.get('/', headers={'if-none-match': response['ETag']}),
+            pk=self.quiz.id)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_public_quiz_not_found(self):
+        response = await async_views.public_quiz(self.factory.get('/'), pk=999)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_submit_matches_sync_result(self):
+        answers = await sync_to_async(correct_answers)(self.quiz)
+        request = self.factory.post(
+            '/', {'taker_name': 'Bob', 'answers': answers}, content_type='application/json')
+
+        response = await async_views.submit_quiz(request, pk=self.quiz.id)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        submission = await QuizSubmission.objects.aget()
+        expected = await sync_to_async(
+            lambda: JSONRenderer().render(QuizSubmissionResultSerializer(submission).data))()
+        self.assertEqual(response.content, expected)
+        self.assertEqual(json.loads(response.content)['score'], 3)
+
+    async def test_submit_rejects_invalid_payloads(self):
+        bad_json = self.factory.post('/', 'not json', content_type='application/json')
+        response = await async_views.submit_quiz(bad_json, pk=self.quiz.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        missing = self.factory.post('/', {'answers': []}, content_type='application/json')
+        response = await async_views.submit_quiz(missing, pk=999)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(await QuizSubmission.objects.aexists())
+
+    def test_authenticated_callers_get_user_throttles(self):
+        token = RefreshToken.for_user(self.owner).access_token
+        signed_in = self.factory.get('/', headers={'authorization': f'Bearer {token}'})
+
+        # With the anon scope exhausted, only callers seen as anonymous are limited
+        with mock.patch.object(AnonRateThrottle, 'get_rate', return_value='0/hour'):
+            allowed = async_to_sync(async_views.public_quiz)(signed_in, pk=self.quiz.id)
+            limited = async_to_sync(async_views.public_quiz)(self.factory.get('/'), pk=self.quiz.id)
+
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
+        self.assertEqual(limited.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    async def test_invalid_token_is_rejected(self):
+        request = self.factory.get('/', headers={'authorization': 'Bearer not-a-token'})
+
+        response = await async_views.public_quiz(request, pk=self.quiz.id)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+
+    async def test_submit_is_throttled(self):
+        request = self.factory.post('/', {'answers': []}, content_type='application/json')
+        for _ in range(10):
+            await async_views.submit_quiz(request, pk=self.quiz.id)
+
+        response = await async_views.submit_quiz(request, pk=self.quiz.id)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+
+class SlidingWindowThrottleTests(QuizTestCase):
+
+    class Throttle(QuizSubmitThrottle):
+        rate = '10/min'
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1200.0
+        self.request = Request(APIRequestFactory().post('/'))
+        self.view = SimpleNamespace(kwargs={'pk': 1})
+
+    def allow(self):
+        # A fresh throttle per request, like DRF; state lives only in the cache
+        throttle = self.Throttle()
+        throttle.timer = lambda: self.now
+        return throttle.allow_request(self.request, self.view), throttle
+
+    def test_limit_within_window(self):
+        for _ in range(10):
+            self.assertTrue(self.allow()[0])
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 60)
+
+    def test_previous_window_slides_out(self):
+        for _ in range(10):
+            self.allow()
+        # A quarter into the next window, three quarters of the old count remain
+        self.now += 75
+        for _ in range(3):
+            self.assertTrue(self.allow()[0])
+
+        allowed, throttle = self.allow()
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 3)
+        self.now += 4
+        self.assertTrue(self.allow()[0])
+
+    def test_counters_are_per_quiz(self):
+        for _ in range(10):
+            self.allow()
+        self.view = SimpleNamespace(kwargs={'pk': 2})
+        self.assertTrue(self.allow()[0])
+
+
+class FastJSONTests(QuizTestCase):
+
+    payload = {
+        'text': 'Caf\u00e9 \u2028 \U0001f600 "quoted"',
+        'when': datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        'day': date(2026, 1, 2),
+        'token': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'amount': Decimal('1.50'),
+        'lazy': gettext_lazy('Not found.'),
+        'numbers': [0, -1, 2 ** 63 - 1, 1.5, 0.1, 1e100, True, None],
+        'nested': ({1: 'int key'}, []),
+    }
+
+    def test_renders_same_bytes_as_stdlib(self):
+        fast = FastJSONRenderer().render(self.payload)
+        self.assertEqual(fast, JSONRenderer().render(self.payload))
+        with mock.patch('quizzes.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), fast)
+
+    def test_falls_back_for_unencodable_values(self):
+        data = {'big': 2 ** 70}
+        self.assertEqual(FastJSONRenderer().render(data), b'{"big":1180591620717411303424}')
+        indented = FastJSONRenderer().render(data, 'application/json; indent=2')
+        self.assertEqual(indented, JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_endpoint_payloads_match_stdlib(self):
+        quiz = create_quiz(self.owner, num_questions=6, title='Quiz \u00fcber alles')
+        data = QuizPublicSerializer(Quiz.objects.with_questions().get(pk=quiz.pk)).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser_matches_stdlib(self):
+        body = json.dumps(self.payload, cls=DjangoJSONEncoder).encode()
+        self.assertEqual(loads(body), json.loads(body))
+        self.assertEqual(loads(b'[18446744073709551616]'), [2 ** 64])
+
+        for bad in (b'{"a": NaN}', b'{"a": 1,}', b'\xff'):
+            with self.assertRaises(ValueError) as fast:
+                loads(bad)
+            with self.assertRaises(ValueError) as stdlib, mock.patch('quizzes.parsers.orjson', None):
+                loads(bad)
+            self.assertEqual(str(fast.exception), str(stdlib.exception))
+
+    def test_submit_parse_error(self):
+        quiz = create_quiz(self.owner)
+        response = self.client.post(
+            reverse('quiz-submit', args=[quiz.id]), '{"answers": [',
+            content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['detail'].startswith('JSON parse error - '))
+
+
+class PublicQuizSnapshotTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-public', args=[self.quiz.id])
+
+    def test_payload_matches_serializer(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        quiz = Quiz.objects.prefetch_related('questions__choices').get(pk=self.quiz.id)
+        self.assertEqual(response.content, JSONRenderer().render(QuizPublicSerializer(quiz).data))
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_conditional_get_returns_304_without_queries(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_choice_change_invalidates_snapshot(self):
+        etag = self.client.get(self.url)['ETag']
+        choice = Choice.objects.filter(question__quiz=self.quiz).first()
+        choice.choice_text = 'Changed'
+        choice.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn(b'Changed', response.content)
+
+    def test_missing_quiz(self):
+        response = self.client.get(reverse('quiz-public', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReadQueryPlanTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=5)
+        self.client.force_authenticate(self.owner)
+
+    def grow_quiz(self):
+        more = create_quiz(self.owner, num_questions=95)
+        Question.objects.filter(quiz=more).update(quiz=self.quiz)
+
+    def test_quiz_detail_is_flat(self):
+        url = reverse('quiz-detail', args=[self.quiz.id])
+        self.assertQueriesFlat(lambda: self.client.get(url), self.grow_quiz)
+        self.assertEqual(len(self.client.get(url).data['questions']), 100)
+
+    def test_public_snapshot_render_is_flat(self):
+        url = reverse('quiz-public', args=[self.quiz.id])
+
+        def render():
+            cache.clear()
+            local_cache.clear()
+            self.client.get(url)
+
+        self.assertQueriesFlat(render, self.grow_quiz)
+
+    def test_submission_detail_is_flat(self):
+        key = get_answer_key(self.quiz.id)
+        submission, _ = grade_submission(key, '', correct_answers(self.quiz))
+        url = reverse('submission-detail', args=[self.quiz.id, submission.id])
+
+        def render():
+            # Cold answer key, so its build is counted too
+            cache.clear()
+            local_cache.clear()
+            self.client.get(url)
+
+        def grow():
+            self.grow_quiz()
+            more = Question.objects.filter(quiz=self.quiz).exclude(
+                answer__submission=submission)
+            Answer.objects.bulk_create([
+                Answer(submission=submission, question=question) for question in more])
+
+        self.assertQueriesFlat(render, grow)
+        self.assertEqual(len(self.client.get(url).data['answers']), 100)
+
+    def test_quiz_list_is_flat(self):
+        url = reverse('quiz-list-create')
+        self.assertQueriesFlat(
+            lambda: self.client.get(url),
+            lambda: [create_quiz(self.owner, num_questions=1) for _ in range(5)])
+
+
+class QuizListTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+
+    def test_list_reads_annotated_counts(self):
+        quiz = create_quiz(self.owner, num_questions=4)
+        key = get_answer_key(quiz.id)
+        grade_submission(key, '', correct_answers(quiz))
+        latest, _ = grade_submission(key, '', correct_answers(quiz))
+
+        response = self.client.get(reverse('quiz-list-create'))
+
+        item = response.data['results'][0]
+        self.assertEqual(item['question_count'], 4)
+        self.assertEqual(item['submission_count'], 2)
+        self.assertEqual(
+            item['last_submission_at'],
+            serializers.DateTimeField().to_representation(latest.submitted_at))
+
+    def test_list_is_cursor_paginated(self):
+        for idx in range(25):
+            create_quiz(self.owner, num_questions=0, title=f'Quiz {idx}')
+        create_quiz(User.objects.create_user('other'), num_questions=0)
+
+        first = self.client.get(reverse('quiz-list-create'))
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(len(first.data['results']), 20)
+        self.assertEqual(len(second.data['results']), 5)
+        self.assertIsNone(second.data['next'])
+        titles = [item['title'] for item in first.data['results'] + second.data['results']]
+        self.assertEqual(titles, [f'Quiz {idx}' for idx in reversed(range(25))])
+
+
+class RowSerializerTests(QuizTestCase):
+    """The values()-based read serializers render what the ModelSerializers do"""
+
+    def assertSameJSON(self, fast, slow):
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(slow))
+
+    def test_quiz_list_rows(self):
+        quiz = create_quiz(self.owner, num_questions=4, title='Caf\u00e9 \u2028')
+        grade_submission(get_answer_key(quiz.id), '', correct_answers(quiz))
+        Quiz.objects.create(title='Empty', description='', created_by=self.owner)
+        Quiz.objects.create(title='No description', description=None, created_by=self.owner)
+        quizzes = Quiz.objects.filter(created_by=self.owner).with_stats().order_by('id')
+
+        self.assertSameJSON(
+            QuizListRowSerializer(quizzes.list_rows(), many=True).data,
+            QuizListSerializer(quizzes.select_related('created_by'), many=True).data)
+
+    def test_submission_feed_rows(self):
+        quiz = create_quiz(self.owner, num_questions=1)
+        # Scores whose percentages round differently in SQL and Python
+        scores = [(0, 0), (1, 16), (3, 16), (1, 3), (2, 3), (5, 8), (7, 7), (0, 9)]
+        QuizSubmission.objects.bulk_create([
+            QuizSubmission(quiz=quiz, taker_name=name, score=score, total_questions=total)
+            for (score, total), name in zip(scores, ['A', None, '', '\u00e9'] * 2)
+        ])
+        submissions = QuizSubmission.objects.filter(quiz=quiz).order_by('id')
+
+        self.assertSameJSON(
+            QuizSubmissionRowSerializer(submissions.feed_rows(), many=True).data,
+            QuizSubmissionAnalyticsSerializer(submissions, many=True).data)
+
+    def test_public_quiz_row(self):
+        quiz = create_quiz(self.owner, num_questions=7)
+        Question.objects.filter(quiz=quiz, order=5).update(order=1)
+        Quiz.objects.filter(pk=quiz.pk).update(description=None)
+        empty = Quiz.objects.create(title='Empty', created_by=self.owner)
+
+        for pk in (quiz.pk, empty.pk):
+            with self.subTest(pk=pk):
+                self.assertSameJSON(
+                    QuizPublicRowSerializer(Quiz.objects.filter(pk=pk).public_row()).data,
+                    QuizPublicSerializer(Quiz.objects.with_questions().get(pk=pk)).data)
+        self.assertIsNone(Quiz.objects.filter(pk=999).public_row())
+
+
+class QuizAnalyticsTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-analytics', args=[self.quiz.id])
+
+    def submit(self, num_correct):
+        answers = correct_answers(self.quiz)
+        for answer in answers[num_correct:]:
+            answer['selected_choice_id'] = None
+            answer['text_answer'] = 'wrong'
+        return grade_submission(get_answer_key(self.quiz.id), '', answers)[0]
+
+    def test_summary_and_question_accuracy(self):
+        for num_correct in (3, 2, 0):
+            self.submit(num_correct)
+
+        data = self.client.get(self.url).data
+
+        self.assertEqual(data['total_submissions'], 3)
+        self.assertEqual(data['average_score'], round(5 / 3, 1))
+        self.assertEqual(data['average_percentage'], round(500 / 9, 1))
+        self.assertEqual(data['highest_score'], 3)
+        self.assertEqual(data['lowest_score'], 0)
+        self.assertEqual(data['pass_rate'], round(100 / 3, 1))
+        self.assertEqual(
+            [(q['total_answers'], q['correct_answers']) for q in data['question_analytics']],
+            [(3, 2), (3, 2), (3, 1)])
+        self.assertNotIn('submissions', data)
+
+    def test_empty_quiz_analytics(self):
+        data = self.client.get(self.url).data
+        self.assertEqual(data['total_submissions'], 0)
+        self.assertEqual(data['question_analytics'], [])
+
+    def test_other_users_cannot_view(self):
+        self.client.force_authenticate(User.objects.create_user('intruder'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_query_count_is_flat(self):
+        self.submit(3)
+        # First read builds the rollups
+        self.client.get(self.url)
+
+        def grow():
+            more = create_quiz(self.owner, num_questions=30)
+            Question.objects.filter(quiz=more).update(quiz=self.quiz)
+            cache.clear()
+            rebuild_quiz_stats(self.quiz.id)
+            for num_correct in range(10):
+                self.submit(num_correct)
+
+        def request():
+            # Measure the uncached build
+            cache.clear()
+            local_cache.clear()
+            self.client.get(self.url)
+
+        self.assertQueriesFlat(request, grow)
+
+    def test_cached_until_submissions_or_content_change(self):
+        self.submit(3)
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url).data
+        self.assertEqual(data['total_submissions'], 1)
+
+        self.submit(0)
+        self.assertEqual(self.client.get(self.url).data['total_submissions'], 2)
+
+        self.quiz.title = 'Renamed'
+        self.quiz.save()
+        self.assertEqual(self.client.get(self.url).data['quiz_title'], 'Renamed')
+
+        QuizSubmission.objects.filter(score=0).delete()
+        self.assertEqual(self.client.get(self.url).data['total_submissions'], 1)
+
+
+class RollupTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=4)
+
+    def submit(self, num_correct):
+        answers = correct_answers(self.quiz)
+        for answer in answers[num_correct:]:
+            answer['selected_choice_id'] = None
+            answer['text_answer'] = 'wrong'
+        return grade_submission(get_answer_key(self.quiz.id), '', answers)[0]
+
+    def snapshot(self):
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        return (
+            stats.submission_count, stats.score_sum, round(stats.percentage_sum, 6),
+            stats.percentage_count, stats.min_score, stats.max_score, stats.pass_count,
+            list(self.quiz.score_buckets.values_list('bucket', 'count')),
+            list(QuestionStats.objects.filter(quiz=self.quiz).order_by('question_id').values_list(
+                'question_id', 'total_answers', 'correct_answers')),
+        )
+
+    def test_increments_match_rebuild(self):
+        self.submit(4)
+        get_quiz_stats(self.quiz.id)
+        for num_correct in (0, 1, 3, 3):
+            self.submit(num_correct)
+        incremental = self.snapshot()
+
+        rebuild_quiz_stats(self.quiz.id)
+
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(incremental[:7], (5, 11, 275.0, 5, 0, 4, 3))
+
+    def test_missing_rollup_is_rebuilt_on_read(self):
+        self.submit(2)
+        self.assertFalse(QuizStats.objects.exists())
+
+        stats = get_quiz_stats(self.quiz.id)
+
+        self.assertEqual(stats.submission_count, 1)
+        self.assertEqual(stats.score_sum, 2)
+
+    def test_deleting_submission_invalidates_rollup(self):
+        submission = self.submit(2)
+        get_quiz_stats(self.quiz.id)
+
+        submission.delete()
+
+        self.assertFalse(QuizStats.objects.exists())
+        self.assertEqual(get_quiz_stats(self.quiz.id).submission_count, 0)
+
+    def test_adding_question_invalidates_rollup(self):
+        get_quiz_stats(self.quiz.id)
+        Question.objects.create(quiz=self.quiz, question_text='New', question_type='text')
+        self.assertFalse(QuizStats.objects.exists())
+
+    def test_rebuild_command(self):
+        self.submit(1)
+        call_command('rebuild_quiz_stats', stdout=StringIO())
+        self.assertEqual(QuizStats.objects.get(quiz=self.quiz).score_sum, 1)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Row locks need PostgreSQL')
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+})
+class ConcurrentSubmissionTests(TransactionTestCase):
+    """Submissions to one quiz from separate connections at the same time"""
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.owner = User.objects.create_user('owner', password='pass12345')
+        self.quiz = create_quiz(self.owner)
+        get_quiz_stats(self.quiz.id)
+
+    def test_concurrent_submissions_do_not_deadlock(self):
+        key = get_answer_key(self.quiz.id)
+        answers = correct_answers(self.quiz)
+        # Both submissions are inserted before either takes the rollup lock
+        inserted = threading.Barrier(2, timeout=10)
+        lock = rollups.lock_quiz_rollups
+        errors = []
+
+        def lock_after_both_inserted(quiz_id):
+            inserted.wait()
+            lock(quiz_id)
+
+        def submit(name):
+            try:
+                grade_submission(key, name, answers)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        with mock.patch.object(rollups, 'lock_quiz_rollups', lock_after_both_inserted):
+            threads = [threading.Thread(target=submit, args=(name,)) for name in ('Ann', 'Bob')]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(QuizStats.objects.get(quiz=self.quiz).submission_count, 2)
+
+
+class SubmissionFeedTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-submissions', args=[self.quiz.id])
+        key = get_answer_key(self.quiz.id)
+        answers = correct_answers(self.quiz)
+        self.submissions = [
+            grade_submission(key, f'Taker {idx}', answers[:idx % 4])[0]
+            for idx in range(7)
+        ]
+        # Several submissions sharing a timestamp exercise the id tiebreaker
+        moment = timezone.now()
+        QuizSubmission.objects.filter(pk__in=[s.pk for s in self.submissions[2:5]]).update(
+            submitted_at=moment)
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+        return ids
+
+    def test_pages_cover_every_submission_once_in_order(self):
+        ids = self.collect(self.url + '?page_size=2')
+
+        expected = list(QuizSubmission.objects.filter(quiz=self.quiz).order_by(
+            '-submitted_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_filters(self):
+        self.assertEqual(len(self.collect(self.url + '?min_score=2&max_score=3')), 3)
+        self.assertEqual(self.collect(self.url + '?taker_name=taker 6'), [self.submissions[6].id])
+        after = QuizSubmission.objects.get(pk=self.submissions[2].pk).submitted_at
+        response = self.client.get(self.url, {'submitted_after': after.isoformat()})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_filter_and_cursor(self):
+        self.assertEqual(
+            self.client.get(self.url + '?min_score=abc').status_code,
+            status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.get(self.url + '?cursor=bogus').status_code,
+            status.HTTP_404_NOT_FOUND)
+
+    def test_other_users_cannot_list(self):
+        self.client.force_authenticate(User.objects.create_user('intruder'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class QuizExportTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-export', args=[self.quiz.id])
+        key = get_answer_key(self.quiz.id)
+        grade_submission(key, 'Alice', correct_answers(self.quiz))
+        grade_submission(key, 'Bob', [])
+
+    def test_csv_export(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([row['taker_name'] for row in rows], ['Alice'] * 3 + ['Bob'])
+        self.assertEqual([row['is_correct'] for row in rows[:3]], ['True'] * 3)
+        self.assertEqual(rows[3]['question_id'], '')
+
+    def test_csv_export_neutralises_formulas(self):
+        key = get_answer_key(self.quiz.id)
+        text_question = self.quiz.questions.get(question_type='text')
+        grade_submission(key, '=HYPERLINK("http://evil")', [
+            {'question_id': text_question.id, 'text_answer': '@SUM(1+1)'}])
+
+        response = self.client.get(self.url)
+
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[-1]['taker_name'], '\'=HYPERLINK("http://evil")')
+        self.assertEqual(rows[-1]['text_answer'], "'@SUM(1+1)")
+        self.assertEqual(rows[0]['taker_name'], 'Alice')
+
+    def test_ndjson_export(self):
+        response = self.client.get(self.url, {'export_format': 'ndjson'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['question_text'], 'Question 0')
+        self.assertEqual(rows[0]['selected_choice_text'], 'Option 0')
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {'export_format': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_owner_only(self):
+        self.client.force_authenticate(User.objects.create_user('intruder'))
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class QuizCreateTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.owner)
+        self.url = reverse('quiz-create-full')
+
+    def payload(self, num_questions, num_choices=4):
+        questions = []
+        for idx in range(num_questions):
+            question_type = ('mcq', 'true_false', 'text')[idx % 3]
+            question = {
+                'question_text': f'Question <b>{idx}</b>',
+                'question_type': question_type,
+                'order': idx,
+            }
+            if question_type == 'mcq':
+                question['choices'] = [
+                    {'choice_text': f'Option {n}', 'is_correct': n == 0}
+                    for n in range(num_choices)
+                ]
+            elif question_type == 'text':
+                question['correct_text_answer'] = 'Paris'
+            questions.append(question)
+        return {'title': 'Bulk quiz', 'description': 'Made in one go', 'questions': questions}
+
+    def test_creates_questions_and_choices(self):
+        response = self.client.post(self.url, self.payload(3, num_choices=12), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        quiz = Quiz.objects.get(pk=response.data['id'])
+        mcq, true_false, text = quiz.questions.order_by('order')
+        self.assertEqual(mcq.question_text, 'Question &lt;b&gt;0&lt;/b&gt;')
+        # Choices are capped at ten per question
+        self.assertEqual(mcq.choices.count(), 10)
+        self.assertEqual(
+            list(true_false.choices.order_by('id').values_list('choice_text', 'is_correct')),
+            [('True', True), ('False', False)])
+        self.assertEqual(text.correct_text_answer, 'Paris')
+
+    def test_query_count_does_not_grow_with_questions(self):
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.payload(3), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, self.payload(60, num_choices=10), format='json')
+
+        self.assertEqual(Question.objects.count(), 63)
+        self.assertEqual(len(small), len(large))
+
+    def test_too_many_questions_creates_nothing(self):
+        response = self.client.post(self.url, self.payload(101), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Quiz.objects.exists())
+
+    def test_invalid_question_creates_nothing(self):
+        payload = self.payload(3)
+        payload['questions'][2]['question_type'] = 'essay'
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Quiz.objects.exists())
+
+
+class QuizImportTests(QuizTestCase):
+
+    def quiz_payload(self, title, num_questions=2):
+        return {
+            'title': title,
+            'questions': [
+                {'question_text': f'Q{idx}', 'question_type': 'true_false', 'order': idx}
+                for idx in range(num_questions)
+            ],
+        }
+
+    def test_json_array_is_read_incrementally(self):
+        text = json.dumps([self.quiz_payload(f'Quiz {idx}') for idx in range(3)], indent=2)
+        stream = StringIO(text)
+        stream.read = lambda size=-1, read=stream.read: read(min(size, 16))
+
+        records = list(parse_json(stream))
+
+        self.assertEqual([record.number for record in records], [1, 2, 3])
+        self.assertEqual(records[2].data['title'], 'Quiz 2')
+
+    def test_json_syntax_error_stops_reading(self):
+        items = [json.dumps(self.quiz_payload(f'Quiz {idx}')) for idx in range(3000)]
+        items[1] = '{"title": "Broken" "questions": []}'
+        stream = StringIO('[' + ','.join(items) + ']')
+        reads = []
+        stream.read = lambda size=-1, read=stream.read: reads.append(size) or read(size)
+
+        records = list(parse_json(stream))
+
+        self.assertEqual(records[-1].number, 2)
+        self.assertIn("Expecting ',' delimiter", records[-1].error)
+        self.assertLessEqual(len(reads), 2)
+
+    def test_json_items_need_separators(self):
+        records = list(parse_json(StringIO(
+            '[{"title": "A", "questions": []} {"title": "B", "questions": []}]')))
+        self.assertEqual(records[-1].number, 2)
+        self.assertIn("Expecting ',' or ']' after quiz 1", records[-1].error)
+
+        records = list(parse_json(StringIO('[{"title": "A", "questions": []},]')))
+        self.assertEqual(records[-1].number, 2)
+        self.assertIn('Invalid JSON', records[-1].error)
+
+    def test_oversized_json_item_is_rejected(self):
+        text = json.dumps([self.quiz_payload('A' * 1000)])
+
+        with mock.patch('quizzes.importers.READ_SIZE', 64), \
+                mock.patch('quizzes.importers.MAX_JSON_ITEM_SIZE', 256):
+            records = list(parse_json(StringIO(text)))
+
+        self.assertEqual(len(records), 1)
+        self.assertIn('longer than 256 characters', records[0].error)
+
+    def test_json_items_split_across_reads(self):
+        payloads = [dict(self.quiz_payload('Caf\u00e9 "quoted"'), order=1234567)
+                    for _ in range(3)]
+        text = json.dumps(payloads, ensure_ascii=True)
+
+        with mock.patch('quizzes.importers.READ_SIZE', 5):
+            records = list(parse_json(StringIO(text)))
+
+        self.assertEqual([record.data for record in records], payloads)
+
+    def test_truncated_json_reports_error(self):
+        records = list(parse_json(StringIO('[{"title": "A", "questions": []}, {"title"')))
+        self.assertEqual(records[-1].number, 2)
+        self.assertIn('Invalid JSON', records[-1].error)
+
+    def test_ndjson_reports_bad_lines(self):
+        lines = [json.dumps(self.quiz_payload('A')), 'not json', json.dumps(self.quiz_payload('B'))]
+        records = list(parse_ndjson(StringIO('\n'.join(lines))))
+        self.assertEqual([record.error is None for record in records], [True, False, True])
+        self.assertEqual(records[1].number, 2)
+
+    def test_csv_groups_rows_by_quiz(self):
+        text = (
+            'quiz_title,question_text,question_type,correct_text_answer,choices\n'
+            'Capitals,Capital of France?,mcq,,*Paris|London|Rome\n'
+            'Capitals,Capital of Italy?,text,Rome,\n'
+            'Science,Water is wet,true_false,,*True|False\n'
+        )
+        records = list(parse_csv(StringIO(text)))
+
+        self.assertEqual([record.data['title'] for record in records], ['Capitals', 'Science'])
+        self.assertEqual([record.number for record in records], [2, 4])
+        capitals = records[0].data['questions']
+        self.assertEqual(capitals[0]['choices'][0], {'choice_text': 'Paris', 'is_correct': True})
+        self.assertEqual(capitals[1]['correct_text_answer'], 'Rome')
+
+    def test_gift_subset(self):
+        text = (
+            '// geography\n'
+            '$CATEGORY: bank/Geography\n'
+            '::q1:: Capital of France? {=Paris ~London ~Rome#Nope}\n'
+            '\n'
+            'The Earth is flat. {F}\n'
+            '\n'
+            'Largest ocean? {=Pacific =Pacific Ocean}\n'
+            '\n'
+            '$CATEGORY: bank/Broken\n'
+            'No answers here\n'
+        )
+        records = list(parse_gift(StringIO(text)))
+
+        self.assertEqual(len(records), 2)
+        mcq, true_false, short = records[0].data['questions']
+        self.assertEqual(records[0].data['title'], 'Geography')
+        self.assertEqual(mcq['question_text'], 'Capital of France?')
+        self.assertEqual(
+            [(choice['choice_text'], choice['is_correct']) for choice in mcq['choices']],
+            [('Paris', True), ('London', False), ('Rome', False)])
+        self.assertEqual(true_false['choices'][1], {'choice_text': 'False', 'is_correct': True})
+        self.assertEqual(short, {
+            'question_text': 'Largest ocean?', 'question_type': 'text',
+            'correct_text_answer': 'Pacific'})
+        self.assertEqual(records[1].number, 9)
+        self.assertIn('no answer block', records[1].error)
+
+    def test_import_batches_and_reports_invalid_records(self):
+        records = [self.quiz_payload(f'Quiz {idx}') for idx in range(5)]
+        records[1]['questions'][0]['question_type'] = 'essay'
+        records[3] = self.quiz_payload('Too long', num_questions=101)
+        lines = '\n'.join(json.dumps(record) for record in records)
+
+        with CaptureQueriesContext(connection) as queries:
+            report = import_quizzes(self.owner, parse_ndjson(StringIO(lines)), batch_size=2)
+
+        self.assertEqual(len(report.quiz_ids), 3)
+        self.assertEqual([error['record'] for error in report.errors], [2, 4])
+        self.assertIn('questions', report.errors[1]['errors'])
+        self.assertEqual(Question.objects.count(), 6)
+        self.assertEqual(Choice.objects.count(), 12)
+        inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT')]
+        # Two batches, three tables each
+        self.assertEqual(len(inserts), 6)
+
+    def test_upload_endpoint(self):
+        self.client.force_authenticate(self.owner)
+        upload = SimpleUploadedFile(
+            'bank.jsonl', '\n'.join([
+                json.dumps(self.quiz_payload('A')), '{"title": ""}']).encode())
+
+        response = self.client.post(reverse('quiz-import'), {'file': upload})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['record'], 2)
+        self.assertEqual(Quiz.objects.get().created_by, self.owner)
+
+    def test_non_utf8_upload_reports_quizzes_already_created(self):
+        self.client.force_authenticate(self.owner)
+        lines = [json.dumps(self.quiz_payload(f'Quiz {idx}')) for idx in range(400)]
+        upload = SimpleUploadedFile(
+            'bank.jsonl', '\n'.join(lines).encode() + b'\n\xff\n')
+
+        response = self.client.post(reverse('quiz-import'), {'file': upload})
+
+        # At least one batch of 100 committed before the bad byte was decoded
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreaterEqual(response.data['created'], 100)
+        self.assertEqual(response.data['created'], Quiz.objects.count())
+        self.assertEqual(
+            response.data['errors'][-1]['errors'],
+            {'non_field_errors': ['File must be UTF-8 encoded']})
+
+    def test_upload_requires_known_format(self):
+        self.client.force_authenticate(self.owner)
+        upload = SimpleUploadedFile('bank.xml', b'<quizzes/>')
+        response = self.client.post(reverse('quiz-import'), {'file': upload})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            json.dump([self.quiz_payload('A'), self.quiz_payload('B')], handle)
+        self.addCleanup(os.unlink, handle.name)
+        out = StringIO()
+
+        call_command('import_quizzes', handle.name, owner=self.owner.username, stdout=out)
+
+        self.assertIn('Imported 2 quizzes', out.getvalue())
+        self.assertEqual(Quiz.objects.filter(created_by=self.owner).count(), 2)
+
+
+@override_settings(QUIZ_QUEUE_SUBMISSIONS=True)
+class SubmissionQueueTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-submit', args=[self.quiz.id])
+
+    def test_submit_queues_and_returns_score(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {'taker_name': 'Bob', 'answers': correct_answers(self.quiz)},
+                format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['score'], 3)
+        self.assertIsNone(response.data['id'])
+        self.assertEqual(len(response.data['answers']), 3)
+        self.assertEqual(response.data['answers'][0]['correct_choice'], 'Option 0')
+        self.assertFalse(QuizSubmission.objects.exists())
+        pending = PendingSubmission.objects.get()
+        self.assertEqual(str(pending.token), response.data['submission_token'])
+        # Nothing is written but the queue row
+        self.assertEqual(
+            [query['sql'].split()[0] for query in queries
+             if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))].count('INSERT'), 1)
+
+    def test_drain_stores_submissions_and_rollups(self):
+        get_quiz_stats(self.quiz.id)
+        for _ in range(3):
+            self.client.post(self.url, {'answers': correct_answers(self.quiz)}, format='json')
+        queued_at = PendingSubmission.objects.order_by('id').first().created_at
+
+        self.assertEqual(drain_submissions(batch_size=2), 2)
+        self.assertEqual(drain_submissions(batch_size=2), 1)
+        self.assertEqual(drain_submissions(), 0)
+
+        self.assertFalse(PendingSubmission.objects.exists())
+        self.assertEqual(QuizSubmission.objects.count(), 3)
+        self.assertEqual(Answer.objects.filter(is_correct=True).count(), 9)
+        self.assertEqual(QuizSubmission.objects.order_by('id').first().submitted_at, queued_at)
+        self.assertEqual(get_quiz_stats(self.quiz.id).submission_count, 3)
+
+    def test_drain_never_stores_a_token_twice(self):
+        key = get_answer_key(self.quiz.id)
+        submission, _ = enqueue_submission(key, '', correct_answers(self.quiz))
+        drain_submissions()
+        # A retried queue write for a token that is already stored
+        PendingSubmission.objects.create(
+            quiz=self.quiz, token=submission.submission_token,
+            payload={'taker_name': '', 'score': 0, 'total_questions': 3, 'answers': []})
+
+        self.assertEqual(drain_submissions(), 1)
+        self.assertEqual(QuizSubmission.objects.count(), 1)
+        self.assertFalse(PendingSubmission.objects.exists())
+
+    def test_drain_drops_answers_to_deleted_questions(self):
+        key = get_answer_key(self.quiz.id)
+        enqueue_submission(key, '', correct_answers(self.quiz))
+        self.quiz.questions.get(question_type='text').delete()
+
+        drain_submissions()
+
+        self.assertEqual(Answer.objects.count(), 2)
+
+    def test_drain_command(self):
+        self.client.post(self.url, {'answers': correct_answers(self.quiz)}, format='json')
+        out = StringIO()
+        call_command('drain_submissions', stdout=out)
+        self.assertIn('Drained 1 queued submissions', out.getvalue())
+
+
+class SubmissionTokenTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = create_quiz(self.owner, num_questions=3)
+        self.url = reverse('quiz-submit', args=[self.quiz.id])
+        self.token = str(uuid.uuid4())
+
+    def submit(self, **extra):
+        payload = {'taker_name': 'Bob', 'submission_token': self.token, **extra}
+        if 'answers' not in payload:
+            payload['answers'] = correct_answers(self.quiz)
+        return self.client.post(self.url, payload, format='json')
+
+    def test_replay_returns_original_result_without_writes(self):
+        first = self.submit()
+
+        with CaptureQueriesContext(connection) as queries:
+            replay = self.submit(answers=[])
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.status_code, status.HTTP_200_OK)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(QuizSubmission.objects.count(), 1)
+        self.assertEqual(get_quiz_stats(self.quiz.id).submission_count, 1)
+
+    def test_replay_after_cache_loss_reads_stored_result(self):
+        first = self.submit()
+        cache.clear()
+        local_cache.clear()
+
+        replay = self.submit()
+
+        self.assertEqual(replay.status_code, status.HTTP_200_OK)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(QuizSubmission.objects.count(), 1)
+
+    def test_concurrent_duplicate_returns_winner(self):
+        key = get_answer_key(self.quiz.id)
+        winner, _ = grade_submission(key, 'Alice', correct_answers(self.quiz), token=self.token)
+
+        # The replay check missed, then the insert hits the unique constraint
+        result, result_status = record_submission(key, 'Bob', [], uuid.UUID(self.token))
+
+        self.assertEqual(result_status, status.HTTP_200_OK)
+        self.assertEqual(result['id'], winner.id)
+        self.assertEqual(result['taker_name'], 'Alice')
+        self.assertEqual(QuizSubmission.objects.count(), 1)
+
+    def test_same_token_on_another_quiz_is_separate(self):
+        self.submit()
+        other = create_quiz(self.owner, num_questions=1)
+        response = self.client.post(
+            reverse('quiz-submit', args=[other.id]),
+            {'answers': correct_answers(other), 'submission_token': self.token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(QUIZ_QUEUE_SUBMISSIONS=True)
+    def test_same_token_on_another_quiz_is_separate_when_queued(self):
+        self.submit()
+        other = create_quiz(self.owner, num_questions=1)
+        response = self.client.post(
+            reverse('quiz-submit', args=[other.id]),
+            {'answers': correct_answers(other), 'submission_token': self.token}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(PendingSubmission.objects.count(), 2)
+
+    def test_other_integrity_errors_are_not_reported_as_reused_tokens(self):
+        key = get_answer_key(self.quiz.id)
+
+        with mock.patch('quizzes.views.grade_submission', side_effect=IntegrityError('other')):
+            with self.assertRaises(IntegrityError):
+                record_submission(key, 'Bob', [], uuid.UUID(self.token))
+
+    @override_settings(QUIZ_QUEUE_SUBMISSIONS=True)
+    def test_replay_of_queued_submission(self):
+        first = self.submit()
+        cache.clear()
+
+        replay = self.submit()
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(replay.status_code, status.HTTP_200_OK)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(PendingSubmission.objects.count(), 1)
+
+    def test_invalid_token_rejected(self):
+        response = self.submit(submission_token='not-a-uuid')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SeedingTests(QuizTestCase):
+
+    def test_seeded_rows_are_consistent(self):
+        result = seed_quizzes(
+            users=2, quizzes_per_user=2, questions_per_quiz=3,
+            submissions_per_quiz=5, batch_size=4, seed=1)
+
+        self.assertEqual(result.quizzes, 4)
+        self.assertEqual(result.submissions, 20)
+        self.assertEqual(Answer.objects.count(), result.answers)
+        self.assertEqual(result.answers, 60)
+        submission = QuizSubmission.objects.first()
+        self.assertEqual(
+            submission.score, submission.answers.filter(is_correct=True).count())
+        # Rollups rebuild from the seeded rows
+        stats = get_quiz_stats(submission.quiz_id)
+        self.assertEqual(stats.submission_count, 5)
+
+
+class BenchmarkCommandTests(QuizTestCase):
+
+    def test_seed_benchmark_data(self):
+        out = StringIO()
+        call_command(
+            'seed_benchmark_data', users=1, quizzes=2, questions=3, submissions=4,
+            seed=1, json=True, stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())['answers'], 24)
+        self.assertEqual(QuizSubmission.objects.count(), 8)
+
+    def test_benchmark_api_reports_every_scenario(self):
+        seed_quizzes(quizzes_per_user=1, questions_per_quiz=3, submissions_per_quiz=2, seed=1)
+        quizzes = Quiz.objects.count()
+        out = StringIO()
+
+        call_command('benchmark_api', requests=3, warmup=1, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report['scenarios']), {
+            'public_quiz', 'submit', 'analytics', 'quiz_list', 'create_quiz'})
+        for name, result in report['scenarios'].items():
+            with self.subTest(name):
+                self.assertEqual(result['requests'], 3)
+                self.assertEqual(result['errors'], 0, result['statuses'])
+                self.assertLessEqual(result['latency_ms']['p50'], result['latency_ms']['p99'])
+                self.assertIsNotNone(result['queries'])
+        # Writes are rolled back
+        self.assertEqual(Quiz.objects.count(), quizzes)
+        self.assertEqual(QuizSubmission.objects.count(), 2)
+
+    def test_benchmark_api_leaves_no_rolled_back_data_in_the_cache(self):
+        seed_quizzes(quizzes_per_user=1, questions_per_quiz=3, submissions_per_quiz=2, seed=1)
+        quiz = Quiz.objects.get()
+        self.assertEqual(get_quiz_analytics(quiz)['total_submissions'], 2)
+
+        call_command(
+            'benchmark_api', scenario=['submit', 'analytics'], requests=3, warmup=1,
+            stdout=StringIO())
+
+        self.assertEqual(get_quiz_analytics(quiz)['total_submissions'], 2)
+
+    def test_benchmark_api_commit_keeps_writes(self):
+        seed_quizzes(quizzes_per_user=1, questions_per_quiz=3, submissions_per_quiz=2, seed=1)
+
+        call_command(
+            'benchmark_api', scenario=['submit'], requests=3, warmup=1, commit=True,
+            stdout=StringIO())
+
+        self.assertEqual(QuizSubmission.objects.count(), 6)
+
+    def test_benchmark_api_server_worker_errors_are_raised(self):
+        class BrokenConnection:
+            def request(self, *args, **kwargs):
+                raise ValueError('worker failed')
+
+            def close(self):
+                pass
+
+        scenario = benchmark_api.Scenario('public_quiz', 'GET', '/')
+        with self.assertRaisesMessage(ValueError, 'worker failed'):
+            benchmark_api.Command()._drive_server(
+                scenario, BrokenConnection, '', 'token',
+                {'warmup': 0, 'requests': 2, 'concurrency': 2})
+
+
+def budget_requests(quiz, submission):
+    """One or more (method, args, data, format) requests for every URL name in quizzes.urls"""
+    upload = SimpleUploadedFile(
+        'quizzes.json', json.dumps([{'title': 'Imported', 'questions': []}]).encode())
+    questions = [
+        {'question_text': f'Q{idx}', 'question_type': 'true_false', 'order': idx,
+         'choices': [{'choice_text': 'True', 'is_correct': True},
+                     {'choice_text': 'False', 'is_correct': False}]}
+        for idx in range(5)
+    ]
+    return {
+        'quiz-list-create': [
+            ('get', [], None, None),
+            ('post', [], {'title': 'New quiz'}, 'json'),
+        ],
+        'quiz-detail': [('get', [quiz.pk], None, None)],
+        'quiz-create-full': [
+            ('post', [], {'title': 'Full quiz', 'questions': questions}, 'json'),
+        ],
+        'quiz-import': [('post', [], {'file': upload}, 'multipart')],
+        'quiz-analytics': [('get', [quiz.pk], None, None)],
+        'quiz-submissions': [('get', [quiz.pk], None, None)],
+        'quiz-export': [('get', [quiz.pk], None, None)],
+        'submission-detail': [('get', [quiz.pk, submission.pk], None, None)],
+        'quiz-public': [('get', [quiz.pk], None, None)],
+        'quiz-submit': [('post', [quiz.pk], {
+            'taker_name': 'Budget',
+            'submission_token': str(uuid.uuid4()),
+            'answers': correct_answers(quiz),
+        }, 'json')],
+    }
+
+
+class QueryBudgetTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        seed_quizzes(quizzes_per_user=2, questions_per_quiz=10, submissions_per_quiz=20, seed=1)
+        self.quiz = Quiz.objects.select_related('created_by').first()
+        token = RefreshToken.for_user(self.quiz.created_by).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_every_url_stays_within_its_budget(self):
+        """Cold caches, real JWT authentication and seeded data: the worst case"""
+        requests = budget_requests(self.quiz, self.quiz.submissions.first())
+        for pattern in quiz_urls.urlpatterns:
+            with self.subTest(pattern.name):
+                view = getattr(pattern.callback, 'view_class', pattern.callback)
+                self.assertTrue(
+                    hasattr(view, 'query_budget'), f'{pattern.name} declares no query_budget')
+                self.assertIn(pattern.name, requests, f'No budget request for {pattern.name}')
+                for method, args, data, request_format in requests[pattern.name]:
+                    cache.clear()
+                    local_cache.clear()
+                    response = getattr(self.client, method)(
+                        reverse(pattern.name, args=args), data, format=request_format)
+                    b''.join(getattr(response, 'streaming_content', [b'']))
+                    self.assertLess(response.status_code, 400, response)
+
+    def test_async_views_share_the_drf_budgets(self):
+        self.assertEqual(get_query_budget(async_views.public_quiz), PublicQuizView.query_budget)
+        self.assertEqual(get_query_budget(async_views.submit_quiz), QuizSubmitView.query_budget)
+
+    def test_over_budget_request_raises_with_sql_and_stack(self):
+        with mock.patch.object(QuizDetailView, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded) as raised:
+                self.client.get(reverse('quiz-detail', args=[self.quiz.pk]))
+
+        report = str(raised.exception)
+        self.assertIn('ran 4 queries, over its budget of 1', report)
+        self.assertIn('FROM "quizzes_question"', report)
+        self.assertIn('File "', report)
+
+    @override_settings(QUIZ_QUERY_BUDGETS='log')
+    def test_log_mode_warns(self):
+        with mock.patch.object(QuizDetailView, 'query_budget', 1), \
+                self.assertLogs('quizzes.budgets', 'WARNING') as logs:
+            response = self.client.get(reverse('quiz-detail', args=[self.quiz.pk]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('over its budget of 1', logs.output[0])
+
+    def test_savepoints_are_not_counted(self):
+        log = []
+        token = budgets.current_log.set(log)
+        try:
+            # Nested in the test's transaction, so atomic() issues SAVEPOINTs
+            with transaction.atomic():
+                Quiz.objects.count()
+        finally:
+            budgets.current_log.reset(token)
+
+        self.assertEqual(len(log), 1)
+        self.assertIn('COUNT(*)', log[0][0])
+
+    @override_settings(QUIZ_QUERY_BUDGETS='off')
+    def test_off_mode_records_nothing(self):
+        with mock.patch.object(QuizDetailView, 'query_budget', 0):
+            response = self.client.get(reverse('quiz-detail', args=[self.quiz.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(QUIZ_REPLICA_DATABASE='replica', QUIZ_REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(QuizTestCase):
+    """Routing decisions, read from QuerySet.db so no replica connection is needed"""
+
+    def route(self, method='get', view=QuizAnalyticsView, write=False, token='a', response=None):
+        """Run a request through the middleware; returns the aliases reads used and the response"""
+        seen = []
+
+        def get_response(request):
+            middleware.process_view(request, view.as_view(), (), {'pk': 1})
+            seen.append(Quiz.objects.all().db)
+            if write:
+                QuizSubmission.objects.filter(pk=0).update(score=0)
+                seen.append(Quiz.objects.all().db)
+            return response or HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        request = getattr(RequestFactory(), method)('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return seen, middleware(request)
+
+    def test_safe_requests_to_replica_views_read_the_replica(self):
+        self.assertEqual(self.route()[0], ['replica'])
+        self.assertEqual(self.route(method='post')[0], ['default'])
+        self.assertEqual(self.route(view=QuizDetailView)[0], ['default'])
+
+    def test_no_replica_configured(self):
+        with self.settings(QUIZ_REPLICA_DATABASE=None):
+            self.assertEqual(self.route()[0], ['default'])
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        seen, _ = self.route(write=True)
+
+        # Reads after the write in the same request, then the next requests
+        self.assertEqual(seen, ['replica', 'default'])
+        self.assertEqual(self.route()[0], ['default'])
+        self.assertEqual(self.route(token='b')[0], ['replica'])
+
+    def test_cached_entries_are_built_from_the_primary(self):
+        builds = []
+
+        def build():
+            builds.append(Quiz.objects.all().db)
+            return {'built': True}
+
+        def get_response(request):
+            middleware.process_view(request, QuizAnalyticsView.as_view(), (), {})
+            get_or_build([quiz_tag(1)], 'replica_test', build)
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        middleware(RequestFactory().get('/'))
+
+        self.assertEqual(builds, ['default'])
+
+    def test_streamed_responses_keep_reading_the_replica(self):
+        def rows():
+            yield Quiz.objects.all().db
+
+        _, response = self.route(view=QuizExportView, response=StreamingHttpResponse(rows()))
+
+        self.assertEqual(b''.join(response.streaming_content), b'replica')
+
+    def test_async_public_view_is_marked(self):
+        self.assertTrue(wants_replica(async_views.public_quiz))
+        self.assertFalse(wants_replica(async_views.submit_quiz))
+
+
+@skipUnless('replica' in settings.DATABASES, 'Set DATABASE_REPLICA_URL to test a real replica')
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+})
+class ReplicaDatabaseTests(TransactionTestCase):
+    """End to end against the replica alias, which mirrors the test database"""
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.owner = User.objects.create_user('owner', password='pass12345')
+        self.quiz = create_quiz(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_owner_reads_go_to_the_replica_until_they_write(self):
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(reverse('quiz-analytics', args=[self.quiz.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(len(replica), 0)
+
+        self.client.post(reverse('quiz-list-create'), {'title': 'New'}, format='json')
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(reverse('quiz-list-create'))
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(replica), 0)
+
+
+@override_settings(QUIZ_SERVER_TIMING=True)
+class RequestMetricsTests(QuizTestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+        self.quiz = create_quiz(self.owner)
+
+    def test_requests_are_recorded_per_url_name(self):
+        url = reverse('quiz-public', args=[self.quiz.id])
+        first = self.client.get(url)
+        self.client.get(url)
+
+        self.assertEqual(metrics.REQUESTS.value('quiz-public', 'GET', '200'), 2)
+        self.assertEqual(metrics.DB_QUERIES.count('quiz-public', 'GET'), 2)
+        self.assertRegex(
+            first['Server-Timing'],
+            r'^db;dur=[\d.]+;desc="[1-9]\d* queries", render;dur=[\d.]+, total;dur=[\d.]+$')
+        self.assertEqual(metrics.CACHE_LOOKUPS.value('public_snapshot', 'miss'), 1)
+        self.assertEqual(metrics.CACHE_LOOKUPS.value('public_snapshot', 'local'), 1)
+
+    def test_cached_request_runs_no_queries(self):
+        url = reverse('quiz-public', args=[self.quiz.id])
+        self.client.get(url)
+
+        response = self.client.get(url)
+
+        self.assertIn('desc="0 queries"', response['Server-Timing'])
+
+    def test_async_requests_are_recorded(self):
+        async def fetch():
+            return await self.async_client.get(reverse('quiz-public', args=[self.quiz.id]))
+
+        response = async_to_sync(fetch)()
+
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(metrics.REQUESTS.value('quiz-public', 'GET', '200'), 1)
+
+    def test_streamed_rows_are_counted(self):
+        key = get_answer_key(self.quiz.id)
+        grade_submission(key, 'Alice', correct_answers(self.quiz))
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.get(reverse('quiz-export', args=[self.quiz.id]))
+        self.assertEqual(metrics.REQUESTS.value('quiz-export', 'GET', '200'), 0)
+        with CaptureQueriesContext(connection) as streamed:
+            b''.join(response.streaming_content)
+
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(metrics.REQUESTS.value('quiz-export', 'GET', '200'), 1)
+        self.assertGreater(metrics.DB_QUERIES.total('quiz-export', 'GET'), len(streamed))
+
+    def test_unmatched_and_unknown_methods_share_series(self):
+        self.client.generic('BREW', '/nowhere/')
+        self.assertEqual(metrics.REQUESTS.value('unmatched', 'OTHER', '404'), 1)
+
+    @override_settings(DEBUG=True)
+    def test_prometheus_exposition(self):
+        self.client.get(reverse('quiz-public', args=[self.quiz.id]))
+
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE quiz_http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'quiz_http_requests_total{url_name="quiz-public",method="GET",status="200"} 1', body)
+        self.assertIn(
+            'quiz_http_request_duration_seconds_bucket'
+            '{url_name="quiz-public",method="GET",le="+Inf"} 1', body)
+
+    @override_settings(QUIZ_METRICS_TOKEN='s3cret')
+    def test_metrics_token(self):
+        self.assertEqual(
+            self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_metrics_need_a_token_outside_debug(self):
+        self.assertEqual(
+            self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(QUIZ_SERVER_TIMING=False)
+    def test_server_timing_can_be_turned_off(self):
+        response = self.client.get(reverse('quiz-public', args=[self.quiz.id]))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('h', 'Test.', (1, 5), ('name',))
+        for value in (0.5, 1, 3, 7):
+            histogram.observe(value, 'a"b')
+
+        self.assertEqual(histogram.expose()[2:], [
+            'h_bucket{name="a\\"b",le="1"} 2',
+            'h_bucket{name="a\\"b",le="5"} 3',
+            'h_bucket{name="a\\"b",le="+Inf"} 4',
+            'h_sum{name="a\\"b"} 11.5',
+            'h_count{name="a\\"b"} 4',
+        ])
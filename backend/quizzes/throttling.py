@@ -0,0 +1,78 @@
+from rest_framework import throttling
+
+
+class SlidingWindowRateThrottle(throttling.SimpleRateThrottle):
+    """
+    Sliding-window counter throttle.
+
+    Instead of DRF's per-client list of request timestamps, each client has
+    one counter per fixed window. The rate is estimated from the current
+    window's count plus the previous window's, weighted by how much of it
+    still overlaps the sliding window. A check is one get_many and one
+    add/incr, whatever the rate. With Redis as the cache every worker shares
+    the counters and its atomic incr enforces the limit exactly; the
+    in-memory fallback limits each process separately.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        current_key = f'{self.key}:{window}'
+        previous_key = f'{self.key}:{window - 1}'
+        counts = self.cache.get_many([current_key, previous_key])
+        self.current = counts.get(current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+        # Fraction of the current window already elapsed
+        self.elapsed = (now % self.duration) / self.duration
+
+        if self.current + self.previous * (1 - self.elapsed) >= self.num_requests:
+            return self.throttle_failure()
+
+        # Counters outlive their window by one more, while they are "previous"
+        timeout = self.duration * 2
+        if not self.cache.add(current_key, 1, timeout):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                # Expired between add() and incr()
+                self.cache.set(current_key, 1, timeout)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the estimated rate drops below the limit"""
+        if self.current < self.num_requests and self.previous:
+            # Still in this window, once enough of the previous one has slid out
+            target = 1 - (self.num_requests - self.current) / self.previous
+            return max(target - self.elapsed, 0) * self.duration
+        # In the next window, once enough of this one has slid out
+        target = 1 - self.num_requests / self.current if self.current else 0
+        return (1 - self.elapsed + max(target, 0)) * self.duration
+
+
+class AnonRateThrottle(SlidingWindowRateThrottle, throttling.AnonRateThrottle):
+    """Limits anonymous callers by IP (scope 'anon')"""
+
+
+class UserRateThrottle(SlidingWindowRateThrottle, throttling.UserRateThrottle):
+    """Limits callers by user id, or by IP when anonymous (scope 'user')"""
+
+
+class QuizSubmitThrottle(AnonRateThrottle):
+    """Rate limiting for quiz submissions to prevent abuse"""
+    scope = 'quiz_submit'
+
+    def get_cache_key(self, request, view):
+        # Use IP + quiz ID to throttle per quiz
+        ident = self.get_ident(request)
+        quiz_pk = view.kwargs.get('pk', '')
+        return f'throttle_quiz_submit_{ident}_{quiz_pk}'
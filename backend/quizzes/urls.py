@@ -1,28 +1,44 @@
+from django.conf import settings
 from django.urls import path
 
+from . import async_views
 from .views import (
     PublicQuizView,
     QuizAnalyticsView,
     QuizDetailView,
+    QuizExportView,
+    QuizImportView,
     QuizListCreateView,
     QuizSubmissionDetailView,
+    QuizSubmissionListView,
     QuizSubmitView,
     QuizWithQuestionsCreateView,
 )
 
+if settings.QUIZ_ASYNC_PUBLIC_VIEWS:
+    public_quiz_view = async_views.public_quiz
+    quiz_submit_view = async_views.submit_quiz
+else:
+    public_quiz_view = PublicQuizView.as_view()
+    quiz_submit_view = QuizSubmitView.as_view()
+
 urlpatterns = [
     # Admin endpoints (require authentication)
     path('', QuizListCreateView.as_view(), name='quiz-list-create'),
     path('<int:pk>/', QuizDetailView.as_view(), name='quiz-detail'),
     path('create-with-questions/',
          QuizWithQuestionsCreateView.as_view(), name='quiz-create-full'),
+    path('import/', QuizImportView.as_view(), name='quiz-import'),
     
     # Analytics endpoints (require authentication + ownership)
     path('<int:pk>/analytics/', QuizAnalyticsView.as_view(), name='quiz-analytics'),
+    path('<int:pk>/submissions/',
+         QuizSubmissionListView.as_view(), name='quiz-submissions'),
+    path('<int:pk>/export/', QuizExportView.as_view(), name='quiz-export'),
     path('<int:quiz_pk>/submissions/<int:submission_pk>/',
          QuizSubmissionDetailView.as_view(), name='submission-detail'),
 
     # Public endpoints
-    path('public/<int:pk>/', PublicQuizView.as_view(), name='quiz-public'),
-    path('public/<int:pk>/submit/', QuizSubmitView.as_view(), name='quiz-submit'),
+    path('public/<int:pk>/', public_quiz_view, name='quiz-public'),
+    path('public/<int:pk>/submit/', quiz_submit_view, name='quiz-submit'),
 ]
@@ -0,0 +1,14 @@
+import html
+import re
+
+
+def sanitize_input(text: str) -> str:
+    """Sanitize user input to prevent XSS and injection attacks"""
+    if not text:
+        return text
+    # HTML escape
+    text = html.escape(text)
+    # Remove potentially dangerous patterns
+    text = re.sub(r'<script.*?>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    # Limit length to prevent DOS
+    return text[:10000]
@@ -1,69 +1,70 @@
-import html
-import re
+import io
 
-from django.db.models import Avg, F
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
 from rest_framework import generics, status
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
-from .models import Answer, Choice, Question, Quiz, QuizSubmission
+from . import metrics
+from .cache import get_answer_key, get_public_snapshot, get_quiz_analytics
+from .exports import EXPORT_FORMATS, stream_export
+from .grading import grade_submission
+from .idempotency import get_replay, remember_result, stored_result
+from .importers import IMPORT_FORMATS, guess_format, import_quizzes, parse_file
+from .models import (
+    Answer,
+    Quiz,
+    QuizSubmission,
+)
+from .pagination import QuizCursorPagination, SubmissionKeysetPagination
 from .serializers import (
     QuizCreateSerializer,
     QuizDetailSerializer,
-    QuizListSerializer,
+    QuizListRowSerializer,
     QuizPublicSerializer,
-    QuizSubmissionAnalyticsSerializer,
     QuizSubmissionResultSerializer,
+    QuizSubmissionRowSerializer,
     QuizSubmitSerializer,
     QuizWithQuestionsCreateSerializer,
+    SubmissionFilterSerializer,
 )
-
-
-# Custom throttle for quiz submissions
-class QuizSubmitThrottle(AnonRateThrottle):
-    """Rate limiting for quiz submissions to prevent abuse"""
-    rate = '10/hour'
-    
-    def get_cache_key(self, request, view):
-        # Use IP + quiz ID to throttle per quiz
-        ident = self.get_ident(request)
-        quiz_pk = view.kwargs.get('pk', '')
-        return f'quiz_submit_{ident}_{quiz_pk}'
-
-
-def sanitize_input(text: str) -> str:
-    """Sanitize user input to prevent XSS and injection attacks"""
-    if not text:
-        return text
-    # HTML escape
-    text = html.escape(text)
-    # Remove potentially dangerous patterns
-    text = re.sub(r'<script.*?>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
-    # Limit length to prevent DOS
-    return text[:10000]
+from .services import MAX_QUESTIONS_PER_QUIZ, create_quiz_with_questions
+from .submission_queue import enqueue_submission
+from .throttling import QuizSubmitThrottle
+from .utils import sanitize_input
 
 
 def validate_quiz_ownership(user, quiz):
     """Ensure the user owns the quiz they're trying to access"""
-    if quiz.created_by != user:
+    if quiz.created_by_id != user.pk:
         raise PermissionDenied("You do not have permission to access this quiz.")
 
 
 class QuizListCreateView(generics.ListCreateAPIView):
     """List all quizzes or create a new quiz (admin only)"""
+    query_budget = 2
+    use_replica = True
     permission_classes = [IsAuthenticated]
+    pagination_class = QuizCursorPagination
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return QuizCreateSerializer
-        return QuizListSerializer
+        return QuizListRowSerializer
 
     def get_queryset(self):
-        return Quiz.objects.filter(created_by=self.request.user)
+        return Quiz.objects.filter(created_by=self.request.user).with_stats().list_rows()
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -71,15 +72,18 @@ class QuizListCreateView(generics.ListCreateAPIView):
 
 class QuizDetailView(generics.RetrieveAPIView):
     """Retrieve a quiz with all questions (admin only)"""
+    query_budget = 4
     permission_classes = [IsAuthenticated]
     serializer_class = QuizDetailSerializer
 
     def get_queryset(self):
-        return Quiz.objects.filter(created_by=self.request.user)
+        return Quiz.objects.filter(
+            created_by=self.request.user).select_related('created_by').with_questions()
 
 
 class QuizWithQuestionsCreateView(APIView):
     """Create a quiz with all questions and choices in one request"""
+    query_budget = 4
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -89,59 +93,14 @@ class QuizWithQuestionsCreateView(APIView):
 
         data = serializer.validated_data
 
-        # Sanitize inputs for security
-        title = sanitize_input(data['title'])
-        description = sanitize_input(data.get('description', ''))
-
         # Validate question count (guard rail)
-        questions_data = data['questions']
-        if len(questions_data) > 100:
+        if len(data['questions']) > MAX_QUESTIONS_PER_QUIZ:
             return Response(
-                {'error': 'Maximum 100 questions allowed per quiz'},
+                {'error': f'Maximum {MAX_QUESTIONS_PER_QUIZ} questions allowed per quiz'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create the quiz
-        quiz = Quiz.objects.create(
-            title=title,
-            description=description,
-            created_by=request.user
-        )
-
-        # Create questions and choices
-        for idx, q_data in enumerate(data['questions']):
-            # Sanitize question inputs
-            question_text = sanitize_input(q_data['question_text'])
-            correct_text_answer = sanitize_input(q_data.get('correct_text_answer', ''))
-            
-            question = Question.objects.create(
-                quiz=quiz,
-                question_text=question_text,
-                question_type=q_data['question_type'],
-                order=q_data.get('order', idx),
-                correct_text_answer=correct_text_answer
-            )
-
-            # Create choices if provided
-            choices = q_data.get('choices', [])
-            
-            # Validate choices count (guard rail)
-            if len(choices) > 10:
-                choices = choices[:10]  # Limit to 10 choices
-
-            # For true/false, auto-generate choices if not provided
-            if q_data['question_type'] == 'true_false' and not choices:
-                Choice.objects.create(
-                    question=question, choice_text='True', is_correct=True)
-                Choice.objects.create(
-                    question=question, choice_text='False', is_correct=False)
-            else:
-                for choice_data in choices:
-                    Choice.objects.create(
-                        question=question,
-                        choice_text=sanitize_input(choice_data['choice_text']),
-                        is_correct=choice_data.get('is_correct', False)
-                    )
+        quiz = create_quiz_with_questions(request.user, data)
 
         return Response({
             'id': quiz.id,
@@ -151,102 +110,143 @@ class QuizWithQuestionsCreateView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class QuizImportView(APIView):
+    """Import quizzes from an uploaded JSON, NDJSON, CSV or GIFT file"""
+    query_budget = None  # Unbudgeted: grows with the number of quizzes in the file
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'Upload a file in the "file" field'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        file_format = request.data.get('file_format') or guess_format(upload.name)
+        if file_format not in IMPORT_FORMATS:
+            return Response(
+                {'error': f"file_format must be one of: {', '.join(IMPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Decode as the file is read so large uploads are never held in memory
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        report = import_quizzes(
+            request.user, parse_file(stream, file_format, name=upload.name))
+
+        return Response(
+            report.as_dict(),
+            status=status.HTTP_201_CREATED if report.quiz_ids else status.HTTP_400_BAD_REQUEST
+        )
+
+
 class PublicQuizView(generics.RetrieveAPIView):
     """Get a quiz for public taking (no correct answers shown)"""
+    query_budget = 4
+    use_replica = True
     permission_classes = [AllowAny]
     serializer_class = QuizPublicSerializer
-    queryset = Quiz.objects.all()
+    queryset = Quiz.objects.with_questions()
+
+    def retrieve(self, request, *args, **kwargs):
+        # Serve pre-rendered bytes; conditional GETs never touch the ORM
+        snapshot = get_public_snapshot(self.kwargs['pk'])
+        if snapshot is None:
+            raise Http404('No Quiz matches the given query.')
+
+        response = HttpResponse(snapshot.body, content_type='application/json')
+        response['ETag'] = snapshot.etag
+        response['Last-Modified'] = http_date(snapshot.last_modified)
+        patch_cache_control(
+            response, public=True, max_age=settings.QUIZ_PUBLIC_MAX_AGE)
+        return get_conditional_response(
+            request,
+            etag=snapshot.etag,
+            last_modified=snapshot.last_modified,
+            response=response
+        )
+
+
+def record_submission(answer_key, taker_name, answers, token=None):
+    """
+    Store a submission, or queue it with QUIZ_QUEUE_SUBMISSIONS, and render its result.
+
+    Returns the result data and response status. If a concurrent request
+    recorded the same token first, its result is returned with 200 instead.
+    """
+    try:
+        with transaction.atomic():
+            if settings.QUIZ_QUEUE_SUBMISSIONS:
+                # Write-behind: respond with the score, store it on the next drain
+                submission, graded = enqueue_submission(
+                    answer_key, taker_name, answers, token)
+                result_status = status.HTTP_202_ACCEPTED
+            else:
+                submission, graded = grade_submission(answer_key, taker_name, answers, token)
+                result_status = status.HTTP_201_CREATED
+    except IntegrityError:
+        if token is None:
+            raise
+        replay = stored_result(answer_key, token)
+        if replay is None:
+            # No row holds this token, so the conflict was something else
+            raise
+        return replay, status.HTTP_200_OK
+
+    # Rendered from the answer key and the graded answers, without reading them back
+    context = {'answer_key': answer_key, 'answers': graded}
+    result = QuizSubmissionResultSerializer(submission, context=context).data
+    if token:
+        remember_result(answer_key.quiz_id, token, result)
+    return result, result_status
 
 
 class QuizSubmitView(APIView):
     """Submit answers and get scored results"""
+    query_budget = 13
     permission_classes = [AllowAny]
     throttle_classes = [QuizSubmitThrottle]  # Rate limiting for submissions
 
     def post(self, request, pk):
-        quiz = get_object_or_404(Quiz, pk=pk)
+        # Compiled answer key, served from cache for hot quizzes
+        answer_key = get_answer_key(pk)
+        if answer_key is None:
+            raise Http404('No Quiz matches the given query.')
+
         serializer = QuizSubmitSerializer(data=request.data)
 
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         data = serializer.validated_data
+        token = data.get('submission_token')
+
+        # A retried submission gets its original result back, without regrading
+        if token:
+            replay = get_replay(answer_key, token)
+            if replay is not None:
+                return Response(replay, status=status.HTTP_200_OK)
 
         # Sanitize taker name
         taker_name = sanitize_input(data.get('taker_name', ''))[:100]
 
         # Validate answer count matches question count (guard rail)
-        question_count = quiz.questions.count()
-        if len(data['answers']) > question_count:
+        if len(data['answers']) > answer_key.question_count:
             return Response(
                 {'error': 'Too many answers submitted'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Create submission
-        submission = QuizSubmission.objects.create(
-            quiz=quiz,
-            taker_name=taker_name,
-            total_questions=question_count
-        )
-
-        score = 0
-        answered_questions = set()
-
-        # Process each answer
-        for answer_data in data['answers']:
-            question_id = answer_data['question_id']
-            
-            # Prevent duplicate answers (guard rail)
-            if question_id in answered_questions:
-                continue
-            answered_questions.add(question_id)
-            
-            question = get_object_or_404(
-                Question, pk=question_id, quiz=quiz)
-
-            is_correct = False
-            selected_choice = None
-            text_answer = sanitize_input(answer_data.get('text_answer', ''))
-
-            if question.question_type in ['mcq', 'true_false']:
-                choice_id = answer_data.get('selected_choice_id')
-                if choice_id:
-                    # Verify choice belongs to the question (guard rail)
-                    try:
-                        selected_choice = Choice.objects.get(
-                            pk=choice_id, question=question)
-                        is_correct = selected_choice.is_correct
-                    except Choice.DoesNotExist:
-                        pass  # Invalid choice, mark as incorrect
-            else:  # text question
-                # Simple case-insensitive comparison for text answers
-                if question.correct_text_answer:
-                    is_correct = text_answer.strip().lower(
-                    ) == question.correct_text_answer.strip().lower()
-
-            if is_correct:
-                score += 1
-
-            Answer.objects.create(
-                submission=submission,
-                question=question,
-                selected_choice=selected_choice,
-                text_answer=text_answer,
-                is_correct=is_correct
-            )
-
-        # Update submission with score
-        submission.score = score
-        submission.save()
-
-        # Return results
-        result_serializer = QuizSubmissionResultSerializer(submission)
-        return Response(result_serializer.data, status=status.HTTP_201_CREATED)
+        result, result_status = record_submission(
+            answer_key, taker_name, data['answers'], token)
+        return Response(result, status=result_status)
 
 
 class QuizAnalyticsView(APIView):
-    """Get analytics and submissions for a quiz (quiz owner only)"""
+    """Get aggregate analytics for a quiz (quiz owner only)"""
+    query_budget = 16  # Rebuilding the rollups on a cold read
+    use_replica = True
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
@@ -255,84 +255,44 @@ class QuizAnalyticsView(APIView):
         # Security check: Ensure user owns this quiz
         validate_quiz_ownership(request.user, quiz)
 
-        # Get all submissions for this quiz
-        submissions = QuizSubmission.objects.filter(quiz=quiz).order_by('-submitted_at')
+        return Response(get_quiz_analytics(quiz))
 
-        # Calculate analytics
-        total_submissions = submissions.count()
-        
-        if total_submissions == 0:
-            return Response({
-                'quiz_id': quiz.id,
-                'quiz_title': quiz.title,
-                'total_submissions': 0,
-                'average_score': 0,
-                'average_percentage': 0,
-                'highest_score': 0,
-                'lowest_score': 0,
-                'pass_rate': 0,
-                'question_analytics': [],
-                'submissions': []
-            })
-
-        # Aggregate statistics
-        stats = submissions.aggregate(
-            avg_score=Avg('score'),
-            avg_percentage=Avg(F('score') * 100.0 / F('total_questions')),
-        )
-        
-        highest_score = submissions.order_by('-score').first()
-        lowest_score = submissions.order_by('score').first()
-        
-        # Pass rate (>= 70%)
-        passing_submissions = submissions.filter(
-            score__gte=F('total_questions') * 0.7
-        ).count()
-        pass_rate = (passing_submissions / total_submissions) * 100 if total_submissions > 0 else 0
-
-        # Question-level analytics
-        question_analytics = []
-        for question in quiz.questions.all():
-            total_answers = Answer.objects.filter(
-                question=question,
-                submission__quiz=quiz
-            ).count()
-            correct_answers = Answer.objects.filter(
-                question=question,
-                submission__quiz=quiz,
-                is_correct=True
-            ).count()
-            
-            accuracy = (correct_answers / total_answers * 100) if total_answers > 0 else 0
-            
-            question_analytics.append({
-                'question_id': question.id,
-                'question_text': question.question_text[:100],
-                'question_type': question.question_type,
-                'total_answers': total_answers,
-                'correct_answers': correct_answers,
-                'accuracy': round(accuracy, 1)
-            })
-
-        # Serialize submissions
-        serializer = QuizSubmissionAnalyticsSerializer(submissions, many=True)
 
-        return Response({
-            'quiz_id': quiz.id,
-            'quiz_title': quiz.title,
-            'total_submissions': total_submissions,
-            'average_score': round(stats['avg_score'] or 0, 1),
-            'average_percentage': round(stats['avg_percentage'] or 0, 1),
-            'highest_score': highest_score.score if highest_score else 0,
-            'lowest_score': lowest_score.score if lowest_score else 0,
-            'pass_rate': round(pass_rate, 1),
-            'question_analytics': question_analytics,
-            'submissions': serializer.data
-        })
+class QuizSubmissionListView(generics.ListAPIView):
+    """Keyset-paginated, filterable submissions feed for a quiz (quiz owner only)"""
+    query_budget = 3
+    use_replica = True
+    permission_classes = [IsAuthenticated]
+    serializer_class = QuizSubmissionRowSerializer
+    pagination_class = SubmissionKeysetPagination
+
+    def get_queryset(self):
+        quiz = get_object_or_404(Quiz, pk=self.kwargs['pk'])
+
+        # Security check: Ensure user owns this quiz
+        validate_quiz_ownership(self.request.user, quiz)
+
+        filters = SubmissionFilterSerializer(data=self.request.query_params)
+        filters.is_valid(raise_exception=True)
+        params = filters.validated_data
+
+        submissions = QuizSubmission.objects.filter(quiz=quiz)
+        if 'min_score' in params:
+            submissions = submissions.filter(score__gte=params['min_score'])
+        if 'max_score' in params:
+            submissions = submissions.filter(score__lte=params['max_score'])
+        if 'submitted_after' in params:
+            submissions = submissions.filter(submitted_at__gte=params['submitted_after'])
+        if 'submitted_before' in params:
+            submissions = submissions.filter(submitted_at__lt=params['submitted_before'])
+        if params.get('taker_name'):
+            submissions = submissions.filter(taker_name__icontains=params['taker_name'])
+        return submissions.feed_rows()
 
 
 class QuizSubmissionDetailView(APIView):
     """Get detailed view of a specific submission (quiz owner only)"""
+    query_budget = 7
     permission_classes = [IsAuthenticated]
 
     def get(self, request, quiz_pk, submission_pk):
@@ -341,8 +301,54 @@ class QuizSubmissionDetailView(APIView):
         # Security check: Ensure user owns this quiz
         validate_quiz_ownership(request.user, quiz)
         
-        submission = get_object_or_404(
-            QuizSubmission, pk=submission_pk, quiz=quiz)
-        
-        serializer = QuizSubmissionResultSerializer(submission)
+        submissions = QuizSubmission.objects.prefetch_related(
+            Prefetch('answers', queryset=Answer.objects.order_by('id')))
+        submission = get_object_or_404(submissions, pk=submission_pk, quiz=quiz)
+
+        serializer = QuizSubmissionResultSerializer(
+            submission, context={'answer_key': get_answer_key(quiz.pk)})
         return Response(serializer.data)
+
+
+class QuizExportView(APIView):
+    """Stream every submission and answer for a quiz as CSV or NDJSON (quiz owner only)"""
+    # Rows are read while streaming, after the budget is checked; request
+    # metrics still count them
+    query_budget = 2
+    use_replica = True
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        quiz = get_object_or_404(Quiz, pk=pk)
+
+        # Security check: Ensure user owns this quiz
+        validate_quiz_ownership(request.user, quiz)
+
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        response = StreamingHttpResponse(
+            stream_export(quiz.pk, export_format),
+            content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="quiz-{quiz.pk}-submissions.{export_format}"')
+        return response
+
+
+@require_safe
+def metrics_view(request):
+    """Request metrics for this process in the Prometheus text format"""
+    token = settings.QUIZ_METRICS_TOKEN
+    if not token:
+        # Traffic and cache numbers stay private unless a token is configured
+        if not settings.DEBUG:
+            return HttpResponse(status=status.HTTP_403_FORBIDDEN)
+    elif not constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    return HttpResponse(
+        metrics.expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -2,10 +2,12 @@ import api from './api';
 import type {
   Quiz,
   QuizListItem,
+  CursorPage,
   QuizCreate,
   QuizSubmit,
   QuizResult,
   QuizAnalytics,
+  SubmissionPage,
   LoginResponse,
   RegisterResponse,
   User,
@@ -31,8 +33,8 @@ export const authApi = {
 
 // Quiz API (Admin)
 export const quizApi = {
-  list: async (): Promise<QuizListItem[]> => {
-    const response = await api.get('/quizzes/');
+  list: async (cursorUrl?: string): Promise<CursorPage<QuizListItem>> => {
+    const response = await api.get(cursorUrl ?? '/quizzes/');
     return response.data;
   },
 
@@ -51,6 +53,11 @@ export const quizApi = {
     return response.data;
   },
 
+  getSubmissions: async (id: number, cursorUrl?: string): Promise<SubmissionPage> => {
+    const response = await api.get(cursorUrl ?? `/quizzes/${id}/submissions/`);
+    return response.data;
+  },
+
   getSubmissionDetail: async (quizId: number, submissionId: number): Promise<QuizResult> => {
     const response = await api.get(`/quizzes/${quizId}/submissions/${submissionId}/`);
     return response.data;
@@ -18,7 +18,9 @@ import { EmptyState } from "@/components/ui/empty-state";
 
 export default function AdminDashboard() {
   const [quizzes, setQuizzes] = useState<QuizListItem[]>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [copiedId, setCopiedId] = useState<number | null>(null);
   const router = useRouter();
@@ -39,7 +41,8 @@ export default function AdminDashboard() {
   const fetchQuizzes = async () => {
     try {
       const data = await quizApi.list();
-      setQuizzes(data);
+      setQuizzes(data.results);
+      setNextPage(data.next);
     } catch (err) {
       setError('Failed to load quizzes');
       console.error(err);
@@ -48,6 +51,21 @@ export default function AdminDashboard() {
     }
   };
 
+  const loadMoreQuizzes = async () => {
+    if (!nextPage) return;
+    setIsLoadingMore(true);
+    try {
+      const data = await quizApi.list(nextPage);
+      setQuizzes((prev) => [...prev, ...data.results]);
+      setNextPage(data.next);
+    } catch (err) {
+      setError('Failed to load more quizzes');
+      console.error(err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const copyShareLink = (quizId: number) => {
     const url = `${window.location.origin}/quiz/${quizId}`;
     navigator.clipboard.writeText(url);
@@ -91,7 +109,7 @@ export default function AdminDashboard() {
              <div className="px-6 py-4 border-b border-border flex flex-col md:flex-row md:items-center justify-between gap-4 bg-muted/30">
                <h2 className="text-xl font-semibold text-foreground">Your Quizzes</h2>
                <div className="text-sm text-muted-foreground">
-                  Total: <span className="font-medium text-foreground">{quizzes.length}</span>
+                  Showing: <span className="font-medium text-foreground">{quizzes.length}</span>
                </div>
              </div>
              <div className="overflow-x-auto">
@@ -100,6 +118,7 @@ export default function AdminDashboard() {
                         <TableRow>
                             <TableHead className="w-[400px] text-xs font-semibold text-muted-foreground uppercase tracking-wider pl-6">Title</TableHead>
                             <TableHead className="text-xs font-semibold text-muted-foreground uppercase tracking-wider">Questions</TableHead>
+                            <TableHead className="text-xs font-semibold text-muted-foreground uppercase tracking-wider">Submissions</TableHead>
                             <TableHead className="text-xs font-semibold text-muted-foreground uppercase tracking-wider">Created At</TableHead>
                             <TableHead className="text-right text-xs font-semibold text-muted-foreground uppercase tracking-wider pr-6">Actions</TableHead>
                         </TableRow>
@@ -118,6 +137,7 @@ export default function AdminDashboard() {
                                         {quiz.question_count} Qs
                                     </div>
                                 </TableCell>
+                                <TableCell className="text-muted-foreground">{quiz.submission_count}</TableCell>
                                 <TableCell className="text-muted-foreground">{new Date(quiz.created_at).toLocaleDateString()}</TableCell>
                                 <TableCell className="text-right space-x-2 pr-6">
                                     <Button variant="outline" size="sm" asChild>
@@ -150,6 +170,13 @@ export default function AdminDashboard() {
                     </TableBody>
                 </Table>
              </div>
+             {nextPage && (
+               <div className="px-6 py-4 border-t border-border flex justify-center">
+                 <Button variant="outline" onClick={loadMoreQuizzes} disabled={isLoadingMore}>
+                   {isLoadingMore ? 'Loading...' : 'Load More'}
+                 </Button>
+               </div>
+             )}
           </div>
         )}
     </AdminLayout>
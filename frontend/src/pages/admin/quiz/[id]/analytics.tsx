@@ -5,7 +5,7 @@ import { useRouter } from 'next/router';
 import { useAuth } from '@/context/AuthContext';
 import { quizApi } from '@/lib/quizApi';
 import { MdPoll, MdOutlineAssignment, MdChevronRight, MdClose, MdArrowBack } from "react-icons/md";
-import type { QuizAnalytics, QuizResult } from '@/types/quiz';
+import type { QuizAnalytics, QuizResult, SubmissionSummary } from '@/types/quiz';
 import Link from 'next/link';
 import { AdminLayout } from '@/components/layout/AdminLayout';
 import { PageLoader } from '@/components/ui/loading-spinner';
@@ -14,6 +14,9 @@ import { Button } from "@/components/ui/button";
 
 export default function QuizAnalyticsPage() {
   const [analytics, setAnalytics] = useState<QuizAnalytics | null>(null);
+  const [submissions, setSubmissions] = useState<SubmissionSummary[]>([]);
+  const [nextSubmissionsPage, setNextSubmissionsPage] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [selectedSubmission, setSelectedSubmission] = useState<QuizResult | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const [isLoadingDetail, setIsLoadingDetail] = useState(false);
@@ -37,8 +40,13 @@ export default function QuizAnalyticsPage() {
   const fetchAnalytics = async () => {
     try {
       setIsLoading(true);
-      const data = await quizApi.getAnalytics(Number(id));
+      const [data, page] = await Promise.all([
+        quizApi.getAnalytics(Number(id)),
+        quizApi.getSubmissions(Number(id)),
+      ]);
       setAnalytics(data);
+      setSubmissions(page.results);
+      setNextSubmissionsPage(page.next);
     } catch (err: any) {
       if (err.response?.status === 403) {
         setError('You do not have permission to view this quiz analytics.');
@@ -51,6 +59,20 @@ export default function QuizAnalyticsPage() {
     }
   };
 
+  const loadMoreSubmissions = async () => {
+    if (!nextSubmissionsPage) return;
+    try {
+      setIsLoadingMore(true);
+      const page = await quizApi.getSubmissions(Number(id), nextSubmissionsPage);
+      setSubmissions((prev) => [...prev, ...page.results]);
+      setNextSubmissionsPage(page.next);
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   const viewSubmissionDetail = async (submissionId: number) => {
     try {
       setIsLoadingDetail(true);
@@ -139,7 +161,7 @@ export default function QuizAnalyticsPage() {
           </div>
           <div className="bg-card border rounded-xl shadow-sm hover:shadow-md transition-all p-6 relative overflow-hidden">
             <div className="text-4xl font-extrabold text-orange-600 dark:text-orange-400 mb-1">
-              {analytics.highest_score}/{analytics.total_submissions > 0 ? analytics.submissions[0]?.total_questions || 0 : 0}
+              {analytics.highest_score}/{analytics.question_analytics.length}
             </div>
             <div className="text-muted-foreground text-sm font-medium">Highest Score</div>
           </div>
@@ -232,7 +254,7 @@ export default function QuizAnalyticsPage() {
                     </tr>
                   </thead>
                   <tbody className="bg-card divide-y divide-border">
-                    {analytics.submissions.map((submission) => (
+                    {submissions.map((submission) => (
                       <tr key={submission.id} className="hover:bg-muted/30 transition-colors group">
                         <td className="px-6 py-4 whitespace-nowrap">
                           <div className="flex items-center">
@@ -275,6 +297,13 @@ export default function QuizAnalyticsPage() {
                   </tbody>
                 </table>
               </div>
+              {nextSubmissionsPage && (
+                <div className="px-6 py-4 border-t border-border flex justify-center">
+                  <Button variant="outline" onClick={loadMoreSubmissions} disabled={isLoadingMore}>
+                    {isLoadingMore ? 'Loading...' : 'Load More'}
+                  </Button>
+                </div>
+              )}
             </div>
           </>
         )}
@@ -27,6 +27,10 @@ export default function TakeQuiz() {
   const [answers, setAnswers] = useState<Record<number, AnswerSubmit>>({});
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [result, setResult] = useState<QuizResult | null>(null);
+  // One token per attempt, so a retried submit returns the first result instead of a duplicate
+  const [submissionToken] = useState(() =>
+    typeof crypto !== 'undefined' && 'randomUUID' in crypto ? crypto.randomUUID() : undefined
+  );
 
   useEffect(() => {
     if (id) {
@@ -91,6 +95,7 @@ export default function TakeQuiz() {
       const submission = {
         taker_name: takerName.trim() || 'Anonymous',
         answers: Object.values(answers),
+        submission_token: submissionToken,
       };
 
       const resultData = await publicQuizApi.submit(Number(id), submission);
@@ -30,9 +30,17 @@ export interface QuizListItem {
   description: string;
   created_by_username: string;
   question_count: number;
+  submission_count: number;
+  last_submission_at: string | null;
   created_at: string;
 }
 
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 // Form Types for Creating Quizzes
 export interface ChoiceCreate {
   choice_text: string;
@@ -63,6 +71,7 @@ export interface AnswerSubmit {
 export interface QuizSubmit {
   taker_name?: string;
   answers: AnswerSubmit[];
+  submission_token?: string;  // resubmitting the same token replays the stored result
 }
 
 export interface AnswerResult {
@@ -76,13 +85,14 @@ export interface AnswerResult {
 }
 
 export interface QuizResult {
-  id: number;
+  id: number | null;  // null while the submission is queued for storage
   quiz_title: string;
   taker_name: string;
   score: number;
   total_questions: number;
   percentage: number;
   submitted_at: string;
+  submission_token: string | null;
   answers: AnswerResult[];
 }
 
@@ -126,6 +136,12 @@ export interface SubmissionSummary {
   submitted_at: string;
 }
 
+export interface ScoreBucket {
+  bucket: number;
+  min_percentage: number;
+  count: number;
+}
+
 export interface QuizAnalytics {
   quiz_id: number;
   quiz_title: string;
@@ -135,6 +151,11 @@ export interface QuizAnalytics {
   highest_score: number;
   lowest_score: number;
   pass_rate: number;
+  score_distribution: ScoreBucket[];
   question_analytics: QuestionAnalytics[];
-  submissions: SubmissionSummary[];
+}
+
+export interface SubmissionPage {
+  next: string | null;
+  results: SubmissionSummary[];
 }